@@ -0,0 +1,65 @@
+"""Startup-time budget for the quick calculators.
+
+Runs `python -m hedging dutch ...` and `python -m hedging lay ...` as fresh
+processes, reports the median wall time against STARTUP_BUDGET_MS and checks
+that numpy never gets imported on those paths. Exits non-zero on a breach.
+
+    python benchmarks/startup.py [--runs 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hedging.cli import STARTUP_BUDGET_MS  # noqa: E402
+
+COMMANDS = {
+    "dutch": ["dutch", "1:3", "4:5", "6:9"],
+    "lay": ["lay", "--back-stake", "100", "--back-odds", "5", "--lay-odds", "2"],
+}
+
+
+def time_command(argv, runs):
+    """Median and worst wall time in ms over fresh interpreter runs"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + argv, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def heavy_imports(args):
+    """Heavy modules imported by a command, from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "hedging"] + args, cwd=ROOT,
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+    return sorted(name for name in modules if name in ("numpy", "tabulate"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    baseline, _ = time_command(["-c", "pass"], args.runs)
+    print(f"bare interpreter median {baseline:.1f} ms")
+
+    failed = False
+    for name, command in COMMANDS.items():
+        median, worst = time_command(["-m", "hedging"] + command, args.runs)
+        heavy = heavy_imports(command)
+        ok = median <= STARTUP_BUDGET_MS and not heavy
+        failed |= not ok
+        print(f"{name:<6} median {median:6.1f} ms  worst {worst:6.1f} ms  budget {STARTUP_BUDGET_MS} ms"
+              f"  heavy imports: {', '.join(heavy) or 'none'}  {'ok' if ok else 'OVER BUDGET'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
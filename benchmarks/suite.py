@@ -0,0 +1,316 @@
+"""Offline benchmark suite for the hedging calculators.
+
+Times every registered strategy plus the engines behind them along four
+scaling axes: field size (exotic coverage), number of tickets (bulk batch,
+Pick N cards, accumulators), number of simulated races and number of odds
+ticks (streaming), along with table rendering. Inputs are generated from a
+fixed seed, so two runs on one machine measure the same work.
+
+Each case reports throughput (units per second), latency percentiles per
+call and peak traced memory for one call, and is written as a JSON line to
+the results file. Pass an earlier results file to --compare to see ratios
+and fail on regressions.
+
+    python benchmarks/suite.py                        # realistic sizes
+    python benchmarks/suite.py --extreme              # add the extreme sizes
+    python benchmarks/suite.py --only tickets,races   # some axes only
+    python benchmarks/suite.py --compare old.txt      # exit 1 on a regression
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from hedging import registry  # noqa: E402
+
+AXES = ("strategy", "field", "tickets", "races", "ticks", "render")
+DEFAULT_OUTPUT = os.path.join(ROOT, "bench_output.txt")
+SEED = 20240601
+
+
+class Case:
+    """One benchmark: `setup()` builds the inputs and returns the call to time"""
+
+    def __init__(self, name, axis, size, units, setup, extreme=False):
+        self.name = name
+        self.axis = axis
+        self.size = size
+        self.units = units
+        self.setup = setup
+        self.extreme = extreme
+
+
+# Input generators
+
+def coverage_call(field_size, depth):
+    from hedging.orders import CoverageIndex, box, straight
+
+    horses = tuple(range(1, depth + 1))
+    stakes = np.tile([10.0, 1.0], (64, 1)) * np.linspace(0.5, 2, 64)[:, None]
+
+    def call():
+        index = CoverageIndex(field_size, depth, [straight(horses), box(range(1, depth + 3), depth)])
+        index.profits(stakes, [200.0, 40.0])
+    return call
+
+
+def ticket_dicts(n, seed=SEED):
+    """A reproducible mix of every bet type the batch mode takes"""
+    rng = random.Random(seed)
+    tickets = []
+    for i in range(n):
+        kind = rng.choice(["win", "dutch", "each_way", "lay", "exacta", "trifecta", "superfecta"])
+        field = rng.sample(range(1, 13), 6)
+        result = "-".join(map(str, rng.sample(range(1, 13), 4)))
+        ticket = {"id": i, "race": f"R{i % 10}", "bet_type": kind, "stake": rng.choice([1, 2, 5, 10]),
+                  "result": result if rng.random() < 0.5 else ""}
+        if kind in ("win", "dutch"):
+            ticket["horses"] = ",".join(map(str, field[:3]))
+            ticket["odds"] = ",".join(str(rng.randint(2, 20)) for _ in range(3))
+        elif kind in ("each_way", "lay"):
+            ticket["horses"] = str(field[0])
+            ticket["odds"] = rng.randint(2, 20)
+            ticket["lay_odds"] = rng.randint(2, 20)
+        else:
+            depth = {"exacta": 2, "trifecta": 3, "superfecta": 4}[kind]
+            ticket["horses"] = "/".join(",".join(map(str, field[p:p + 2])) for p in range(depth))
+            ticket["odds"] = rng.randint(20, 2000)
+        tickets.append(ticket)
+    return tickets
+
+
+def batch_call(n):
+    from hedging.batch import evaluate_tickets
+
+    tickets = ticket_dicts(n)
+    return lambda: sum(1 for _ in evaluate_tickets(tickets))
+
+
+def pick_card_call(n):
+    from hedging.pickn import PickCard
+
+    rng = np.random.default_rng(SEED)
+    tickets = [[rng.choice(np.arange(1, 13), 5, replace=False).tolist() for _ in range(6)] for _ in range(n)]
+    odds = np.append(np.nan, np.full(12, 11.0))
+    probabilities = np.full((6, 13), 1 / 12)
+    probabilities[:, 0] = 0
+
+    def call():
+        card = PickCard(tickets)
+        for winner in (3, 5, 7, 2, 9):
+            card.hedge(5000, odds, probabilities, 2000)
+            card.record(winner)
+        card.hedge(5000, odds, bankroll=2000)
+    return call
+
+
+def accumulator_call(n):
+    from hedging.parlay import solve_schedule
+
+    rng = np.random.default_rng(SEED)
+    odds = rng.uniform(1.5, 5, (n, 6))
+    claims = rng.uniform(100, 5000, n)
+    return lambda: solve_schedule(claims, odds, odds / (odds - 1) * 0.95, 1.05 / odds, 2000)
+
+
+def simulate_call(n_races):
+    from hedging.orders import CoverageIndex, straight
+    from hedging.simulate import field_probabilities, simulate
+
+    probs = field_probabilities({1: 0.25, 4: 0.15, 6: 0.10}, 10)
+    index = CoverageIndex(10, 1, [straight((horse,)) for horse in (1, 4, 6)])
+    stakes = [100 / 3, 100 / 5, 100 / 9]
+    return lambda: simulate(index, probs, stakes, [3, 5, 9], n_races=n_races, workers=1, seed=SEED)
+
+
+def odds_messages(n, races=20, seed=SEED):
+    rng = random.Random(seed)
+    messages = []
+    for race in range(races):
+        messages.append({"type": "dutch", "race": race, "horses": [1, 4, 6], "target_profit": 100})
+        messages.append({"type": "lay", "race": race, "horse": 3, "back_stake": 100, "back_odds": 5})
+    for _ in range(n):
+        messages.append({"type": "odds", "race": rng.randrange(races), "horse": rng.randint(1, 10),
+                         "odds": round(rng.uniform(1.5, 30), 2)})
+    return messages
+
+
+def stream_call(n):
+    from hedging.stream import OddsStream
+
+    messages = odds_messages(n)
+    return lambda: OddsStream(publish=lambda event: None).run(messages)
+
+
+def render_call(rows, fmt):
+    from hedging.engine import OutcomeTable
+    from hedging.render import render
+
+    profit = np.random.default_rng(SEED).normal(0, 500, rows)
+    table = OutcomeTable(lambda key: f"Outcome #{key}", 100, 25, profit)
+    return lambda: render(table, fmt, stream=io.StringIO())
+
+
+def build_cases():
+    cases = [Case(f"strategy.{name}", "strategy", 1, 1, lambda name=name: registry.get_strategy(name))
+             for name in registry.strategy_names()]
+
+    for field_size in (8, 12, 16, 20, 24):
+        for depth in (3, 4):
+            orders = np.prod(np.arange(field_size - depth + 1, field_size + 1))
+            cases.append(Case(f"field.{'trifecta' if depth == 3 else 'superfecta'}.{field_size}", "field",
+                              field_size, int(orders), lambda f=field_size, d=depth: coverage_call(f, d),
+                              extreme=field_size > 16))
+
+    for n in (1_000, 10_000, 100_000):
+        cases.append(Case(f"tickets.batch.{n}", "tickets", n, n, lambda n=n: batch_call(n), extreme=n > 10_000))
+    for n in (10, 100, 1_000):
+        cases.append(Case(f"tickets.pick6.{n}", "tickets", n, n, lambda n=n: pick_card_call(n), extreme=n > 100))
+        cases.append(Case(f"tickets.accumulator.{n}", "tickets", n, n, lambda n=n: accumulator_call(n),
+                          extreme=n > 100))
+
+    for n in (10_000, 100_000, 1_000_000):
+        cases.append(Case(f"races.simulate.{n}", "races", n, n, lambda n=n: simulate_call(n), extreme=n > 100_000))
+
+    for n in (1_000, 10_000, 100_000):
+        cases.append(Case(f"ticks.stream.{n}", "ticks", n, n, lambda n=n: stream_call(n), extreme=n > 10_000))
+
+    for rows in (10, 1_000, 100_000):
+        for fmt in ("grid", "csv"):
+            cases.append(Case(f"render.{fmt}.{rows}", "render", rows, rows, lambda r=rows, f=fmt: render_call(r, f),
+                              extreme=rows > 1_000))
+    return cases
+
+
+# Measurement
+
+def measure(case, min_time, min_calls, max_calls):
+    """Latencies of repeated calls, then peak memory of one traced call"""
+    call = case.setup()
+    call()  # Warm-up: imports, caches, first-touch allocations
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < max_calls and (len(latencies) < min_calls or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    # Traced separately: tracemalloc slows allocation-heavy code down a lot
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "name": case.name,
+        "axis": case.axis,
+        "size": case.size,
+        "calls": len(latencies),
+        "throughput": case.units * len(latencies) / total if total else None,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "peak_kb": peak / 1024,
+    }
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, len(ordered) * q // 100)]
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "platform": platform.platform(), "commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+# Results files
+
+def write_results(path, meta, results):
+    with open(path, "w") as output:
+        output.write(json.dumps({"meta": meta}) + "\n")
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+
+
+def read_results(path):
+    """{case name: result} from a results file"""
+    with open(path) as source:
+        rows = [json.loads(line) for line in source if line.strip()]
+    return {row["name"]: row for row in rows if "name" in row}
+
+
+def compare(previous, results, tolerance):
+    """Print p50 ratios against a previous run; returns the regressed case names"""
+    regressed = []
+    print(f"\n{'case':<32} {'old p50':>10} {'new p50':>10} {'ratio':>7}")
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+        ratio = result["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+        flag = "  REGRESSION" if ratio > tolerance else ""
+        if flag:
+            regressed.append(result["name"])
+        print(f"{result['name']:<32} {old['p50_ms']:>10.3f} {result['p50_ms']:>10.3f} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--extreme", action="store_true", help="include the extreme sizes")
+    parser.add_argument("--only", help=f"comma-separated axes or case-name prefixes ({', '.join(AXES)})")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results file (JSON lines)")
+    parser.add_argument("--compare", metavar="PREVIOUS", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="p50 ratio that counts as a regression")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to keep repeating each case")
+    parser.add_argument("--min-calls", type=int, default=5)
+    parser.add_argument("--max-calls", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    prefixes = tuple(args.only.split(",")) if args.only else ()
+    cases = [case for case in build_cases()
+             if (args.extreme or not case.extreme) and (not prefixes or case.name.startswith(prefixes))]
+
+    results = []
+    print(f"{'case':<32} {'calls':>6} {'units/s':>12} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'peak KiB':>10}")
+    for case in cases:
+        result = measure(case, args.min_time, args.min_calls, args.max_calls)
+        results.append(result)
+        print(f"{case.name:<32} {result['calls']:>6} {result['throughput']:>12,.0f} {result['p50_ms']:>10.3f}"
+              f" {result['p90_ms']:>10.3f} {result['p99_ms']:>10.3f} {result['peak_kb']:>10,.0f}")
+
+    # Read before writing in case both name the same file
+    previous = read_results(args.compare) if args.compare else None
+    write_results(args.output, environment(), results)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if previous is not None:
+        regressed = compare(previous, results, args.tolerance)
+        if regressed:
+            print(f"{len(regressed)} regression(s) over {args.tolerance:.2f}x")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Horse racing hedging calculators.
+
+Names are re-exported lazily: `from hedging import simulate` only imports
+the simulator (and numpy) at that point, so importing the package itself
+stays cheap.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "OutcomeTable": "hedging.engine",
+    "evaluate": "hedging.engine",
+    "evaluate_batch": "hedging.engine",
+    "outcome_profits": "hedging.engine",
+    "outcome_roi": "hedging.engine",
+    "returns_matrix": "hedging.engine",
+    "SCENARIO_DTYPE": "hedging.engine",
+    "LazyNames": "hedging.records",
+    "Scenario": "hedging.records",
+    "Ticket": "hedging.records",
+    "ticket_array": "hedging.records",
+    "ticket_dtype": "hedging.records",
+    "CoverageIndex": "hedging.orders",
+    "box": "hedging.orders",
+    "finish_orders": "hedging.orders",
+    "order_label": "hedging.orders",
+    "part_wheel": "hedging.orders",
+    "straight": "hedging.orders",
+    "wheel": "hedging.orders",
+    "TicketPlan": "hedging.consolidate",
+    "consolidate": "hedging.consolidate",
+    "coverage_from_tickets": "hedging.consolidate",
+    "HedgeSchedule": "hedging.parlay",
+    "solve_schedule": "hedging.parlay",
+    "Portfolio": "hedging.portfolio",
+    "PortfolioSolver": "hedging.portfolio",
+    "kelly_portfolio": "hedging.portfolio",
+    "PickCard": "hedging.pickn",
+    "leg_mask": "hedging.pickn",
+    "PoolSnapshot": "hedging.pools",
+    "harville_probabilities": "hedging.pools",
+    "order_prices": "hedging.pools",
+    "will_pay": "hedging.pools",
+    "SimulationResult": "hedging.simulate",
+    "field_probabilities": "hedging.simulate",
+    "harville_orders": "hedging.simulate",
+    "simulate": "hedging.simulate",
+    "simulate_orders": "hedging.simulate",
+    "AliveHedge": "hedging.solver",
+    "HedgeSolution": "hedging.solver",
+    "solve_alive_hedge": "hedging.solver",
+    "solve_final_leg": "hedging.solver",
+    "Ladder": "hedging.ladder",
+    "SweepResult": "hedging.sweep",
+    "sweep": "hedging.sweep",
+    "OddsStream": "hedging.stream",
+    "replay_messages": "hedging.stream",
+    "socket_messages": "hedging.stream",
+    "RaceBatch": "hedging.backtest",
+    "backtest": "hedging.backtest",
+    "RaceStore": "hedging.store",
+    "StoreWriter": "hedging.store",
+    "import_csv": "hedging.store",
+    "HedgeService": "hedging.service",
+    "evaluate_requests": "hedging.service",
+    "evaluate_card": "hedging.card",
+    "evaluate_race": "hedging.card",
+    "read_card": "hedging.card",
+    "evaluate_tickets": "hedging.batch",
+    "read_tickets": "hedging.batch",
+    "run_batch": "hedging.batch",
+    "write_results": "hedging.batch",
+    "ResultCache": "hedging.cache",
+    "cached": "hedging.cache",
+    "ProfileStats": "hedging.profiling",
+    "profile": "hedging.profiling",
+    "profiled": "hedging.profiling",
+    "display_results": "hedging.render",
+    "format_currency": "hedging.render",
+    "render": "hedging.render",
+    "get_demo": "hedging.registry",
+    "get_strategy": "hedging.registry",
+    "strategy_names": "hedging.registry",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'hedging' has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,3 @@
+from hedging.cli import main
+
+main()
@@ -0,0 +1,304 @@
+"""Backtest hedge strategies against the historical race store.
+
+A rule is a function of a RaceBatch (a block of races as padded runner
+matrices) returning what was staked and what came back in each race, as two
+arrays. Rules work on the whole block at once, so a year of races is a few
+dozen array operations rather than a Python loop per race. Races with
+nothing staked (a rule's field too small, no exacta pool) do not count as
+bets.
+
+Races are replayed in store order, a block of BLOCK_SIZE rows at a time,
+straight off the memory-mapped columns. Every total kept per rule (profit,
+hits, running equity and its peak) merges in order, so a saved state can
+be resumed: a re-run only reads races appended since the last one. The
+state also records the store's race count and a digest of its race
+columns; totals saved against a rebuilt or different store are dropped.
+
+Built-in rules (store odds are returns per $1, as in the batch mode):
+
+- favourite: back the shortest-priced runner to win
+- dutch: dutch the `size` shortest-priced runners for an equal return
+- each_way: each-way on the `rank`-th favourite, places 1-3 at `place_fraction`
+- exacta_box: box the `size` shortest-priced runners at the exacta will-pay
+- exacta_hedge: straight exacta on the first two favourites hedged with a box
+  of the first `size`, as in the exacta worked example
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from hedging.profiling import profiled
+from hedging.store import RACE_COLUMNS, RaceStore
+
+BACKTEST_VERSION = 1  # Bump when a rule's arithmetic changes; saved states are then ignored
+BLOCK_SIZE = 50_000
+REPORT_FIELDS = ("races", "bets", "staked", "returned", "profit", "roi", "hit_rate", "max_drawdown")
+
+
+class RaceBatch:
+    """A block of races as (races, max field) runner matrices
+
+    Runner slots past a race's field size hold NaN odds, horse 0 and finish 0.
+    """
+
+    def __init__(self, store, rows):
+        self.rows = rows
+        self.field_size = store.races["field_size"][rows].astype(np.intp)
+        self.odds = store.field_matrix(rows, "odds", fill=np.nan).astype(float)
+        self.finish = store.field_matrix(rows, "finish")
+        self.payouts = {name: store.races[name][rows].astype(float) for name in ("exacta", "trifecta", "superfecta")}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def favourites(self, count):
+        """(races, count) runner slots of the `count` shortest prices, shortest first"""
+        order = np.argsort(np.where(np.isnan(self.odds), np.inf, self.odds), axis=1, kind="stable")
+        return order[:, :count]
+
+    def take(self, matrix, slots):
+        return np.take_along_axis(matrix, slots, axis=1)
+
+
+def favourite(batch, stake=1.0):
+    slot = batch.favourites(1)
+    staked = np.full(len(batch), stake)
+    won = batch.take(batch.finish, slot)[:, 0] == 1
+    return staked, np.where(won, stake * batch.take(batch.odds, slot)[:, 0], 0.0)
+
+
+def dutch(batch, size=2, target_profit=10.0):
+    """Stake target / odds on each selection, as in exotics.dutch"""
+    slots = batch.favourites(size)
+    odds = batch.take(batch.odds, slots)
+    stakes = target_profit / odds
+    valid = batch.field_size > size
+    won = (batch.take(batch.finish, slots) == 1).any(axis=1)
+    staked = np.where(valid, np.nansum(stakes, axis=1), 0.0)
+    return staked, np.where(valid & won, target_profit, 0.0)
+
+
+def each_way(batch, rank=1, stake=1.0, place_fraction=0.25, places=3):
+    slot = batch.favourites(rank)[:, -1:]  # The rank-th favourite wherever the field has `rank` runners
+    odds = batch.take(batch.odds, slot)[:, 0]
+    finish = batch.take(batch.finish, slot)[:, 0]
+    valid = (batch.field_size >= rank) & (batch.field_size > places)
+    place_return = stake * ((odds - 1) * place_fraction + 1)
+    returned = np.where(finish == 1, stake * odds, 0.0) + np.where((finish >= 1) & (finish <= places), place_return, 0)
+    return np.where(valid, 2 * stake, 0.0), np.where(valid, returned, 0.0)
+
+
+def _exacta_won(batch, slots):
+    """Whether the first two finishers are both among `slots`"""
+    finish = batch.take(batch.finish, slots)
+    return (finish == 1).any(axis=1) & (finish == 2).any(axis=1)
+
+
+def exacta_box(batch, size=3, base_bet=1.0):
+    slots = batch.favourites(size)
+    valid = (batch.field_size >= size) & ~np.isnan(batch.payouts["exacta"])
+    staked = np.where(valid, size * (size - 1) * base_bet, 0.0)
+    return staked, np.where(valid & _exacta_won(batch, slots), base_bet * batch.payouts["exacta"], 0.0)
+
+
+def exacta_hedge(batch, size=3, straight_bet=20.0, base_bet=2.0):
+    """Straight exacta on favourite then second favourite, plus a box of `size`"""
+    box_staked, box_returned = exacta_box(batch, size, base_bet)
+    slots = batch.favourites(2)
+    finish = batch.take(batch.finish, slots)
+    straight_won = (finish[:, 0] == 1) & (finish[:, 1] == 2)
+    valid = box_staked > 0
+    staked = box_staked + np.where(valid, straight_bet, 0.0)
+    return staked, box_returned + np.where(valid & straight_won, straight_bet * batch.payouts["exacta"], 0.0)
+
+
+RULES = {
+    "favourite": favourite,
+    "dutch": dutch,
+    "each_way": each_way,
+    "exacta_box": exacta_box,
+    "exacta_hedge": exacta_hedge,
+}
+
+
+def parse_rule(text):
+    """"name" or "name:key=value,key=value" -> (name, params)"""
+    name, _, options = text.partition(":")
+    if name not in RULES:
+        raise ValueError(f"Unknown rule {name!r}, expected one of {', '.join(RULES)}")
+    params = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        params[key] = float(value) if "." in value else int(value)
+    return name, params
+
+
+def rule_key(name, params, filters):
+    return json.dumps([BACKTEST_VERSION, name, params, filters], sort_keys=True)
+
+
+class RuleTotals:
+    """Running totals for one rule; every field merges in race order"""
+
+    __slots__ = ("last_row", "races", "bets", "hits", "staked", "returned", "equity", "peak", "max_drawdown")
+
+    def __init__(self, last_row=-1, races=0, bets=0, hits=0, staked=0.0, returned=0.0, equity=0.0, peak=0.0,
+                 max_drawdown=0.0):
+        self.last_row = last_row
+        self.races = races
+        self.bets = bets
+        self.hits = hits
+        self.staked = staked
+        self.returned = returned
+        self.equity = equity
+        self.peak = peak
+        self.max_drawdown = max_drawdown
+
+    def add(self, rows, staked, returned):
+        bet = staked > 0
+        self.last_row = int(rows[-1])
+        self.races += len(rows)
+        self.bets += int(bet.sum())
+        self.hits += int((bet & (returned > 0)).sum())
+        self.staked += float(staked.sum())
+        self.returned += float(returned.sum())
+
+        equity = self.equity + np.cumsum(returned - staked)
+        peak = np.maximum.accumulate(np.maximum(equity, self.peak))
+        self.max_drawdown = max(self.max_drawdown, float((peak - equity).max()))
+        self.equity, self.peak = float(equity[-1]), float(peak[-1])
+
+    def report(self):
+        return {
+            "races": self.races,
+            "bets": self.bets,
+            "staked": self.staked,
+            "returned": self.returned,
+            "profit": self.returned - self.staked,
+            "roi": (self.returned - self.staked) / self.staked if self.staked else 0.0,
+            "hit_rate": self.hits / self.bets if self.bets else 0.0,
+            "max_drawdown": self.max_drawdown,
+        }
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def load_state(path):
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path) as source:
+        return json.load(source)
+
+
+def save_state(path, state):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as output:
+        json.dump(state, output)
+    os.replace(temporary, path)  # A crash mid-write keeps the previous state
+
+
+def store_identity(store, races=None):
+    """Race count and digest of the race columns over the first `races` rows"""
+    races = len(store) if races is None else races
+    digest = hashlib.blake2b(digest_size=16)
+    for name in RACE_COLUMNS:
+        digest.update(np.ascontiguousarray(store.races[name][:races]))
+    return {"races": races, "digest": digest.hexdigest()}
+
+
+def _extends(store, identity):
+    """Whether `store` is the store `identity` was taken from, perhaps with races appended"""
+    if not identity or identity["races"] > len(store):
+        return False
+    return store_identity(store, identity["races"]) == identity
+
+
+def blocks(rows, size=BLOCK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+@profiled("backtest.block")
+def _run_block(store, rows, rules, totals):
+    batch = RaceBatch(store, rows)
+    for key, (name, params) in rules.items():
+        pending = rows > totals[key].last_row
+        if not pending.any():
+            continue
+        staked, returned = RULES[name](batch, **params)
+        totals[key].add(rows[pending], staked[pending], returned[pending])
+
+
+def backtest(store, rules, state=None, track=None, start=None, end=None, field_size=None, block_size=BLOCK_SIZE):
+    """Run rules over the store; returns {rule text: report dict}
+
+    `rules` are rule texts such as "each_way:rank=2" (see parse_rule) and
+    `state` a JSON path holding the totals from earlier runs. Only races
+    past each rule's last processed row are read, and the state is saved
+    after every block.
+    """
+    if isinstance(store, str):
+        store = RaceStore(store)
+    filters = {"track": track, "start": start and str(start), "end": end and str(end), "field_size": field_size}
+    parsed = {}
+    for text in rules:
+        name, params = parse_rule(text)
+        parsed[rule_key(name, params, filters)] = (text, (name, params))
+    saved = load_state(state)
+    if not _extends(store, saved.get("store")):
+        saved = {}  # Totals from a rebuilt or different store do not carry over
+    saved["store"] = store_identity(store)
+    totals = {key: RuleTotals(**saved.get(key, {})) for key in parsed}
+
+    rows = store.select(track, start, end, field_size).astype(np.int64)
+    if len(rows) and totals:
+        rows = rows[rows > min(record.last_row for record in totals.values())]
+
+    runs = {key: rule for key, (_, rule) in parsed.items()}
+    for block in blocks(rows, block_size):
+        _run_block(store, block, runs, totals)
+        if state is not None:
+            saved.update({key: record.as_dict() for key, record in totals.items()})
+            save_state(state, saved)
+    return {text: totals[key].report() for key, (text, _) in parsed.items()}
+
+
+def print_report(reports, stream=None):
+    stream = stream or sys.stdout
+    width = max([28] + [len(text) for text in reports])
+    stream.write(f"{'rule':<{width}} {'races':>8} {'bets':>8} {'staked':>12} {'profit':>12} {'roi':>8} {'hits':>7}"
+                 f" {'drawdown':>10}\n")
+    for text, report in reports.items():
+        stream.write(f"{text:<{width}} {report['races']:>8} {report['bets']:>8} {report['staked']:>12,.2f}"
+                     f" {report['profit']:>12,.2f} {report['roi']:>8.1%} {report['hit_rate']:>7.1%}"
+                     f" {report['max_drawdown']:>10,.2f}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest strategies against a race store")
+    parser.add_argument("store")
+    parser.add_argument("--rule", action="append", dest="rules", metavar="NAME[:KEY=VALUE,...]",
+                        help=f"one of {', '.join(RULES)}; repeat for several (default: all)")
+    parser.add_argument("--state", help="JSON file of totals; later runs only process newly added races")
+    parser.add_argument("--track")
+    parser.add_argument("--start", help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", help="last date, YYYY-MM-DD")
+    parser.add_argument("--field-size", type=int)
+    parser.add_argument("--json", action="store_true", help="print the reports as JSON")
+    args = parser.parse_args(argv)
+
+    reports = backtest(args.store, args.rules or list(RULES), args.state, args.track, args.start, args.end,
+                       args.field_size)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_report(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Bulk ticket-file mode: stream tickets in, hedge results out.
+
+Tickets are read lazily from CSV or JSON lines, evaluated in fixed-size
+chunks with array maths per bet type, and written straight back out, so a
+whole day of tickets never has to sit in memory at once.
+
+Ticket fields (CSV columns or JSON keys):
+- id, race: carried through to the output
+- bet_type: win, dutch, each_way, lay, exacta, trifecta or superfecta
+- horses: exotics use "/" between positions and "," between horses in a
+  position ("2/5,8,9/5,8,9,10" is a part-wheel, "3/5" a straight); a
+  single group with no "/" is a box. Other bet types list horses "1,4,6".
+  In JSON a list [1, 4, 6] reads like "1,4,6", and a list of lists such
+  as [[2], [5, 8, 9], [5, 8, 9, 10]] gives the positions.
+- stake: per combination for exotics, per horse for win, per half for
+  each-way, the back stake for lay and the target profit for dutch
+- odds: return per $1 (a winning stake returns stake * odds); one value,
+  or one per horse for win and dutch
+- lay_odds: current odds to green up a lay at
+- place_fraction: each-way place terms (default 1/4)
+- result: finishing order such as "5-3-7-1"; without it (or when it has
+  fewer places than an exotic needs) the output gives the best and worst
+  case instead of the settled profit
+
+A ticket that cannot be evaluated (an unknown bet type, too few positions,
+a value that does not parse) gets an output row with an "error" message and
+no figures, and the run carries on with the next ticket.
+"""
+import argparse
+import csv
+import json
+import sys
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
+from hedging.orders import part_wheel
+from hedging.profiling import profiled
+from hedging.records import MAX_POSITIONS, Ticket, ticket_array
+from hedging.stream import LayPosition
+
+EXOTIC_DEPTH = {"exacta": 2, "trifecta": 3, "superfecta": 4}
+OUTPUT_FIELDS = ["id", "race", "bet_type", "combos", "cost", "returns", "profit", "best_profit", "worst_profit",
+                 "error"]
+
+
+def read_tickets(path):
+    """Yield ticket dicts from a .csv or .jsonl file ("-" reads JSONL from stdin)"""
+    if path == "-":
+        for line in sys.stdin:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    with open(path, newline="") as source:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def chunked(items, size):
+    """Group an iterable into lists of at most `size` items"""
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def parse_horses(text):
+    """'2/5,8,9/5,8' -> [[2], [5, 8, 9], [5, 8]]; '1,4,6' -> [[1, 4, 6]]
+
+    JSON lists read the same way: a flat [1, 4, 6] is one group like
+    "1,4,6", and nested [[2], [5, 8, 9], [5, 8]] gives one group per position.
+    """
+    if isinstance(text, list):
+        if not any(isinstance(group, list) for group in text):
+            return [[int(horse) for horse in text]]
+        return [[int(horse) for horse in group] if isinstance(group, list) else [int(group)] for group in text]
+    return [[int(horse) for horse in group.split(",")] for group in str(text).split("/")]
+
+
+def parse_numbers(text):
+    if isinstance(text, (list, tuple)):
+        return [float(value) for value in text]
+    return [float(value) for value in str(text).split(",")]
+
+
+def parse_order(text):
+    if not text:
+        return None
+    if isinstance(text, list):
+        return [int(horse) for horse in text]
+    return [int(horse) for horse in str(text).replace("/", "-").replace(",", "-").split("-")]
+
+
+@lru_cache(maxsize=4096)
+def _exotic_combos(positions):
+    return len(part_wheel(*positions))
+
+
+def _exotic_positions(ticket):
+    depth = EXOTIC_DEPTH[ticket["bet_type"]]
+    positions = parse_horses(ticket["horses"])
+    if len(positions) == 1:
+        positions = positions * depth
+    if len(positions) != depth:
+        raise ValueError(f"Ticket {ticket.get('id')}: {ticket['bet_type']} needs {depth} positions")
+    return tuple(tuple(group) for group in positions)
+
+
+def _evaluate_exotics(tickets):
+    """Cost and settlement for exotic tickets, packed as a ticket array"""
+    packed = []
+    combos = np.empty(len(tickets))
+    result_bits = np.zeros((len(tickets), MAX_POSITIONS), dtype=np.int64)
+    settled = np.zeros(len(tickets), dtype=bool)
+
+    for row, ticket in enumerate(tickets):
+        positions = _exotic_positions(ticket)
+        combos[row] = _exotic_combos(positions)
+        packed.append(Ticket(ticket["bet_type"], positions, float(ticket["stake"]), float(ticket["odds"])))
+        order = parse_order(ticket.get("result"))
+        if order and len(order) >= len(positions):  # A result too short to settle this bet stays unsettled
+            settled[row] = True
+            result_bits[row, :len(positions)] = [1 << horse for horse in order[:len(positions)]]
+
+    records = ticket_array(packed)
+    used = np.arange(MAX_POSITIONS) < records["depth"][:, None]
+    hit = settled & np.all(~used | ((records["positions"] & result_bits) != 0), axis=1)
+
+    stakes = records["stake"].astype(float)
+    cost = stakes * combos
+    returns = np.where(hit, stakes * records["odds"], 0.0)
+    return combos, cost, returns, settled, stakes * records["odds"] - cost, -cost
+
+
+def _evaluate_single(ticket):
+    """Cost and settlement for win, dutch, each-way and lay tickets"""
+    bet_type = ticket["bet_type"]
+    horses = parse_horses(ticket["horses"])[0]
+    odds = parse_numbers(ticket["odds"])
+    stake = float(ticket["stake"])
+    order = parse_order(ticket.get("result"))
+    winner = order[0] if order else None
+
+    if bet_type in ("win", "dutch"):
+        odds = odds * len(horses) if len(odds) == 1 else odds
+        stakes = [stake / price for price in odds] if bet_type == "dutch" else [stake] * len(horses)
+        cost = sum(stakes)
+        payouts = [s * price for s, price in zip(stakes, odds)]
+        returns = payouts[horses.index(winner)] if winner in horses else 0.0
+        return len(horses), cost, returns, max(payouts) - cost, -cost
+
+    if bet_type == "each_way":
+        fraction = float(ticket.get("place_fraction") or 0.25)
+        place_return = stake * (odds[0] * fraction + 1)
+        win_return = stake * (odds[0] + 1) + place_return
+        cost = 2 * stake
+        returns = 0.0
+        if order and horses[0] == winner:
+            returns = win_return
+        elif order and horses[0] in order[:3]:
+            returns = place_return
+        return 2, cost, returns, win_return - cost, -cost
+
+    if bet_type == "lay":
+        hedge = LayPosition(stake, odds[0]).update(float(ticket["lay_odds"]))
+        wins, loses = hedge["profit_if_wins"], hedge["profit_if_loses"]
+        cost = stake
+        returns = cost + (wins if winner == horses[0] else loses)
+        return 2, cost, returns, max(wins, loses), min(wins, loses)
+
+    raise ValueError(f"Ticket {ticket.get('id')}: unknown bet type {bet_type!r}")
+
+
+def _error_message(error):
+    if isinstance(error, ValueError):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+@profiled("batch.chunk")
+def evaluate_chunk(tickets):
+    """Yield one result dict per ticket, in input order"""
+    results = [None] * len(tickets)
+    errors = {}
+
+    def settle_exotics(rows):
+        combos, cost, returns, settled, best, worst = _evaluate_exotics([tickets[row] for row in rows])
+        for i, row in enumerate(rows):
+            results[row] = (combos[i], cost[i], returns[i] if settled[i] else None, best[i], worst[i])
+
+    exotic_rows = [row for row, ticket in enumerate(tickets) if ticket.get("bet_type") in EXOTIC_DEPTH]
+    if exotic_rows:
+        try:
+            settle_exotics(exotic_rows)
+        except Exception:  # Settle them one at a time to find the bad tickets
+            for row in exotic_rows:
+                try:
+                    settle_exotics([row])
+                except Exception as error:
+                    errors[row] = _error_message(error)
+
+    for row, ticket in enumerate(tickets):
+        if results[row] is None and row not in errors:
+            try:
+                combos, cost, returns, best, worst = _evaluate_single(ticket)
+            except Exception as error:  # A bad ticket fails alone, not the run
+                errors[row] = _error_message(error)
+                continue
+            results[row] = (combos, cost, returns if ticket.get("result") else None, best, worst)
+
+    for row, ticket in enumerate(tickets):
+        if row in errors:
+            yield {"id": ticket.get("id"), "race": ticket.get("race"), "bet_type": ticket.get("bet_type"),
+                   **dict.fromkeys(OUTPUT_FIELDS[3:-1]), "error": errors[row]}
+            continue
+        combos, cost, returns, best, worst = results[row]
+        yield {
+            "id": ticket.get("id"),
+            "race": ticket.get("race"),
+            "bet_type": ticket["bet_type"],
+            "combos": int(combos),
+            "cost": round(float(cost), 2),
+            "returns": None if returns is None else round(float(returns), 2),
+            "profit": None if returns is None else round(float(returns - cost), 2),
+            "best_profit": round(float(best), 2),
+            "worst_profit": round(float(worst), 2)
+        }
+
+
+def evaluate_tickets(tickets, chunk_size=5000):
+    """Lazily evaluate a ticket stream chunk by chunk"""
+    for chunk in chunked(tickets, chunk_size):
+        yield from evaluate_chunk(chunk)
+
+
+def write_results(results, path):
+    """Stream result dicts to .csv or .jsonl ("-" writes JSONL to stdout)"""
+    count = 0
+    target = sys.stdout if path == "-" else open(path, "w", newline="")
+    try:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(target, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+            for result in results:
+                writer.writerow(result)
+                count += 1
+        else:
+            for result in results:
+                target.write(json.dumps(result) + "\n")
+                count += 1
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    return count
+
+
+def run_batch(source, destination, chunk_size=5000):
+    """Evaluate every ticket in `source` and write results to `destination`"""
+    return write_results(evaluate_tickets(read_tickets(source), chunk_size), destination)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a ticket file in bulk")
+    parser.add_argument("source", help="tickets as .csv or .jsonl, or - for JSONL on stdin")
+    parser.add_argument("destination", help="results as .csv or .jsonl, or - for JSONL on stdout")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    count = run_batch(args.source, args.destination, args.chunk_size)
+    print(f"Evaluated {count} tickets", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Persistent result cache for the strategy functions and rendered tables.
+
+Results are stored under a content address: a blake2b hash of the strategy
+name and its bound arguments (defaults filled in, so exacta_hedge() and
+exacta_hedge(straight_bet=20) share an entry). Arguments are hashed by
+value: numbers, strings, sequences, mappings, arrays by dtype, shape and
+bytes, pool snapshots by their content key and slotted objects such as a
+Ladder by their fields. Anything else makes the call uncacheable and it
+simply runs.
+
+Two layers:
+
+- memory: the most recent MEMORY_ENTRIES results, returned as they are (so
+  treat cached results as read-only); a repeat call costs the hash
+- disk: an SQLite file of pickled results with a last-used time, evicted
+  oldest first once it outgrows its size cap; it survives restarts. A
+  forked worker (card and simulate pools) opens its own connection on
+  first use rather than sharing its parent's
+
+Every entry belongs to one code version, a hash of the package's source
+files. When the code changes the disk cache is emptied on open, so a stale
+result is never served after an upgrade.
+
+Like profiling, caching is off unless enabled (enable(), or
+`python -m hedging --cache ...`); while it is off the @cached wrapper costs
+one global read and a branch. This module stays numpy-free.
+"""
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from io import StringIO
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hedging")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MEMORY_ENTRIES = 256
+MAX_TABLE_ROWS = 5000  # Longer tables keep streaming straight to the screen
+
+_active = None  # The ResultCache in use, or None when caching is off
+
+
+class Uncacheable(TypeError):
+    """An argument has no canonical form"""
+
+
+@lru_cache(maxsize=1)
+def code_version():
+    """Hash of every module in the package"""
+    digest = hashlib.blake2b(digest_size=16)
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(package, name), "rb") as source:
+                digest.update(source.read())
+    return digest.hexdigest()
+
+
+def _canonical(value, digest):
+    """Feed a type-tagged, order-independent encoding of `value` into `digest`"""
+    if value is None or isinstance(value, (bool, str)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (int, float)):
+        digest.update(f"n:{float(value)!r};".encode())  # 25 and 25.0 are the same odds
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"[{len(value)}".encode())
+        for item in value:
+            _canonical(item, digest)
+        digest.update(b"]")
+    elif isinstance(value, dict):
+        digest.update(f"{{{len(value)}".encode())
+        for key, item in sorted(value.items(), key=lambda pair: repr(pair[0])):
+            _canonical(key, digest)
+            _canonical(item, digest)
+        digest.update(b"}")
+    elif type(value).__module__ == "numpy":
+        if hasattr(value, "tobytes") and hasattr(value, "dtype"):
+            if value.dtype.kind in "iuf" and value.ndim == 0:
+                _canonical(value.item(), digest)
+                return
+            if value.dtype.hasobject:
+                raise Uncacheable("object arrays have no canonical form")
+            digest.update(f"a:{value.dtype.str}{value.shape}".encode())
+            digest.update(value.tobytes())
+        else:
+            raise Uncacheable(f"no canonical form for {type(value).__name__}")
+    elif isinstance(getattr(value, "key", None), str):  # PoolSnapshot: already content-addressed
+        digest.update(f"k:{type(value).__name__}:{value.key};".encode())
+    elif hasattr(type(value), "__slots__"):  # Ladder, Fill
+        digest.update(f"o:{type(value).__qualname__}".encode())
+        for name in type(value).__slots__:
+            _canonical(getattr(value, name), digest)
+    else:
+        raise Uncacheable(f"no canonical form for {type(value).__name__}")
+
+
+def content_key(*parts):
+    """Hex content address of any canonical values; raises Uncacheable"""
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        _canonical(part, digest)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Memory LRU in front of an SQLite file with a size cap"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, memory_entries=MEMORY_ENTRIES):
+        self.path = path or DEFAULT_DIR
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.hits = self.memory_hits = self.misses = 0
+
+        self._inherited = []  # Connections from before a fork: never used or closed again
+
+        os.makedirs(self.path, exist_ok=True)
+        self._connect()
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, size INTEGER, "
+                        "used REAL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != code_version():
+            self.clear()
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (code_version(),))
+        self.size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _connect(self):
+        self._db = sqlite3.connect(os.path.join(self.path, "cache.sqlite"), isolation_level=None,
+                                   check_same_thread=False)
+        self._pid = os.getpid()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # A crash may lose recent entries, never corrupt the file
+
+    @property
+    def db(self):
+        """This process's connection; a forked worker opens its own on first use"""
+        if self._pid != os.getpid():
+            # Closing the parent's connection here could checkpoint or remove its WAL under it
+            self._inherited.append(self._db)
+            self._connect()
+            self.size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return self._db
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, self)
+        if value is not self:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            self.memory_hits += 1
+            return value
+
+        row = self.db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        self.db.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+        value = pickle.loads(row[0])
+        self._remember(key, value)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._remember(key, value)
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # Still served from memory for this session
+        if len(blob) > self.max_bytes:
+            return
+        old = self.db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (key, blob, len(blob), time.time()))
+        self.size += len(blob) - (old[0] if old else 0)
+        if self.size > self.max_bytes:
+            self._evict()
+
+    def _remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _evict(self):
+        """Drop least recently used entries until the file is back under its cap"""
+        freed = 0
+        doomed = []
+        for key, size in self.db.execute("SELECT key, size FROM entries ORDER BY used"):
+            if self.size - freed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        self.db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.size -= freed
+
+    def clear(self):
+        self.memory.clear()
+        self.db.execute("DELETE FROM entries")
+        self.size = 0
+
+    def info(self):
+        entries = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"path": self.path, "version": code_version(), "entries": entries, "bytes": self.size,
+                "max_bytes": self.max_bytes, "memory_entries": len(self.memory), "hits": self.hits,
+                "memory_hits": self.memory_hits, "misses": self.misses}
+
+    def close(self):
+        if self._pid == os.getpid():
+            self._db.close()
+
+
+def _plain(value):
+    """Whether `value` hashes by content: numbers, strings, None and tuples of them
+
+    Bools are left out: True == 1 as a dict key, but they hash to different entries.
+    """
+    if isinstance(value, tuple):
+        return all(_plain(item) for item in value)
+    return value is None or isinstance(value, (int, float, str)) and not isinstance(value, bool)
+
+
+def cached(name):
+    """Decorator serving repeat calls of a strategy function from the cache while it is enabled"""
+    def decorate(function):
+        signature = inspect.signature(function)
+        keys = {}  # Plain call arguments -> content key, skipping the bind and hash on repeats
+
+        def wrapper(*args, **kwargs):
+            cache = _active
+            if cache is None:
+                return function(*args, **kwargs)
+            call = (args, tuple(sorted(kwargs.items())))
+            key = keys.get(call) if _plain(call) else None
+            if key is None:
+                try:
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    key = content_key(name, bound.arguments)
+                except Uncacheable:
+                    return function(*args, **kwargs)
+                if _plain(call) and len(keys) < MEMORY_ENTRIES:
+                    keys[call] = key
+
+            result = cache.get(key, cache)
+            if result is cache:
+                result = function(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.__wrapped__ = function
+        for attribute in ("__module__", "__name__", "__qualname__", "__doc__"):
+            setattr(wrapper, attribute, getattr(function, attribute))
+        return wrapper
+    return decorate
+
+
+def _table_key(title, scenarios, rule_width, fmt):
+    """Content address of a rendered table, or None if the rows have no canonical form"""
+    engine = sys.modules.get("hedging.engine")
+    if not hasattr(scenarios, "__len__") or len(scenarios) > MAX_TABLE_ROWS:
+        return None
+    try:
+        if engine is not None and isinstance(scenarios, engine.OutcomeTable):
+            names = scenarios.names
+            if not isinstance(names, list):  # Lazily rendered names: hashing them costs a render
+                return None
+            return content_key("table", title, rule_width, fmt, names, scenarios.rows, scenarios.original_bet,
+                               scenarios.hedge_bet)
+        if isinstance(scenarios, list):
+            return content_key("table", title, rule_width, fmt, scenarios)
+    except Uncacheable:
+        pass
+    return None
+
+
+def rendered(title, scenarios, rule_width, fmt, render):
+    """Rendered table text, from the cache when possible; `render(stream)` writes it"""
+    cache = _active
+    key = None if cache is None else _table_key(title, scenarios, rule_width, fmt)
+    if key is None:
+        return None
+    text = cache.get(key)
+    if text is None:
+        buffer = StringIO()
+        render(buffer)
+        text = buffer.getvalue()
+        cache.put(key, text)
+    return text
+
+
+def enable(path=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Open (or create) the cache at `path` and start using it"""
+    global _active
+    if _active is not None:
+        _active.close()
+    _active = ResultCache(path, max_bytes)
+    return _active
+
+
+def disable():
+    """Stop caching; returns the cache that was in use (already closed)"""
+    global _active
+    cache, _active = _active, None
+    if cache is not None:
+        cache.close()
+    return cache
+
+
+def active():
+    return _active
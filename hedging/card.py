@@ -0,0 +1,123 @@
+"""Race-card scheduler: evaluate every race's hedges across a process pool.
+
+A card is a list of races, each naming the strategies to evaluate with
+their bet details:
+
+    {"track": "Aqueduct", "race": 3, "strategies": [
+        {"strategy": "exacta", "params": {"straight_odds": 30}},
+        {"strategy": "dutch", "params": {"odds": {"1": 3, "4": 5}}}]}
+
+Each race is one work unit. Races are sent to the workers in chunks so the
+cost of pickling them is shared, and results come back in card order. A
+worker returns plain summaries rather than OutcomeTables, which render names
+lazily through closures that cannot cross a process boundary.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from hedging import registry
+from hedging.batch import chunked
+from hedging.profiling import profiled
+
+CHUNKS_PER_WORKER = 4  # Enough chunks per worker to even out slow races
+
+
+def read_card(path):
+    """Races from a JSON array or JSON-lines file ("-" reads stdin)"""
+    source = sys.stdin if path == "-" else open(path)
+    try:
+        text = source.read()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _params(params):
+    """JSON object keys are strings; horse-number maps need them back as ints"""
+    return {key: {int(k) if k.isdigit() else k: v for k, v in value.items()} if isinstance(value, dict) else value
+            for key, value in (params or {}).items()}
+
+
+def summarize(result):
+    """Plain-data summary of whatever a strategy function returns"""
+    if isinstance(result, tuple):  # (OutcomeTable, solution) style results
+        result = result[0]
+    if isinstance(result, list):  # Per-leg rows, e.g. pick_n
+        return {"rows": result}
+
+    profit = result.profit
+    return {
+        "outcomes": len(result),
+        "original_bet": result.original_bet,
+        "hedge_bet": result.hedge_bet,
+        "best_profit": float(profit.max()) if len(profit) else 0.0,
+        "worst_profit": float(profit.min()) if len(profit) else 0.0,
+        "scenarios": [{"name": name, "profit": round(value, 2)} for name, value in zip(result.names, profit.tolist())],
+    }
+
+
+@profiled("card.race")
+def evaluate_race(race):
+    """Run every strategy listed for one race"""
+    results = []
+    for entry in race.get("strategies", []):
+        name = entry["strategy"]
+        try:
+            summary = summarize(registry.get_strategy(name)(**_params(entry.get("params"))))
+        except (TypeError, ValueError) as error:
+            summary = {"error": str(error)}
+        results.append(dict(strategy=name, **summary))
+    return {"track": race.get("track"), "race": race.get("race"), "results": results}
+
+
+def _evaluate_chunk(races):
+    return [evaluate_race(race) for race in races]
+
+
+def _warm_up():
+    # Import the strategy modules once per worker rather than once per chunk
+    for name in registry.strategy_names():
+        registry.get_strategy(name)
+
+
+def evaluate_card(races, workers=None, chunk_size=None):
+    """Yield one result per race, in card order
+
+    `workers` defaults to the CPU count; with one worker (or one chunk) the
+    card runs in this process.
+    """
+    races = list(races)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(races) // (workers * CHUNKS_PER_WORKER)))
+    chunks = list(chunked(races, chunk_size))
+
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _evaluate_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_warm_up) as pool:
+        yield from chain.from_iterable(pool.map(_evaluate_chunk, chunks))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a race card across a process pool")
+    parser.add_argument("card", help="races as a JSON array or JSON lines, or - for stdin")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--chunk-size", type=int, default=None, help="races per work unit batch")
+    args = parser.parse_args(argv)
+
+    for result in evaluate_card(read_card(args.card), args.workers, args.chunk_size):
+        sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Command line entry point: python -m hedging <command>
+
+The quick calculators (dutch, lay) run on plain Python and never import
+numpy, so a one-off hedge check on a phone starts almost instantly. Heavier
+commands import what they need when they run.
+"""
+import argparse
+import json
+import sys
+
+from hedging import profiling, registry
+from hedging.render import FORMATS, display_results, format_currency
+
+# Wall-clock budget for `python -m hedging dutch ...` / `lay ...`, checked by
+# benchmarks/startup.py
+STARTUP_BUDGET_MS = 150
+
+
+def parse_selection(text):
+    """'4:5.5' -> (4, 5.5)"""
+    horse, _, odds = text.partition(":")
+    if not odds:
+        raise argparse.ArgumentTypeError(f"expected HORSE:ODDS, got {text!r}")
+    return int(horse), float(odds)
+
+
+def quick_dutch(selections, target_profit):
+    """Dutch scenario rows without touching numpy"""
+    from hedging.stream import DutchPosition
+
+    position = DutchPosition([horse for horse, _ in selections], target_profit)
+    for horse, odds in selections:
+        position.update(horse, odds)
+
+    scenarios = [
+        {
+            "name": f"Horse #{horse} wins at {odds:g}-1 odds (stake ${position.stakes[horse]:.2f})",
+            "original_bet": 0,
+            "hedge_bet": position.total_stake,
+            "profit": position.target_profit - position.total_stake
+        }
+        for horse, odds in selections
+    ]
+    scenarios.append({
+        "name": "A different horse wins (not covered)",
+        "original_bet": 0,
+        "hedge_bet": position.total_stake,
+        "profit": -position.total_stake
+    })
+    return scenarios
+
+
+def quick_lay(back_stake, back_odds, lay_odds):
+    """Green-up lay scenario rows without touching numpy"""
+    from hedging.stream import LayPosition
+
+    hedge = LayPosition(back_stake, back_odds).update(lay_odds)
+    scenarios = [
+        {"name": "Horse wins", "original_bet": back_stake, "hedge_bet": hedge["lay_stake"],
+         "profit": hedge["profit_if_wins"]},
+        {"name": "Horse loses", "original_bet": back_stake, "hedge_bet": hedge["lay_stake"],
+         "profit": hedge["profit_if_loses"]}
+    ]
+    return scenarios, hedge
+
+
+def run_list(args):
+    for name in registry.strategy_names():
+        print(f"{name:<12} {registry.describe(name)}")
+
+
+def run_demo(args):
+    for name in args.strategies or registry.strategy_names():
+        registry.get_demo(name)()
+
+
+def run_dutch(args):
+    scenarios = quick_dutch(args.selections, args.target)
+    display_results("Dutch Betting Results", scenarios, fmt=args.format)
+
+
+def run_lay(args):
+    scenarios, hedge = quick_lay(args.back_stake, args.back_odds, args.lay_odds)
+    if args.format in ("grid", "fixed"):
+        print(f"Lay ${hedge['lay_stake']:.2f} at {args.lay_odds:g}-1 "
+              f"(liability ${hedge['liability']:.2f}) to lock in {format_currency(hedge['profit_if_loses'])}")
+    display_results("Lay Betting Hedge Results", scenarios, fmt=args.format)
+
+
+def run_batch(args):
+    from hedging import batch
+
+    batch.main([args.source, args.destination, "--chunk-size", str(args.chunk_size)])
+
+
+def run_card(args):
+    from hedging import card
+
+    argv = [args.card] + (["--workers", str(args.workers)] if args.workers else [])
+    card.main(argv + (["--chunk-size", str(args.chunk_size)] if args.chunk_size else []))
+
+
+def run_sweep(args):
+    from hedging.sweep import main as sweep_main
+
+    argv = [args.strategy] + args.grid + (["--probabilities", args.probabilities] if args.probabilities else [])
+    sweep_main(argv + (["--output", args.output] if args.output else []))
+
+
+def run_cache(args):
+    from hedging import cache
+
+    store = cache.active() or cache.enable(args.cache_dir, int(args.cache_size * 1024 * 1024))
+    if args.action == "clear":
+        store.clear()
+    print(json.dumps(store.info(), indent=2))
+
+
+def run_serve(args):
+    from hedging.service import main as serve_main
+
+    serve_main(["--host", args.host, "--port", str(args.port), "--window-ms", str(args.window_ms)])
+
+
+def run_stream(args):
+    from hedging.stream import OddsStream, replay_messages
+
+    stream = OddsStream(publish=lambda event: print(json.dumps(event)))
+    stream.run(replay_messages(args.replay))
+    print(json.dumps(stream.latency_summary()), file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m hedging", description="Horse racing hedging calculators")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-stage timings, call counts and allocations to stderr")
+    parser.add_argument("--profile-memory", action="store_true", help="also trace bytes allocated (slower)")
+    parser.add_argument("--profile-output", metavar="PATH", help="export the profile as .json or .csv")
+    parser.add_argument("--cache", action="store_true",
+                        help="serve repeat calculations and tables from the persistent result cache")
+    parser.add_argument("--cache-dir", metavar="PATH", help="cache location (default ~/.cache/hedging)")
+    parser.add_argument("--cache-size", type=float, default=64, metavar="MB", help="cache size cap")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list the registered strategies").set_defaults(func=run_list)
+
+    demo = commands.add_parser("demo", help="print the worked example for strategies")
+    demo.add_argument("strategies", nargs="*", metavar="STRATEGY", help="default: all of them")
+    demo.set_defaults(func=run_demo)
+
+    dutch = commands.add_parser("dutch", help="dutch stakes for an equal return")
+    dutch.add_argument("selections", nargs="+", type=parse_selection, metavar="HORSE:ODDS")
+    dutch.add_argument("--target", type=float, default=100, help="profit to return on any selection")
+    dutch.add_argument("--format", choices=FORMATS, default="grid")
+    dutch.set_defaults(func=run_dutch)
+
+    lay = commands.add_parser("lay", help="green up a back bet with a lay")
+    lay.add_argument("--back-stake", type=float, required=True)
+    lay.add_argument("--back-odds", type=float, required=True)
+    lay.add_argument("--lay-odds", type=float, required=True)
+    lay.add_argument("--format", choices=FORMATS, default="grid")
+    lay.set_defaults(func=run_lay)
+
+    batch = commands.add_parser("batch", help="evaluate a ticket file in bulk")
+    batch.add_argument("source")
+    batch.add_argument("destination")
+    batch.add_argument("--chunk-size", type=int, default=5000)
+    batch.set_defaults(func=run_batch)
+
+    card = commands.add_parser("card", help="evaluate a race card across a process pool")
+    card.add_argument("card")
+    card.add_argument("--workers", type=int, default=None)
+    card.add_argument("--chunk-size", type=int, default=None)
+    card.set_defaults(func=run_card)
+
+    sweep = commands.add_parser("sweep", help="profit surface over a grid of a strategy's inputs")
+    sweep.add_argument("strategy")
+    sweep.add_argument("grid", nargs="+", metavar="NAME=START:STOP:COUNT|V1,V2,...")
+    sweep.add_argument("--probabilities", help="comma-separated outcome probabilities")
+    sweep.add_argument("--output", help="save the surface to an .npz file")
+    sweep.set_defaults(func=run_sweep)
+
+    cache = commands.add_parser("cache", help="show or clear the result cache")
+    cache.add_argument("action", choices=("info", "clear"))
+    cache.set_defaults(func=run_cache)
+
+    serve = commands.add_parser("serve", help="serve the strategies as JSON lines on a local port")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--window-ms", type=float, default=2.0, help="how long a batch waits for more requests")
+    serve.set_defaults(func=run_serve)
+
+    stream = commands.add_parser("stream", help="replay an odds feed file")
+    stream.add_argument("replay")
+    stream.set_defaults(func=run_stream)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [name for name in getattr(args, "strategies", []) if name not in registry.STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategy {unknown[0]!r}, expected one of {', '.join(registry.STRATEGIES)}")
+
+    if args.cache:
+        from hedging import cache
+
+        cache.enable(args.cache_dir, int(args.cache_size * 1024 * 1024))
+
+    if not (args.profile or args.profile_memory or args.profile_output):
+        args.func(args)
+        return
+
+    with profiling.profile(memory=args.profile_memory) as stats:
+        args.func(args)
+    stats.report(sys.stderr)
+    if args.profile_output:
+        stats.write(args.profile_output)
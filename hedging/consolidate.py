@@ -0,0 +1,322 @@
+"""Ticket consolidation: the cheapest straight/box/wheel/part-wheel tickets for a coverage set.
+
+Coverage is a stake wanted on each finish order. Overlapping hedge tickets
+usually say more than they mean: a $10 straight 2-5-8 plus a $1 part-wheel
+that also contains 2-5-8 puts $11 on it, where $10 was the intent. With
+combine="max", coverage_from_tickets reads such a set as "at least this much
+on every order", and consolidate() then finds tickets that deliver exactly
+that:
+
+- stakes are split into layers: every order wanting at least w_1 gets w_1,
+  every order wanting at least w_2 gets w_2 - w_1 more, and so on
+- each layer is a weighted set cover, solved greedily: from a few seed
+  orders (those with the most uncovered orders nearby) a part-wheel grows
+  a horse at a time while that improves covered orders per dollar, and the
+  best grown ticket is bought. A grown ticket is kept for the next round
+  while nothing it covers has been bought, and with no ticket cost, orders
+  with nothing wanted within two horses go straight to straight tickets
+- a ticket costs its base bet per combination plus `ticket_cost` (minimum
+  bets, slip fees); with no ticket cost a ticket never spills outside the
+  orders still wanted, so the stake total is exact and only the number of
+  tickets shrinks
+
+Finish orders live in the mixed-radix code space of CoverageIndex. Sets of
+orders are bitsets packed into uint64 words, with one precomputed bitset
+per (position, horse). A part-wheel's coverage is then the AND over
+positions of the ORs of its horses' bitsets. Every candidate horse for
+every position is scored at once with one AND and a popcount across a
+(positions, horses, words) block, which keeps superfecta-sized sets (14
+runners, 24,024 orders) interactive.
+"""
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from hedging.cache import cached
+from hedging.orders import part_wheel
+from hedging.profiling import profiled
+from hedging.records import Ticket
+
+BET_TYPES = {2: "exacta", 3: "trifecta", 4: "superfecta"}
+SEEDS = 4  # Seed orders grown into candidate tickets per purchase
+REFRESH = 16  # Purchases between recounts of each order's uncovered neighbours
+
+
+def _pack(mask):
+    """Boolean array (..., n) -> uint64 bitsets (..., words)"""
+    bits = np.packbits(mask, axis=-1, bitorder="little")
+    pad = -bits.shape[-1] % 8
+    if pad:
+        bits = np.concatenate([bits, np.zeros(bits.shape[:-1] + (pad,), dtype=np.uint8)], axis=-1)
+    return bits.view(np.uint64)
+
+
+def _unpack(bitset, n):
+    return np.unpackbits(bitset.view(np.uint8), axis=-1, count=n, bitorder="little").astype(bool)
+
+
+_BYTE_COUNTS = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def _count_bytes(bitset):
+    """Popcount per bitset through a byte table, for NumPy before 2.0"""
+    return _BYTE_COUNTS[np.ascontiguousarray(bitset).view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+if hasattr(np, "bitwise_count"):
+    def _count(bitset):
+        return np.bitwise_count(bitset).sum(axis=-1, dtype=np.int64)
+else:
+    _count = _count_bytes
+
+
+class _Space:
+    """Bitsets over the field_size ** depth finish-order codes"""
+
+    def __init__(self, field_size, depth):
+        self.field_size = field_size
+        self.depth = depth
+        self.size = field_size ** depth
+        codes = np.arange(self.size)
+        self.digits = np.stack([codes // field_size ** (depth - 1 - i) % field_size for i in range(depth)])
+
+        ordered = np.sort(self.digits, axis=0)
+        self.valid = _pack(np.all(ordered[1:] != ordered[:-1], axis=0))  # No horse twice
+        # slabs[i, h]: every code with horse h + 1 in position i
+        self.slabs = _pack(self.digits[:, None, :] == np.arange(field_size)[None, :, None])
+        self.by_horse = np.ascontiguousarray(self.slabs.transpose(1, 0, 2))
+
+    def encode(self, orders):
+        orders = np.asarray(orders, dtype=np.int64) - 1
+        return orders @ (self.field_size ** np.arange(self.depth - 1, -1, -1))
+
+    def dense(self, bitset):
+        """Bitset -> boolean tensor with one axis per position"""
+        return _unpack(bitset, self.size).reshape((self.field_size,) * self.depth)
+
+
+@lru_cache(maxsize=8)
+def _space(field_size, depth):
+    return _Space(field_size, depth)
+
+
+def coverage_from_tickets(tickets, field_size, combine="max"):
+    """{order: stake} wanted by a set of tickets
+
+    `tickets` are Ticket objects or (positions, stake) pairs. With "max" an
+    order covered by several tickets wants the largest of their stakes (the
+    overlap was duplication); with "sum" it keeps everything staked on it.
+    """
+    if combine not in ("max", "sum"):
+        raise ValueError(f"Unknown combine {combine!r}, expected one of ('max', 'sum')")
+    wanted = {}
+    for ticket in tickets:
+        positions, stake = (ticket.positions, ticket.stake) if isinstance(ticket, Ticket) else ticket
+        for order in map(tuple, part_wheel(*positions).tolist()):
+            wanted[order] = max(wanted.get(order, 0), stake) if combine == "max" else wanted.get(order, 0) + stake
+    return wanted
+
+
+class TicketPlan:
+    """Tickets that deliver a coverage set, with what they cost"""
+
+    def __init__(self, field_size, depth, tickets, kinds):
+        self.field_size = field_size
+        self.depth = depth
+        self.tickets = tickets
+        self.kinds = kinds
+        self.combos = [len(part_wheel(*ticket.positions)) for ticket in tickets]
+
+    @property
+    def cost(self):
+        return sum(ticket.stake * combos for ticket, combos in zip(self.tickets, self.combos))
+
+    def coverage(self):
+        return coverage_from_tickets(self.tickets, self.field_size, combine="sum")
+
+    def as_dicts(self):
+        return [{"kind": kind, "horses": "/".join(",".join(map(str, group)) for group in ticket.positions),
+                 "base_bet": ticket.stake, "combos": combos, "cost": ticket.stake * combos}
+                for ticket, kind, combos in zip(self.tickets, self.kinds, self.combos)]
+
+
+def _kind(sets):
+    if all(len(group) == 1 for group in sets):
+        return "straight"
+    if all(group == sets[0] for group in sets):
+        return "box"
+    if len(sets[0]) == 1 and all(group == sets[1] for group in sets[1:]):
+        return "wheel"
+    return "part_wheel"
+
+
+def _grow(space, seed, remaining, stake, ticket_cost):
+    """Grow a part-wheel from one seed order while covered orders per dollar do not fall
+
+    A step adds one horse to one position, one horse to every position, or
+    every horse on the ticket to every position (which turns a straight
+    into a box). The last two reach boxes, whose orders are never a single
+    horse apart.
+    """
+    depth = space.depth
+    chosen = np.zeros((depth, space.field_size), dtype=bool)
+    chosen[np.arange(depth), space.digits[:, seed]] = True
+    positions = space.slabs[np.arange(depth), space.digits[:, seed]]  # OR of each position's horses
+    size, useful = 1, 1
+
+    while True:
+        # One horse in one position: orders the other positions allow, for each position in turn
+        before = np.bitwise_and.accumulate(np.concatenate([space.valid[None], positions[:-1]]), axis=0)
+        after = np.bitwise_and.accumulate(np.concatenate([space.valid[None], positions[:0:-1]]), axis=0)[::-1]
+        others = before & after
+        single = space.slabs & others[:, None, :]
+        # One horse in every position, and the closure over the ticket's horses
+        everywhere = np.bitwise_and.reduce(positions[None] | space.by_horse, axis=1)
+        horses = chosen.any(axis=0)
+        closed = np.bitwise_or.reduce(space.slabs[:, horses], axis=1)
+        moves = np.concatenate([single.reshape(-1, single.shape[-1]), everywhere & space.valid,
+                                np.bitwise_and.reduce(closed, axis=0, keepdims=True) & space.valid])
+        # Single-position moves hold only new orders; the others contain the current ticket
+        added = _count(moves)
+        gained = _count(moves & remaining)
+        added[single.shape[0] * single.shape[1]:] -= size
+        gained[single.shape[0] * single.shape[1]:] -= useful
+        stale = np.concatenate([chosen.ravel(), (chosen | ~horses[None]).all(axis=0) | chosen.all(axis=0), [False]])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(stale | (gained <= 0), -np.inf, (useful + gained) / (stake * (size + added) + ticket_cost))
+        best = int(np.argmax(ratio + 1e-12 * gained))
+        if ratio[best] < useful / (stake * size + ticket_cost) - 1e-12:
+            break
+
+        if best < chosen.size:
+            chosen.ravel()[best] = True
+            i, horse = divmod(best, space.field_size)
+            positions[i] |= space.slabs[i, horse]
+        elif best < chosen.size + space.field_size:
+            horse = best - chosen.size
+            chosen[:, horse] = True
+            positions |= space.slabs[:, horse]
+        else:
+            chosen[:] = horses
+            positions = closed
+        size += int(added[best])
+        useful += int(gained[best])
+
+    cover = np.bitwise_and.reduce(positions, axis=0) & space.valid
+    return chosen, cover, useful / (stake * size + ticket_cost), useful
+
+
+def _degree(space, remaining):
+    """For each uncovered order, the uncovered orders at most two horses away (counting itself per pair)"""
+    dense = space.dense(remaining).astype(np.int32)
+    pairs = combinations(range(space.depth), min(2, space.depth))
+    return (sum(dense.sum(axis=pair, keepdims=True) for pair in pairs) * dense).ravel()
+
+
+def _cover_layer(space, wanted, stake, ticket_cost, seeds):
+    """Greedy set cover of one layer; yields position sets"""
+    remaining = wanted.copy()
+    grown = {}  # Seed code -> (chosen, cover, ratio, useful)
+    alone = comb(space.depth, 2)  # An order's own count when nothing wanted is near it
+    bought = REFRESH
+    while _count(remaining):
+        if bought >= REFRESH:
+            # Degrees only fall as orders are covered, so a stale one still ranks seeds well
+            degree, bought = _degree(space, remaining), 0
+        codes = np.flatnonzero(_unpack(remaining, space.size))
+        if len(codes) > seeds:
+            codes = codes[np.argpartition(-degree[codes], seeds - 1)[:seeds]]
+        if ticket_cost == 0:
+            # Orders with no wanted neighbour to share a ticket with go as straights
+            lone = np.flatnonzero(degree == alone)
+            if len(lone):
+                for code in lone:
+                    yield tuple((int(horse) + 1,) for horse in space.digits[:, code])
+                remaining &= ~_pack(np.isin(np.arange(space.size), lone))
+                degree[lone] = 0
+                continue
+
+        candidates = []
+        for code in codes:
+            # A ticket grown earlier stands if nothing it covers has been bought since
+            ticket = grown.get(code)
+            if ticket is None or _count(ticket[1] & remaining) != ticket[3]:
+                ticket = grown[code] = _grow(space, code, remaining, stake, ticket_cost)
+            candidates.append(ticket)
+        chosen, cover = max(candidates, key=lambda ticket: ticket[2:])[:2]
+        remaining &= ~cover
+        bought += 1
+        yield tuple(tuple(int(horse) + 1 for horse in np.flatnonzero(row)) for row in chosen)
+
+
+@profiled("consolidate")
+def consolidate(coverage, field_size, ticket_cost=0.0, seeds=SEEDS):
+    """Cheapest tickets found for `coverage`, a {finish order: stake} mapping
+
+    Orders are tuples or "3-5-7" strings, all of one depth. Returns a
+    TicketPlan; with no ticket cost every order gets exactly its stake.
+    """
+    orders = [tuple(map(int, order.split("-"))) if isinstance(order, str) else tuple(order) for order in coverage]
+    if not orders:
+        return TicketPlan(field_size, 0, [], [])
+    depth = len(orders[0])
+    if depth not in BET_TYPES or any(len(order) != depth for order in orders):
+        raise ValueError("Coverage orders must all be exacta, trifecta or superfecta orders")
+    flat = np.asarray(orders)
+    if flat.min() < 1 or flat.max() > field_size or (np.sort(flat, axis=1)[:, 1:] == np.sort(flat, axis=1)[:, :-1]).any():
+        raise ValueError(f"Coverage orders must use distinct horses from the {field_size}-runner field")
+
+    space = _space(field_size, depth)
+    weights = np.zeros(space.size)
+    weights[space.encode(flat)] = list(coverage.values())
+
+    stakes = {}  # Position sets -> base bet, so a layer's ticket adds onto an identical one below it
+    floor = 0.0
+    for level in np.unique(weights[weights > 0]):
+        wanted = _pack(weights >= level) & space.valid
+        for sets in _cover_layer(space, wanted, level - floor, ticket_cost, seeds):
+            stakes[sets] = stakes.get(sets, 0.0) + float(level - floor)
+        floor = level
+
+    tickets = [Ticket(BET_TYPES[depth], sets, round(stake, 10), None) for sets, stake in stakes.items()]
+    return TicketPlan(field_size, depth, tickets, [_kind(ticket.positions) for ticket in tickets])
+
+
+# The exotic hedges' tickets: (field size, ((positions, base bet), ...))
+DEMO_TICKETS = {
+    "exacta": (8, ((((3,), (5,)), 20), (((3, 5, 7), (3, 5, 7)), 5))),
+    "trifecta": (10, ((((2,), (5,), (8,)), 10), (((2,), (5, 8, 9), (5, 8, 9, 10)), 1))),
+    "superfecta": (12, ((((4,), (7,), (2,), (9,)), 5), (((4,), (7,), (2,), (9, 11)), 2))),
+}
+
+
+@profiled("strategy.consolidate")
+@cached("consolidate")
+def consolidate_hedge(tickets=DEMO_TICKETS["trifecta"][1], field_size=10, ticket_cost=0.0, combine="max"):
+    """Overlapping (positions, base bet) tickets rebought as the cheapest set found; one dict per ticket"""
+    return consolidate(coverage_from_tickets(tickets, field_size, combine), field_size, ticket_cost).as_dicts()
+
+
+@profiled("demo.consolidate")
+def hedge_consolidation():
+    """
+    Consolidating the exotic hedges
+    - Each straight ticket is also inside its hedge, so that order is bet twice
+    - Read as "at least this much on every order", the same coverage costs less
+    """
+    print("\nCONSOLIDATING OVERLAPPING HEDGE TICKETS")
+    print("Strategy: Rebuying each hedge's coverage as the fewest, cheapest tickets")
+    for name, (field_size, tickets) in DEMO_TICKETS.items():
+        before = sum(stake * len(part_wheel(*positions)) for positions, stake in tickets)
+        plan = consolidate_hedge(tickets, field_size)
+        after = sum(ticket["cost"] for ticket in plan)
+        print(f"\n{name.capitalize()}: ${before:.2f} in {len(tickets)} tickets -> ${after:.2f} in {len(plan)}")
+        for ticket in plan:
+            print(f"  ${ticket['base_bet']:.2f} {ticket['kind'].replace('_', '-')} {ticket['horses']} "
+                  f"x {ticket['combos']} = ${ticket['cost']:.2f}")
+
+
+if __name__ == "__main__":
+    hedge_consolidation()
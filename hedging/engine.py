@@ -0,0 +1,107 @@
+"""Vectorized outcome engine shared by the hedging calculators.
+
+A ticket set is a vector of stakes plus a returns matrix with one row per
+ticket and one column per finishing outcome. Each cell holds what $1 on that
+ticket gives back if that outcome happens, using the same convention as the
+examples: a winning stake at odds X returns stake * X.
+"""
+from itertools import chain
+
+import numpy as np
+
+from hedging.profiling import profiled
+from hedging.records import LazyNames, Scenario
+
+
+def returns_matrix(hits, prices, n_outcomes):
+    """Build a tickets x outcomes returns matrix from per-ticket hit lists"""
+    n_tickets = len(hits)
+    counts = np.fromiter((len(h) for h in hits), dtype=np.intp, count=n_tickets)
+    rows = np.repeat(np.arange(n_tickets), counts)
+    cols = np.fromiter(chain.from_iterable(hits), dtype=np.intp, count=int(counts.sum()))
+    prices = np.broadcast_to(np.asarray(prices, dtype=float), (n_tickets,))
+
+    returns = np.zeros((n_tickets, n_outcomes))
+    np.add.at(returns, (rows, cols), np.repeat(prices, counts))
+    return returns
+
+
+def outcome_profits(stakes, returns):
+    """Net profit for every outcome; stakes may carry leading batch axes"""
+    stakes = np.asarray(stakes, dtype=float)
+    return stakes @ returns - stakes.sum(axis=-1, keepdims=True)
+
+
+def outcome_roi(profit, investment):
+    """ROI % for every outcome, 0 where nothing was invested"""
+    profit = np.asarray(profit, dtype=float)
+    investment = np.broadcast_to(np.asarray(investment, dtype=float), profit.shape)
+    return np.divide(profit * 100, investment, out=np.zeros_like(profit), where=investment > 0)
+
+
+# One row per outcome: 12 bytes (ROI is derived from profit on demand)
+SCENARIO_DTYPE = np.dtype([("outcome", np.int32), ("profit", np.float64)])
+
+
+class OutcomeTable:
+    """Profit and ROI of one ticket set across all of its outcomes
+
+    Rows live in a SCENARIO_DTYPE array. `names` is either a list or a
+    callable turning an outcome key into its name, in which case names are
+    only rendered when displayed.
+    """
+
+    __slots__ = ("rows", "names", "original_bet", "hedge_bet")
+
+    def __init__(self, names, original_bet, hedge_bet, profit, outcomes=None):
+        profit = np.asarray(profit, dtype=float)
+        self.rows = np.empty(len(profit), dtype=SCENARIO_DTYPE)
+        self.rows["profit"] = profit
+        self.rows["outcome"] = np.arange(len(profit)) if outcomes is None else outcomes
+        self.names = LazyNames(names, self.rows["outcome"]) if callable(names) else names
+        self.original_bet = float(original_bet)
+        self.hedge_bet = float(hedge_bet)
+
+    @property
+    def profit(self):
+        return self.rows["profit"]
+
+    @property
+    def roi(self):
+        return outcome_roi(self.profit, self.original_bet + self.hedge_bet)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __reduce__(self):
+        # Lazy names hold closures, which do not pickle; send them rendered
+        return OutcomeTable, (list(self.names), self.original_bet, self.hedge_bet, self.profit, self.rows["outcome"])
+
+    def __iter__(self):
+        """Yield one Scenario per outcome, as display_results expects"""
+        for name, profit in zip(self.names, self.profit.tolist()):
+            yield Scenario(name, self.original_bet, self.hedge_bet, profit)
+
+
+@profiled("payout")
+def evaluate(names, stakes, returns, hedge=None):
+    """Evaluate a ticket set; `hedge` marks which tickets are hedge bets"""
+    stakes = np.asarray(stakes, dtype=float)
+    if hedge is None:
+        hedge = np.zeros(stakes.shape, dtype=bool)
+    else:
+        hedge = np.asarray(hedge, dtype=bool)
+
+    profit = outcome_profits(stakes, returns)
+    return OutcomeTable(names, stakes[~hedge].sum(), stakes[hedge].sum(), profit)
+
+
+@profiled("payout")
+def evaluate_batch(stakes, returns):
+    """Profit and ROI for many ticket sets sharing one returns matrix
+
+    `stakes` is (sets, tickets); both results are (sets, outcomes).
+    """
+    stakes = np.asarray(stakes, dtype=float)
+    profit = outcome_profits(stakes, returns)
+    return profit, outcome_roi(profit, stakes.sum(axis=-1, keepdims=True))
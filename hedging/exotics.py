@@ -0,0 +1,315 @@
+"""Exotic bet hedging strategies: exacta, trifecta, Pick 6 / Pick N, superfecta and dutch.
+
+Each strategy has a calculation function that takes the bet details (the
+defaults are the worked example) and returns an OutcomeTable, plus a
+hedge_* demo that prints the example the way the original script did.
+"""
+import numpy as np
+
+from hedging import pools
+from hedging.cache import cached
+from hedging.engine import evaluate, returns_matrix
+from hedging.orders import CoverageIndex, box, order_label, part_wheel, straight
+from hedging.pickn import PickCard
+from hedging.profiling import profiled
+from hedging.render import display_results, format_currency
+from hedging.simulate import field_probabilities, simulate
+from hedging.solver import solve_final_leg
+
+RULE_WIDTH = 90
+
+
+def _exotic_table(field_size, original, hedge_combos, stakes, prices, label, hedge_label, pool=None):
+    """Straight ticket hedged by a set of combinations, over every finish order
+
+    With a PoolSnapshot every combination pays its own will-pay instead of
+    the flat `prices`.
+    """
+    index = CoverageIndex(field_size, len(original), [straight(original), hedge_combos])
+    order_prices = None
+    if pool is not None:
+        if (pool.field_size, pool.depth) != (field_size, len(original)):
+            raise ValueError(f"{pool!r} does not match a {field_size}-runner {label}")
+        order_prices = pools.order_prices(pool)
+
+    def name(order):
+        if tuple(order) == tuple(original):
+            return f"Horses finish {order_label(order)} (original {label} hits)"
+        return f"Horses finish {order_label(order)} ({hedge_label})"
+
+    return index.outcome_table(stakes, prices, hedge=[False, True], name=name, order_prices=order_prices)
+
+
+@profiled("strategy.exacta")
+@cached("exacta")
+def exacta_hedge(straight_horses=(3, 5), straight_bet=20, straight_odds=25,
+                 box_horses=(3, 5, 7), box_bet=5, box_odds=18, field_size=8, pool=None):
+    """Straight exacta hedged with an exacta box; `pool` prices each combination"""
+    return _exotic_table(field_size, straight_horses, box(box_horses, 2),
+                         [straight_bet, box_bet], [straight_odds, box_odds], "exacta", "covered by the box", pool)
+
+
+def _demo_exacta_pool():
+    """Exacta pool for the exacta example: win-pool money plus the published combinations"""
+    win_pool = [5000, 8000, 30000, 6000, 25000, 12000, 20000, 4000]  # Horses 1-8
+    combo_money = {"3-5": 1500, "5-3": 2200, "3-7": 900, "7-3": 1300, "5-7": 1700}
+    return pools.PoolSnapshot(8, "exacta", 50000, takeout=0.2, combo_money=combo_money, win_pool=win_pool,
+                              breakage=0.1)
+
+
+@profiled("strategy.exacta_pool")
+@cached("exacta_pool")
+def exacta_pool_hedge(pool=None):
+    """The exacta example with every combination priced from its pool"""
+    return exacta_hedge(pool=pool or _demo_exacta_pool())
+
+
+@profiled("strategy.trifecta")
+@cached("trifecta")
+def trifecta_hedge(straight_horses=(2, 5, 8), straight_bet=10, straight_odds=180,
+                   wheel_positions=((2,), (5, 8, 9), (5, 8, 9, 10)), wheel_bet=1, wheel_odds=60,
+                   field_size=10, pool=None):
+    """Straight trifecta hedged with a part-wheel; `pool` prices each combination"""
+    return _exotic_table(field_size, straight_horses, part_wheel(*wheel_positions),
+                         [straight_bet, wheel_bet], [straight_odds, wheel_odds], "trifecta", "wheel combination", pool)
+
+
+@profiled("strategy.superfecta")
+@cached("superfecta")
+def superfecta_hedge(straight_horses=(4, 7, 2, 9), straight_bet=5, straight_odds=1200,
+                     box_positions=((4,), (7,), (2,), (9, 11)), box_bet=2, box_odds=600,
+                     field_size=12, pool=None):
+    """Straight superfecta hedged with a partial box; `pool` prices each combination"""
+    return _exotic_table(field_size, straight_horses, part_wheel(*box_positions),
+                         [straight_bet, box_bet], [straight_odds, box_odds], "superfecta", "box combination", pool)
+
+
+@profiled("strategy.pick_six")
+@cached("pick_six")
+def pick_six_hedge(ticket_cost=48, payout=10000, alive_horse=3, live_odds=None, bankroll=600,
+                   objective="maximin"):
+    """Final-leg Pick 6 hedge; returns (OutcomeTable, HedgeSolution)"""
+    if live_odds is None:
+        live_odds = {1: 4, 2: 20, 4: 12, 5: 7, 6: 25, 7: 30, 8: 15}  # Every other runner in the leg
+    runners = list(live_odds)
+    odds = np.array([live_odds[horse] for horse in runners], dtype=float)
+    solution = solve_final_leg(payout, ticket_cost, odds, bankroll, objective)
+    covered = solution.stakes > 0
+
+    # Outcomes: the Pick 6 horse wins, each hedged horse wins, an uncovered horse wins
+    hits = [[0]] + [[i + 1] for i in range(covered.sum())]
+    prices = np.concatenate([[payout / ticket_cost], odds[covered]])
+    stakes = np.concatenate([[ticket_cost], solution.stakes[covered]])
+    hedge = np.arange(len(stakes)) > 0
+
+    names = [f"Horse #{alive_horse} wins (original Pick 6 hits)"]
+    names += [f"Horse #{horse} wins at {live_odds[horse]}-1 odds" for horse, c in zip(runners, covered) if c]
+    if not covered.all():
+        names.append("A different horse wins (not covered by any bet)")
+    table = evaluate(names, stakes, returns_matrix(hits, prices, len(names)), hedge)
+    return table, solution
+
+
+def _demo_leg_odds():
+    """Win odds per leg of the Pick 6 example, indexed by horse number (0 is unused)"""
+    nan = np.nan
+    return np.array([
+        [nan, 3, 6, 8, 5, 12, 9, 20, 15, 30],
+        [nan, 7, 10, 4, 9, 6, 3.5, 25, 12, 18],
+        [nan, 11, 4, 16, 8, 20, 9, 3, 14, 30],
+        [nan, 9, 14, 2.5, 6, 5, 18, 22, 12, nan],
+        [nan, 4, 12, 9, 16, 10, 6, 25, 5, 30],
+        [nan, 4, 20, 5, 12, 7, 25, 30, 15, nan],  # Matches the final-leg example
+    ])
+
+
+@profiled("strategy.pick_n")
+@cached("pick_n")
+def pick_n_hedge(legs=((1,), (4, 6), (2, 7), (3, 5), (1, 6, 8), (3, 9)), winners=(1, 6, 7, 3, 8),
+                 base_bet=1, will_pay=10000, leg_odds=None, bankroll=600):
+    """Pick N ticket followed leg by leg, with the best hedge before each leg
+
+    Before every leg that runs the ticket is still alive, the next leg's
+    runners are hedged at their odds. Earlier legs value the ticket by its
+    expected return, using win probabilities implied by each leg's odds.
+    Returns one dict per leg.
+    """
+    if leg_odds is None:
+        leg_odds = _demo_leg_odds()
+    leg_odds = np.asarray(leg_odds, dtype=float)
+    implied = np.where(np.isfinite(leg_odds), 1 / (leg_odds + 1), 0)  # Odds X-1 pay back X + 1
+    probabilities = implied / implied.sum(axis=1, keepdims=True)
+
+    card = PickCard([legs], base_bet)
+    rows = []
+    for leg in range(card.n_legs):
+        alive = int(card.alive_combinations().sum())
+        if not card.alive.any():
+            break
+        hedge = card.hedge(will_pay, leg_odds[leg], probabilities, bankroll)
+        winner = winners[leg] if leg < len(winners) else None
+        rows.append({"leg": leg + 1, "alive_combinations": alive, "hedge_stake": float(hedge.total_stake),
+                     "guaranteed": float(hedge.guaranteed), "winner": winner})
+        if winner is None:
+            break
+        card.record(winner)
+    return rows
+
+
+@profiled("strategy.dutch")
+@cached("dutch")
+def dutch(odds=None, target_profit=100):
+    """Dutch stakes returning `target_profit` on whichever selection wins
+
+    `odds` maps horse number to odds; returns (OutcomeTable, stakes).
+    """
+    if odds is None:
+        odds = {1: 3, 4: 5, 6: 9}
+    prices = np.array(list(odds.values()), dtype=float)
+    stakes = target_profit / prices
+
+    # Outcomes: each dutched horse wins, then a horse outside the dutch wins
+    hits = [[i] for i in range(len(prices))]
+    hedge = np.ones(len(prices), dtype=bool)  # No original bet, this is a different strategy
+
+    names = [f"Horse #{horse} wins at {price}-1 odds" for horse, price in odds.items()]
+    names.append("A different horse wins (not covered)")
+    return evaluate(names, stakes, returns_matrix(hits, prices, len(names)), hedge), stakes
+
+
+@profiled("demo.exacta")
+def hedge_exacta():
+    """
+    Example 1: Hedging an Exacta bet
+    - Original bet: $20 exacta on horses 3-5 (horse 3 to win, horse 5 to place)
+    - Hedge: $5 exacta box on horses 3, 5, 7 (covers all permutations)
+    """
+    print("\n1. HEDGING AN EXACTA BET")
+    print("Strategy: Using an exacta box to hedge a straight exacta bet")
+    display_results("Exacta Hedging Results", exacta_hedge(), RULE_WIDTH)
+
+
+@profiled("demo.exacta_pool")
+def hedge_exacta_pool():
+    """
+    Example 1 again, priced from the pari-mutuel pool
+    - Each box permutation pays its own will-pay instead of a flat 18-1
+    - 7-5 has no published money, so it is priced from win-pool probabilities
+    """
+    print("\nHEDGING AN EXACTA BET AT POOL PRICES")
+    print("Strategy: Using an exacta box, with will-pays estimated from the pool")
+    pool = _demo_exacta_pool()
+    orders = box((3, 5, 7), 2)
+    for order, price in zip(orders, pools.will_pay(pool, orders)):
+        print(f"Will-pay {order_label(order)}: ${price:.2f} per $1")
+    display_results("Exacta Hedging Results (pool prices)", exacta_pool_hedge(pool), RULE_WIDTH)
+
+
+@profiled("demo.trifecta")
+def hedge_trifecta():
+    """
+    Example 2: Hedging a Trifecta bet
+    - Original bet: $10 trifecta 2-5-8 (exact order)
+    - Hedge: $1 trifecta part-wheel 2 with 5,8,9 with 5,8,9,10
+    """
+    print("\n2. HEDGING A TRIFECTA BET")
+    print("Strategy: Using a part-wheel to hedge a straight trifecta bet")
+    display_results("Trifecta Hedging Results", trifecta_hedge(), RULE_WIDTH)
+
+
+@profiled("demo.pick_six")
+def hedge_pick_six():
+    """
+    Example 3: Hedging a Pick 6 bet
+    - Original bet: $48 Pick 6 ticket, alive to the final leg with horse #3
+    - Hedge: Win bets on every other runner, solved for the best guaranteed profit
+    """
+    print("\n3. HEDGING A PICK 6 BET")
+    print("Strategy: Hedging the final leg of a Pick 6 when first 5 legs have hit")
+
+    live_odds = {1: 4, 2: 20, 4: 12, 5: 7, 6: 25, 7: 30, 8: 15}
+    scenarios, solution = pick_six_hedge(live_odds=live_odds)
+    for horse, stake in zip(live_odds, solution.stakes):
+        print(f"Hedge ${stake:.2f} on horse #{horse} at {live_odds[horse]}-1")
+    print(f"Guaranteed minimum profit: {format_currency(solution.guaranteed)}")
+
+    display_results("Pick 6 Hedging Results", scenarios, RULE_WIDTH)
+
+
+@profiled("demo.pick_n")
+def hedge_pick_n():
+    """
+    Pick N: the $48 Pick 6 ticket followed from the first leg
+    - Ticket: 1 / 4,6 / 2,7 / 3,5 / 1,6,8 / 3,9 at $1 a combination
+    - Before each leg: the hedge on that leg's runners, valuing the ticket
+      by its expected return until the final leg, where the payout is known
+    """
+    print("\nPICK N LEG-BY-LEG HEDGING")
+    print("Strategy: Re-solving the hedge before every leg while the ticket is alive")
+    legs = ((1,), (4, 6), (2, 7), (3, 5), (1, 6, 8), (3, 9))
+    card = PickCard([legs])
+    print(f"Ticket: {' / '.join(','.join(map(str, leg)) for leg in legs)} "
+          f"({int(card.combinations[0])} combinations, cost ${card.cost[0]:.2f})")
+
+    for row in pick_n_hedge(legs):
+        print(f"Leg {row['leg']}: {row['alive_combinations']} combinations alive, "
+              f"hedge ${row['hedge_stake']:.2f} for a floor of {format_currency(row['guaranteed'])}")
+        if row["winner"] is not None:
+            print(f"  Horse #{row['winner']} wins leg {row['leg']}")
+    print("Floors before the final leg are expected values, the final-leg floor is guaranteed")
+
+
+@profiled("demo.superfecta")
+def hedge_superfecta():
+    """
+    Example 4: Hedging a Superfecta bet with a box strategy
+    """
+    print("\n4. HEDGING A SUPERFECTA BET")
+    print("Strategy: Hedging a straight superfecta with a smaller superfecta box")
+    display_results("Superfecta Hedging Results", superfecta_hedge(), RULE_WIDTH)
+
+
+@profiled("demo.dutch")
+def dutch_betting():
+    """
+    Example 5: Dutch Betting (a form of arbitrage across multiple horses)
+    """
+    print("\n5. DUTCH BETTING")
+    print("Strategy: Betting on multiple horses in proportions that guarantee the same return")
+
+    odds = {1: 3, 4: 5, 6: 9}
+    probabilities = {1: 0.25, 4: 0.15, 6: 0.10}
+    scenarios, stakes = dutch(odds, target_profit=100)
+    display_results("Dutch Betting Results", scenarios, RULE_WIDTH)
+
+    # Simulate the race from each horse's win probability (the rest of the field shares what's left)
+    field_size = 10
+    probs = field_probabilities(probabilities, field_size)
+    index = CoverageIndex(field_size, 1, [straight((horse,)) for horse in odds])
+    summary = simulate(index, probs, stakes, list(odds.values()), n_races=200_000, seed=1).summary()
+
+    print(f"Simulated {summary['races']:,} races (Harville model):")
+    print(f"Expected profit: {format_currency(summary['expected_profit'])} (std ${summary['std']:.2f})")
+    print(f"Chance of a loss: {summary['loss_probability'] * 100:.1f}%")
+    print(f"5th percentile profit: {format_currency(summary['p5'])}")
+
+
+def main():
+    """Run all examples"""
+    print("\nEXOTIC HORSE RACING BET HEDGING STRATEGIES")
+    print("=========================================")
+
+    hedge_exacta()
+    hedge_trifecta()
+    hedge_pick_six()
+    hedge_superfecta()
+    dutch_betting()
+
+    print("\nSummary of Exotic Bet Hedging:")
+    print("1. Exacta hedging: Use box bets to cover multiple finish orders")
+    print("2. Trifecta hedging: Use part-wheels to protect key horses")
+    print("3. Pick 6 hedging: Secure profit when alive to final leg")
+    print("4. Superfecta hedging: Cover additional combinations for 4th position")
+    print("5. Dutch betting: Distribute stakes to achieve equal return regardless of outcome")
+    print("\nExotic bet hedging requires careful stake calculation and understanding of bet structures")
+    print("The optimal strategy balances coverage against cost while managing potential returns")
@@ -0,0 +1,218 @@
+"""Straight-bet hedging strategies: multiple horses, lay, each-way, in-running, parlay and accumulator.
+
+Each strategy has a calculation function that takes the bet details (the
+defaults are the worked example) and returns an OutcomeTable, plus a
+hedge_* demo that prints the example the way the original script did.
+"""
+import numpy as np
+
+from hedging.cache import cached
+from hedging.engine import OutcomeTable, evaluate, returns_matrix
+from hedging.ladder import Ladder
+from hedging.parlay import solve_schedule
+from hedging.profiling import profiled
+from hedging.render import display_results, format_currency
+
+GBP_TO_USD = 1.25  # Approximate conversion used for the UK each-way example
+
+
+@profiled("strategy.multiple")
+@cached("multiple")
+def multiple_horses(bets=None):
+    """Win bets on several horses in one race
+
+    `bets` is a list of (horse, stake, odds); the first is the original bet.
+    """
+    if bets is None:
+        bets = [(3, 100, 4), (7, 50, 8)]
+    stakes = np.array([stake for _, stake, _ in bets], dtype=float)
+    odds = [price for _, _, price in bets]
+
+    # Outcomes: each backed horse wins, then none of them wins
+    returns = returns_matrix([[i] for i in range(len(bets))], odds, len(bets) + 1)
+    hedge = np.arange(len(bets)) > 0
+
+    names = [f"Horse #{horse} wins ({price}-1 odds)" for horse, _, price in bets]
+    names.append("Neither horse wins" if len(bets) == 2 else "None of the horses wins")
+    return evaluate(names, stakes, returns, hedge)
+
+
+@profiled("strategy.lay")
+@cached("lay")
+def lay_hedge(original_bet=100, original_odds=5, lay_liability=200, lay_odds=2):
+    """Back bet hedged by laying the same horse on an exchange"""
+    lay_stake = lay_liability / lay_odds  # Actual amount staked on the exchange
+
+    # Outcomes: horse wins, horse loses
+    # The lay gives back less than nothing when the horse wins (the liability)
+    stakes = np.array([original_bet, lay_stake])
+    returns = np.array([
+        [original_odds, 0],
+        [(lay_stake - lay_liability) / lay_stake, (lay_stake + lay_liability) / lay_stake]
+    ])
+    hedge = np.array([False, True])
+    return evaluate(["Horse wins", "Horse loses"], stakes, returns, hedge)
+
+
+def _demo_ladder():
+    """Lay side of the exchange for the lay example: thin at the 3.0 (2-1) headline price"""
+    ladder = Ladder()
+    for price, volume in ((3.0, 80), (3.05, 60), (3.1, 120), (3.2, 300)):
+        ladder.update("lay", price, volume)
+    return ladder
+
+
+@profiled("strategy.lay_ladder")
+@cached("lay_ladder")
+def lay_ladder_hedge(original_bet=100, original_odds=5, ladder=None):
+    """Back bet greened up against real exchange depth
+
+    Returns (OutcomeTable, green-up dict with the levels taken and VWAP).
+    """
+    ladder = ladder or _demo_ladder()
+    hedge = ladder.green_up(original_bet, original_odds)
+    profit = [hedge["profit_if_wins"], hedge["profit_if_loses"]]
+    return OutcomeTable(["Horse wins", "Horse loses"], original_bet, hedge["lay_stake"], profit), hedge
+
+
+@profiled("strategy.each_way")
+@cached("each_way")
+def each_way(odds=10, stake=10, place_fraction=1/4, currency_rate=GBP_TO_USD):
+    """Each-way bet: equal win and place stakes, place paying a fraction of the odds"""
+    stakes = np.array([stake, stake]) * currency_rate
+
+    # Outcomes: horse wins, horse places (2nd or 3rd), horse doesn't place
+    # Both halves return the stake as well as the winnings
+    win_return = odds + 1
+    place_return = odds * place_fraction + 1
+    returns = returns_matrix([[0], [0, 1]], [win_return, place_return], 3)
+
+    names = ["Horse wins (1st place)", "Horse places (2nd or 3rd)", "Horse doesn't place"]
+    return evaluate(names, stakes, returns)  # Total each-way stake, no hedge bet
+
+
+@profiled("strategy.in_running")
+@cached("in_running")
+def in_running(original_bet=100, original_odds=1, hedge_bet=30, new_leader_odds=1):
+    """Pre-race bet hedged on the new leader during the race"""
+    stakes = np.array([original_bet, hedge_bet])
+    returns = returns_matrix([[0], [1]], [original_odds, new_leader_odds], 2)
+    hedge = np.array([False, True])
+
+    names = ["Original horse recovers and wins", "New leader wins"]
+    return evaluate(names, stakes, returns, hedge)
+
+
+@profiled("strategy.parlay")
+@cached("parlay")
+def parlay_hedge(parlay_bet=10, parlay_payout=1000, hedge_amount=200, hedge_return=300):
+    """Parlay hedged against its final leg"""
+    stakes = np.array([parlay_bet, hedge_amount])
+    prices = [parlay_payout / parlay_bet, hedge_return / hedge_amount]
+    returns = returns_matrix([[0], [1]], prices, 2)
+    hedge = np.array([False, True])
+
+    names = ["Parlay horse wins final leg", "Parlay horse loses, hedge wins"]
+    return evaluate(names, stakes, returns, hedge)
+
+
+@profiled("strategy.accumulator")
+@cached("accumulator")
+def accumulator_hedge(stake=10, odds=(2.0, 2.5, 4.0, 5.0), probabilities=(0.55, 0.45, 0.28, 0.22),
+                      against=None, bankroll=1000):
+    """Accumulator with the Kelly-best hedge before every leg
+
+    `probabilities` is your own view of each leg; `against` the return per
+    $1 bet against each leg (default: 5% under the fair price). Returns
+    (OutcomeTable, HedgeSchedule).
+    """
+    odds = np.asarray(odds, dtype=float)
+    if against is None:
+        against = 0.95 * odds / (odds - 1)
+    schedule = solve_schedule(stake * odds.prod(), [odds], [against], [probabilities], bankroll, stake)
+
+    # Outcomes: losing on each leg, then every leg winning
+    names = [f"Leg {leg + 1} loses ({price:g}-1 odds)" for leg, price in enumerate(odds)]
+    names.append("Every leg wins")
+    profit = np.append(schedule.lose_profit[0], schedule.win_profit[0])
+    return OutcomeTable(names, stake, schedule.total_stake[0], profit), schedule
+
+
+# Example 1: Hedging Across Multiple Horses
+@profiled("demo.multiple")
+def hedge_multiple_horses():
+    print("\n1. HEDGING ACROSS MULTIPLE HORSES")
+    print("Strategy: Betting on multiple horses in the same race")
+    display_results("Multiple Horses Hedge Results", multiple_horses())
+
+
+# Example 2: Lay Betting
+@profiled("demo.lay")
+def hedge_lay_betting():
+    print("\n2. LAY BETTING")
+    print("Strategy: Betting against your original selection on a betting exchange")
+    display_results("Lay Betting Hedge Results", lay_hedge())
+
+
+@profiled("demo.lay_ladder")
+def hedge_lay_ladder():
+    print("\nLAY BETTING AGAINST EXCHANGE DEPTH")
+    print("Strategy: Greening up by laying into the available volume, price level by price level")
+    scenarios, hedge = lay_ladder_hedge()
+    for price, stake in hedge["levels"]:
+        print(f"Lay ${stake:.2f} at {price:g}")
+    print(f"Average lay price {hedge['vwap']:.3f}, liability ${hedge['liability']:.2f}")
+    display_results("Lay Betting Ladder Results", scenarios)
+
+
+# Example 3: Each-Way Betting
+@profiled("demo.each_way")
+def hedge_each_way():
+    print("\n3. EACH-WAY BETTING")
+    print("Strategy: Placing one bet to win and another for the horse to place")
+    display_results("Each-Way Betting Results", each_way())
+
+
+# Example 4: In-Running/Live Betting
+@profiled("demo.in_running")
+def hedge_in_running():
+    print("\n4. IN-RUNNING/LIVE BETTING")
+    print("Strategy: Placing additional bets during the race")
+    display_results("In-Running Betting Hedge Results", in_running())
+
+
+# Example 5: Hedging Across Multiple Bets (Parlay/Accumulator)
+@profiled("demo.parlay")
+def hedge_parlay():
+    print("\n5. HEDGING ACROSS MULTIPLE BETS (PARLAY/ACCUMULATOR)")
+    print("Strategy: Hedging the final leg of a multi-race bet")
+    display_results("Parlay/Accumulator Hedge Results", parlay_hedge())
+
+
+@profiled("demo.accumulator")
+def hedge_accumulator():
+    print("\nHEDGING A MULTI-LEG ACCUMULATOR")
+    print("Strategy: Choosing to hedge now, hedge later or let it ride before every leg")
+    scenarios, schedule = accumulator_hedge()
+    for leg, stake in enumerate(schedule.stakes[0]):
+        print(f"Before leg {leg + 1}: hedge ${stake:.2f} against the selection")
+    print(f"Decision now: {schedule.actions[0]}")
+    print(f"Certainty equivalent: {format_currency(schedule.certainty_equivalent[0])}")
+    display_results("Accumulator Hedge Results", scenarios)
+
+
+def main():
+    """Run all the examples"""
+    print("\nHORSE RACING HEDGING STRATEGIES SIMULATOR")
+    print("==========================================")
+
+    hedge_multiple_horses()
+    hedge_lay_betting()
+    hedge_each_way()
+    hedge_in_running()
+    hedge_parlay()
+
+    print("\nSummary:")
+    print("Hedging is a risk management strategy that can protect against losses or secure profits")
+    print("The optimal hedging strategy depends on your risk tolerance and specific betting situation")
+    print("While hedging reduces potential maximum returns, it increases your chances of a positive outcome")
@@ -0,0 +1,184 @@
+"""Exchange price ladder: volume at each price on both sides of one runner.
+
+Prices are exchange (decimal) prices on the standard tick grid, 1.01 to
+1000. A lay of stake L at price P costs L * (P - 1) if the horse wins - the
+same as LayPosition at odds P - 1. Two sides are kept:
+
+- back: money waiting to be backed into (you back at these prices, best is
+  the highest)
+- lay: money waiting to be laid into (you lay at these prices, best is the
+  lowest)
+
+Every level of the grid has a slot in a flat list, and each side also keeps
+the sorted tick indices of its populated levels. A price update is a bisect
+on the tick table plus a store, and a bisect into the populated levels when
+one fills or empties (the insert or delete itself shifts that short list).
+The best price is an end of that list, and the next level out from any
+price is one more bisect, so fills walk outward from the best price
+touching only the levels they take volume from.
+
+Pure Python, so it shares the streaming mode's fast start.
+"""
+from bisect import bisect_left, bisect_right, insort
+
+# (start, step) bands of the exchange tick grid, each running to the next start
+_BANDS = ((1.01, 0.01), (2, 0.02), (3, 0.05), (4, 0.1), (6, 0.2), (10, 0.5), (20, 1), (30, 2), (50, 5),
+          (100, 10), (1000, None))
+
+
+def _tick_table():
+    ticks = []
+    for (start, step), (end, _) in zip(_BANDS, _BANDS[1:]):
+        count = round((end - start) / step)
+        ticks.extend(round(start + i * step, 2) for i in range(count))
+    ticks.append(1000.0)
+    return tuple(ticks)
+
+
+TICKS = _tick_table()
+SIDES = ("back", "lay")
+
+
+def tick_index(price):
+    """Slot of `price` on the tick grid; ValueError if it is not a valid tick"""
+    index = bisect_left(TICKS, round(price, 2))
+    if index == len(TICKS) or TICKS[index] != round(price, 2):
+        raise ValueError(f"{price} is not an exchange price")
+    return index
+
+
+class Fill:
+    """Result of taking volume off one side of the ladder"""
+
+    __slots__ = ("matched", "unmatched", "cost", "vwap", "levels")
+
+    def __init__(self, matched, unmatched, cost, vwap, levels):
+        self.matched = matched      # Stake matched
+        self.unmatched = unmatched  # Stake the ladder could not take
+        self.cost = cost            # Lay liability, or stake for a back fill
+        self.vwap = vwap            # Volume-weighted average price (None if nothing matched)
+        self.levels = levels        # [(price, stake)] taken from each level
+
+    def as_dict(self):
+        return {"matched": self.matched, "unmatched": self.unmatched, "cost": self.cost, "vwap": self.vwap,
+                "levels": self.levels}
+
+
+class Ladder:
+    """Available volume at every price on the back and lay sides"""
+
+    __slots__ = ("volume", "populated")
+
+    def __init__(self):
+        self.volume = {"back": [0.0] * len(TICKS), "lay": [0.0] * len(TICKS)}
+        self.populated = {"back": [], "lay": []}  # Sorted tick indices of the levels with volume
+
+    def update(self, side, price, volume):
+        """Set the volume at one price (0 removes the level)"""
+        if side not in SIDES:
+            raise ValueError(f"Unknown ladder side {side!r}, expected one of {SIDES}")
+        levels = self.volume[side]
+        index = tick_index(price)
+        was = levels[index] > 0
+        levels[index] = volume
+
+        populated = self.populated[side]
+        if volume > 0 and not was:
+            insort(populated, index)
+        elif volume <= 0 and was:
+            del populated[bisect_left(populated, index)]
+
+    def _best(self, side):
+        populated = self.populated[side]
+        if not populated:
+            return None
+        return populated[-1] if side == "back" else populated[0]
+
+    def _next_level(self, side, start):
+        """The next populated level out from `start`, away from the best price"""
+        populated = self.populated[side]
+        if side == "back":
+            position = bisect_left(populated, start) - 1
+            return populated[position] if position >= 0 else None
+        position = bisect_right(populated, start)
+        return populated[position] if position < len(populated) else None
+
+    def best_price(self, side):
+        best = self._best(side)
+        return None if best is None else TICKS[best]
+
+    def depth(self, side, levels=5):
+        """[(price, volume)] for the best `levels` prices on one side"""
+        out = []
+        index = self._best(side)
+        while index is not None and len(out) < levels:
+            out.append((TICKS[index], self.volume[side][index]))
+            index = self._next_level(side, index)
+        return out
+
+    def _walk(self, side, take):
+        """Take volume level by level from the best price; `take(price, available)` says how much"""
+        levels = []
+        index = self._best(side)
+        while index is not None:
+            stake = take(TICKS[index], self.volume[side][index])
+            if stake <= 0:
+                break
+            levels.append((TICKS[index], stake))
+            index = self._next_level(side, index)
+        return levels
+
+    def _fill_stake(self, side, stake):
+        remaining = [stake]
+
+        def take(price, available):
+            taken = min(remaining[0], available)
+            remaining[0] -= taken
+            return taken
+
+        return _fill(self._walk(side, take), stake, lay=side == "lay")
+
+    def fill_lay(self, stake):
+        """Liability and average price of laying `stake` into the available depth"""
+        return self._fill_stake("lay", stake)
+
+    def fill_back(self, stake):
+        """Average price of backing `stake` into the available depth"""
+        return self._fill_stake("back", stake)
+
+    def green_up(self, back_stake, back_odds):
+        """Lay stake that evens out a back bet against real depth
+
+        The back bet returns back_stake * back_odds if the horse wins (the
+        same convention as LayPosition). Laying L at price P costs L * (P - 1)
+        if it wins and collects L if it loses, so the profits are equal once
+        the lays' sum of L * P reaches back_stake * back_odds. Walks the lay
+        side until that sum is reached or the depth runs out.
+        """
+        target = [back_stake * back_odds]
+
+        def take(price, available):
+            if target[0] <= 1e-9:
+                return 0
+            taken = min(available, target[0] / price)
+            target[0] -= taken * price
+            return taken
+
+        levels = self._walk("lay", take)
+        fill = _fill(levels, 0, lay=True)
+        return {
+            "lay_stake": fill.matched,
+            "liability": fill.cost,
+            "vwap": fill.vwap,
+            "shortfall": max(target[0], 0),  # Return still unhedged when the depth runs out
+            "profit_if_wins": back_stake * back_odds - back_stake - fill.cost,
+            "profit_if_loses": fill.matched - back_stake,
+            "levels": fill.levels,
+        }
+
+
+def _fill(levels, stake, lay):
+    matched = sum(taken for _, taken in levels)
+    weighted = sum(price * taken for price, taken in levels)
+    cost = sum((price - 1) * taken for price, taken in levels) if lay else matched
+    return Fill(matched, max(stake - matched, 0), cost, weighted / matched if matched else None, levels)
@@ -0,0 +1,166 @@
+"""Finish-order enumeration and ticket coverage for exotic bets.
+
+Every possible finish of the top `depth` places in a field of `field_size`
+horses gets a dense index. Orders are kept as a small integer array and a
+mixed-radix lookup table maps any finish straight to its index, so finding
+which tickets cash on a result is O(1) and memory stays bounded even for a
+14-horse superfecta (24,024 orders).
+"""
+from itertools import permutations
+from math import perm
+
+import numpy as np
+
+from hedging.engine import OutcomeTable
+from hedging.profiling import profiled
+
+
+@profiled("orders.enumerate")
+def finish_orders(field_size, depth):
+    """All finish orders of `depth` places, horses numbered from 1"""
+    count = perm(field_size, depth)
+    flat = np.fromiter(
+        (horse for order in permutations(range(1, field_size + 1), depth) for horse in order),
+        dtype=np.int8,
+        count=count * depth
+    )
+    return flat.reshape(count, depth)
+
+
+def order_label(order):
+    """Render a finish order as 3-5-7"""
+    return "-".join(str(horse) for horse in order)
+
+
+@profiled("orders.enumerate")
+def part_wheel(*positions):
+    """Every order taking one horse from each position's list, no repeats"""
+    grids = np.meshgrid(*[np.asarray(horses, dtype=np.int8) for horses in positions], indexing="ij")
+    orders = np.stack([grid.ravel() for grid in grids], axis=1)
+
+    # Drop combinations that use the same horse twice (e.g. 2-5-5)
+    ordered = np.sort(orders, axis=1)
+    distinct = np.all(ordered[:, 1:] != ordered[:, :-1], axis=1)
+    return orders[distinct]
+
+
+def straight(horses):
+    """A single finish order in exact sequence"""
+    return np.asarray([horses], dtype=np.int8)
+
+
+def box(horses, depth):
+    """Every permutation of `depth` horses from the boxed set"""
+    return part_wheel(*[horses] * depth)
+
+
+def wheel(key_horse, others, depth):
+    """Key horse on top with every permutation of the others underneath"""
+    return part_wheel([key_horse], *[others] * (depth - 1))
+
+
+class CoverageIndex:
+    """Maps every finish order to the tickets that cash on it
+
+    Tickets are arrays of orders (from straight, box, wheel or part_wheel).
+    The order -> ticket mapping is stored CSR-style: `ticket_ids` sorted by
+    order index with `indptr` marking where each order's tickets start.
+    """
+
+    @profiled("orders.index")
+    def __init__(self, field_size, depth, tickets):
+        self.field_size = field_size
+        self.depth = depth
+        self.orders = finish_orders(field_size, depth)
+        self.combos = np.array([len(ticket) for ticket in tickets], dtype=np.int64)
+
+        # Mixed-radix code of each order -> its row in self.orders
+        self._radix = field_size ** np.arange(depth - 1, -1, -1, dtype=np.int64)
+        self._lookup = np.full(field_size ** depth, -1, dtype=np.int32)
+        self._lookup[self.codes(self.orders)] = np.arange(len(self.orders), dtype=np.int32)
+
+        if tickets:
+            covered = np.concatenate([self.index_of(ticket) for ticket in tickets])
+        else:
+            covered = np.empty(0, dtype=np.int32)
+        owners = np.repeat(np.arange(len(tickets), dtype=np.int32), self.combos)
+
+        sort = np.argsort(covered, kind="stable")
+        self.entry_order = covered[sort]
+        self.ticket_ids = owners[sort]
+        self.indptr = np.searchsorted(self.entry_order, np.arange(len(self.orders) + 1))
+
+    def __len__(self):
+        return len(self.orders)
+
+    def codes(self, orders):
+        """Mixed-radix code of each finish order (its slot in the lookup table)"""
+        return (np.asarray(orders, dtype=np.int64) - 1) @ self._radix
+
+    def index_of(self, orders):
+        """Row index of each finish order (-1 for orders outside the field)"""
+        orders = np.atleast_2d(orders)
+        valid = np.all((orders >= 1) & (orders <= self.field_size), axis=1)
+        index = np.full(len(orders), -1, dtype=np.int32)
+        index[valid] = self._lookup[self.codes(orders[valid])]
+        return index
+
+    def tickets_for(self, order):
+        """Ids of the tickets that cash if the race finishes in `order`"""
+        row = self.index_of(order)[0]
+        if row < 0:
+            return self.ticket_ids[:0]
+        return self.ticket_ids[self.indptr[row]:self.indptr[row + 1]]
+
+    def covered(self):
+        """Indices of orders at least one ticket cashes on"""
+        return np.flatnonzero(np.diff(self.indptr))
+
+    def cost(self, stakes):
+        """Total cost of each ticket: stake per combination x combinations"""
+        return np.asarray(stakes, dtype=float) * self.combos
+
+    @profiled("payout")
+    def profits(self, stakes, prices=None, order_prices=None):
+        """Net profit on every finish order
+
+        `stakes` is the base bet per combination for each ticket and may be
+        batched as (sets, tickets). Winning combinations return `prices` per
+        $1 for each ticket, or `order_prices` per $1 for each finish order
+        when combinations pay differently.
+        """
+        stakes = np.asarray(stakes, dtype=float)
+        if order_prices is not None:
+            entry_prices = np.asarray(order_prices, dtype=float)[self.entry_order]
+        else:
+            entry_prices = np.broadcast_to(np.asarray(prices, dtype=float), self.combos.shape)[self.ticket_ids]
+
+        # Segment sums over the CSR entries via a running total
+        values = stakes[..., self.ticket_ids] * entry_prices
+        running = np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+        returns = running[..., self.indptr[1:]] - running[..., self.indptr[:-1]]
+        return returns - self.cost(stakes).sum(axis=-1, keepdims=True)
+
+    def outcome_table(self, stakes, prices=None, hedge=None, name=None, order_prices=None):
+        """OutcomeTable with a row per covered order and one for the rest"""
+        stakes = np.asarray(stakes, dtype=float)
+        cost = self.cost(stakes)
+        hedge = np.zeros(len(stakes), dtype=bool) if hedge is None else np.asarray(hedge, dtype=bool)
+        name = name or (lambda order: f"Horses finish {order_label(order)}")
+
+        profits = self.profits(stakes, prices, order_prices)
+        rows = self.covered()
+        profit = profits[rows]
+        orders = self.orders
+
+        uncovered = len(orders) - len(rows)
+        if uncovered:
+            rows = np.append(rows, -1)
+            profit = np.append(profit, -cost.sum())
+
+        def label(row):
+            if row < 0:
+                return f"No covered combination hits ({uncovered} other finishes)"
+            return name(orders[row].tolist())
+
+        return OutcomeTable(label, cost[~hedge].sum(), cost[hedge].sum(), profit, outcomes=rows)
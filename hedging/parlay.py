@@ -0,0 +1,137 @@
+"""Accumulator (parlay) hedge schedules by dynamic programming.
+
+An open accumulator pays `claim` if every remaining leg wins. Before each
+leg you can bet against that leg's selection (a stake h returns h * against
+if the selection loses) - hedge now - or wait for the next boundary - hedge
+later - or never hedge at all - let it ride. Since a lost leg ends the
+accumulator, the only state that carries forward is the winning path, and
+with log utility (the Kelly criterion) the value of cash c holding a claim
+Q is log(c) + g(Q / c). So the whole schedule is one backward pass over a
+grid of claim-to-cash ratios x, one leg at a time:
+
+    g_N(x) = log(1 + x)
+    g_k(x) = max_u  p_k * (log(1 - u) + g_k+1(x / (1 - u)))
+                  + (1 - p_k) * log(1 - u + u * against_k)
+
+where u is the share of cash staked against leg k. Each leg is a
+(parlays, ratios, hedge fractions) array, so hundreds of accumulators solve
+together, and the forward pass along the winning path turns the policy into
+stakes.
+"""
+import numpy as np
+
+from hedging.profiling import profiled
+
+ACTIONS = ("hedge now", "hedge later", "ride")
+
+
+def _grid_index(grid, values):
+    """Lower grid index and interpolation weight for values on a log-spaced grid"""
+    position = (np.log(values) - np.log(grid[0])) / (np.log(grid[1]) - np.log(grid[0]))
+    position = np.clip(position, 0, len(grid) - 1)
+    lower = np.minimum(position.astype(np.intp), len(grid) - 2)
+    return lower, position - lower
+
+
+class HedgeSchedule:
+    """Best hedge at every leg boundary for a batch of accumulators
+
+    Arrays are (parlays, legs) or (parlays,); legs past the end of a shorter
+    accumulator carry zero stakes.
+    """
+
+    def __init__(self, stakes, claim, against, bankroll, cost, growth):
+        self.stakes = stakes
+        self.claim = claim
+        self.bankroll = bankroll
+        self.cost = cost
+        self.growth = growth  # Expected log of final wealth over the bankroll
+
+        # Cash along the winning path, then the outcome of losing at each leg
+        spent = np.cumsum(stakes, axis=1)
+        self.total_stake = spent[:, -1]
+        self.lose_profit = np.where(np.isfinite(against), stakes * against - spent, np.nan) - cost[:, None]
+        self.win_profit = claim - self.total_stake - cost
+
+    @property
+    def hedge_now(self):
+        return self.stakes[:, 0]
+
+    @property
+    def actions(self):
+        """'hedge now', 'hedge later' or 'ride' for each accumulator"""
+        now = self.stakes[:, 0] > 0
+        later = self.stakes[:, 1:].sum(axis=1) > 0
+        return np.where(now, ACTIONS[0], np.where(later, ACTIONS[1], ACTIONS[2]))
+
+    @property
+    def guaranteed(self):
+        """Worst profit over every leg the accumulator could lose on, or winning through"""
+        return np.minimum(self.win_profit, np.nanmin(self.lose_profit, axis=1, initial=np.inf))
+
+    @property
+    def certainty_equivalent(self):
+        """Sure profit worth as much as the schedule to a Kelly bettor"""
+        return self.bankroll * np.expm1(self.growth) - self.cost
+
+
+@profiled("parlay.solve")
+def solve_schedule(claim, odds, against=None, probabilities=None, bankroll=1000, cost=0,
+                   ratios=160, fractions=48, max_fraction=0.95):
+    """Kelly-optimal hedge schedule for many accumulators at once
+
+    `odds` is (parlays, legs) with the remaining legs' odds, NaN-padded for
+    shorter accumulators; `claim` is what each pays if they all win.
+    `against` is the return per $1 bet against each leg (default: the fair
+    complement of `odds`) and `probabilities` the chance each leg wins
+    (default: implied by `odds`). `bankroll` is the free cash, per
+    accumulator or shared, and `cost` what the accumulators already cost,
+    which only shifts the reported profits. Returns a HedgeSchedule.
+    """
+    odds = np.atleast_2d(np.asarray(odds, dtype=float))
+    leg = np.isfinite(odds) & (odds > 1)
+    n_parlays, n_legs = odds.shape
+    claim = np.broadcast_to(np.asarray(claim, dtype=float), (n_parlays,))
+    bankroll = np.broadcast_to(np.asarray(bankroll, dtype=float), (n_parlays,))
+    cost = np.broadcast_to(np.asarray(cost, dtype=float), (n_parlays,))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if probabilities is None:
+            probabilities = 1 / odds
+        if against is None:
+            against = odds / (odds - 1)
+    # Padded legs always "win" and cannot be hedged
+    probabilities = np.where(leg, np.asarray(probabilities, dtype=float), 1)
+    against = np.where(leg, np.asarray(against, dtype=float), 1)
+
+    grid = np.geomspace(1e-4, 1e4, ratios)
+    share = np.linspace(0, max_fraction, fractions)
+    keep = np.log1p(-share)
+    lower, weight = _grid_index(grid, grid[:, None] / (1 - share))  # (ratios, fractions)
+
+    # Backward pass: value and best hedge share at each leg and ratio
+    value = np.broadcast_to(np.log1p(grid), (n_parlays, ratios))
+    policy = np.empty((n_legs, n_parlays, ratios))
+    for k in range(n_legs - 1, -1, -1):
+        p = probabilities[:, k, None, None]
+        ahead = value[:, lower] * (1 - weight) + value[:, lower + 1] * weight
+        lose = np.log(1 - share + share * against[:, k, None, None])
+        total = p * (keep + ahead) + (1 - p) * lose
+        best = total.argmax(axis=2)
+        policy[k] = share[best]
+        value = np.take_along_axis(total, best[..., None], axis=2)[..., 0]
+
+    rows = np.arange(n_parlays)
+    low, w = _grid_index(grid, claim / bankroll)
+    growth = value[rows, low] * (1 - w) + value[rows, low + 1] * w
+
+    # Forward pass along the winning path
+    cash = bankroll.copy()
+    stakes = np.zeros((n_parlays, n_legs))
+    for k in range(n_legs):
+        low, w = _grid_index(grid, claim / cash)
+        u = policy[k, rows, low] * (1 - w) + policy[k, rows, low + 1] * w
+        stakes[:, k] = np.where(leg[:, k], u * cash, 0)
+        cash = cash - stakes[:, k]
+
+    return HedgeSchedule(stakes, claim, np.where(leg, against, np.nan), bankroll, cost, growth)
@@ -0,0 +1,132 @@
+"""Pick 3/4/5/6 tickets tracked leg by leg.
+
+A multi-race ticket is a list of selections per leg and covers every
+combination of one selection from each leg, so its cost is the product of
+the leg sizes times the base bet. The combinations are never enumerated:
+each ticket is stored as one horse bitmask per leg (bit n set for horse n,
+as in hedging.records), and everything needed later follows from those:
+
+- a ticket is still alive once legs 1..k have run if each winner is in its
+  leg's mask, so recording a result is one AND per ticket;
+- the live combinations through horse h in the next leg number the product
+  of the remaining leg sizes (a 5x5x5x5x5x5 ticket is 15,625 combinations
+  but only six masks).
+
+A PickCard holds any number of tickets on the same sequence as (tickets,
+legs) arrays, so a whole syndicate of tickets updates in one step.
+"""
+import numpy as np
+
+from hedging.profiling import profiled
+from hedging.solver import solve_alive_hedge
+
+
+def leg_mask(horses):
+    """Bitmask with bit n set for every horse n in the leg"""
+    return sum(1 << horse for horse in set(horses))
+
+
+class PickCard:
+    """Pick N tickets on one sequence of races, updated as each leg results
+
+    `tickets` is a list of tickets, each a list of per-leg horse selections;
+    `base_bet` is the stake per combination (one value or one per ticket).
+    """
+
+    def __init__(self, tickets, base_bet=1):
+        legs = {len(ticket) for ticket in tickets}
+        if len(legs) != 1:
+            raise ValueError(f"Every ticket needs the same number of legs, got {sorted(legs)}")
+
+        self.masks = np.array([[leg_mask(leg) for leg in ticket] for ticket in tickets], dtype=np.uint64)
+        self.sizes = np.array([[len(set(leg)) for leg in ticket] for ticket in tickets], dtype=np.int64)
+        self.base_bet = np.broadcast_to(np.asarray(base_bet, dtype=float), (len(tickets),))
+        self.alive = np.ones(len(tickets), dtype=bool)
+        self.winners = []
+
+    @property
+    def n_legs(self):
+        return self.masks.shape[1]
+
+    @property
+    def leg(self):
+        """Index of the next leg to run"""
+        return len(self.winners)
+
+    @property
+    def n_tickets(self):
+        return self.masks.shape[0]
+
+    @property
+    def combinations(self):
+        """Combinations covered by each ticket"""
+        return self.sizes.prod(axis=1)
+
+    @property
+    def cost(self):
+        """Cost of each ticket"""
+        return self.combinations * self.base_bet
+
+    def record(self, winner):
+        """Settle the next leg; returns how many tickets are still alive"""
+        if self.leg == self.n_legs:
+            raise ValueError("Every leg has already been recorded")
+        self.alive &= ((self.masks[:, self.leg] >> np.uint64(winner)) & np.uint64(1)).astype(bool)
+        self.winners.append(winner)
+        return int(self.alive.sum())
+
+    def alive_combinations(self):
+        """Live combinations per ticket, 0 once it is dead"""
+        return np.where(self.alive, self.sizes[:, self.leg:].prod(axis=1), 0)
+
+    def _selected(self, field_size):
+        """(tickets, field_size) bool: horses each ticket has in the next leg"""
+        horses = np.arange(field_size, dtype=np.uint64)
+        return ((self.masks[:, self.leg, None] >> horses) & np.uint64(1)).astype(bool)
+
+    def coverage(self, field_size):
+        """Live base-bet units riding on each horse in the next leg
+
+        Entry h is what the card holds if horse h wins the next leg, counted
+        in $1-base combinations: at the final leg that times the will-pay is
+        the payout.
+        """
+        later = self.sizes[:, self.leg + 1:].prod(axis=1)
+        weight = np.where(self.alive, self.base_bet * later, 0)
+        return weight @ self._selected(field_size)
+
+    def expected_payouts(self, will_pay, probabilities):
+        """Expected return if each horse wins the next leg
+
+        `probabilities` is (legs, field_size) win probabilities; only the
+        legs after the next one are used. `will_pay` is the estimated payout
+        per $1 base for the whole sequence. At the final leg this is exact.
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        field_size = probabilities.shape[1]
+        horses = np.arange(field_size, dtype=np.uint64)
+
+        # Chance each ticket's selections win every leg after the next one
+        later = self.masks[:, self.leg + 1:, None]
+        hits = ((later >> horses) & np.uint64(1)).astype(bool)
+        chance = (hits * probabilities[self.leg + 1:]).sum(axis=-1).prod(axis=1)
+
+        weight = np.where(self.alive, self.base_bet * chance, 0)
+        return will_pay * (weight @ self._selected(field_size))
+
+    @profiled("pickn.hedge")
+    def hedge(self, will_pay, odds, probabilities=None, bankroll=np.inf):
+        """Maximin win-bet hedge on the next leg (an AliveHedge)
+
+        `odds` is indexed by horse number (NaN where there is no runner).
+        Before the final leg the payouts are expectations, so `probabilities`
+        is required and the guaranteed figure is in expected terms.
+        """
+        odds = np.asarray(odds, dtype=float)
+        if self.leg == self.n_legs - 1:
+            payouts = will_pay * self.coverage(len(odds))
+        elif probabilities is None:
+            raise ValueError("Hedging before the final leg needs win probabilities for the later legs")
+        else:
+            payouts = self.expected_payouts(will_pay, probabilities)
+        return solve_alive_hedge(payouts, odds, self.cost.sum(), bankroll)
@@ -0,0 +1,152 @@
+"""Pari-mutuel will-pays for exacta, trifecta and superfecta combinations.
+
+A pool pays its total less takeout to the money on the winning combination,
+so the will-pay per $1 on a combination is total * (1 - takeout) / money on
+it. Where a combination has no money yet (or the per-combination money is
+not published at all) the price comes from Harville probabilities instead:
+the chance of a finish a-b-c is p_a * p_b / (1 - p_a) * p_c / (1 - p_a - p_b),
+priced at (1 - takeout) / chance. The win probabilities come from the win
+pool when given, otherwise from the money on each horse finishing first.
+
+A PoolSnapshot is immutable and hashes by its contents, so prices for every
+finish order are computed once per snapshot and kept in a bounded LRU cache.
+"""
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+from hedging.orders import CoverageIndex
+from hedging.profiling import profiled
+
+POOL_CACHE_SIZE = 32
+POOL_DEPTH = {"exacta": 2, "trifecta": 3, "superfecta": 4}
+
+
+def _frozen(values):
+    values = np.array(values, dtype=float)
+    values.setflags(write=False)
+    return values
+
+
+@lru_cache(maxsize=16)
+def _order_index(field_size, depth):
+    """Finish-order lookup shared by every snapshot of one pool shape"""
+    return CoverageIndex(field_size, depth, [])
+
+
+class PoolSnapshot:
+    """One exotic pool at one moment
+
+    `combo_money` is the money on each finish order, either aligned with
+    finish_orders(field_size, depth) or a mapping of order -> money (orders
+    as tuples or "3-5-7"). `win_pool` is the money (or probability) on each
+    horse 1..field_size in the win pool. Prices are per $1, floored to
+    `breakage` when it is set and never below `min_price`.
+    """
+
+    __slots__ = ("field_size", "depth", "total", "takeout", "combo_money", "win_pool", "breakage", "min_price",
+                 "key")
+
+    def __init__(self, field_size, depth, total, takeout=0.2, combo_money=None, win_pool=None, breakage=0.0,
+                 min_price=1.0):
+        if combo_money is None and win_pool is None:
+            raise ValueError("A pool snapshot needs combination money or a win pool")
+        if isinstance(depth, str):
+            depth = POOL_DEPTH[depth]
+        self.field_size = field_size
+        self.depth = depth
+        self.total = float(total)
+        self.takeout = float(takeout)
+        self.breakage = float(breakage)
+        self.min_price = float(min_price)
+
+        if isinstance(combo_money, dict):
+            index = _order_index(field_size, depth)
+            money = np.zeros(len(index))
+            orders = [tuple(map(int, order.split("-"))) if isinstance(order, str) else tuple(order)
+                      for order in combo_money]
+            rows = np.array([index.index_of(np.array(order))[0] if len(order) == depth else -1 for order in orders])
+            if (rows < 0).any():
+                bad = orders[int(np.argmax(rows < 0))]
+                raise ValueError(f"Finish order {'-'.join(map(str, bad))} is not in a {field_size}-runner "
+                                 f"{depth}-place pool")
+            money[rows] = list(combo_money.values())
+            combo_money = money
+        self.combo_money = None if combo_money is None else _frozen(combo_money)
+        self.win_pool = None if win_pool is None else _frozen(win_pool)
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((field_size, depth, self.total, self.takeout, self.breakage, self.min_price)).encode())
+        for values in (self.combo_money, self.win_pool):
+            digest.update(b"-" if values is None else values.tobytes())
+        self.key = digest.hexdigest()
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, PoolSnapshot) and self.key == other.key
+
+    def __repr__(self):
+        return f"PoolSnapshot({self.field_size} runners, depth {self.depth}, ${self.total:,.0f}, {self.key[:8]})"
+
+    def win_probabilities(self):
+        """Win probability of each horse 1..field_size"""
+        if self.win_pool is not None:
+            weights = self.win_pool
+        else:
+            firsts = _order_index(self.field_size, self.depth).orders[:, 0] - 1
+            weights = np.bincount(firsts, weights=self.combo_money, minlength=self.field_size)
+        total = weights.sum()
+        if total <= 0:
+            return np.full(self.field_size, 1 / self.field_size)
+        return weights / total
+
+
+def harville_probabilities(win_probabilities, orders):
+    """Chance of each finish order (rows of horse numbers from 1) under Harville"""
+    p = np.asarray(win_probabilities, dtype=float)[np.asarray(orders, dtype=np.intp) - 1]
+    taken = np.cumsum(p, axis=1) - p
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.prod(np.where(taken < 1, p / (1 - taken), 0), axis=1)
+
+
+@lru_cache(maxsize=POOL_CACHE_SIZE)
+@profiled("pools.price")
+def order_prices(snapshot):
+    """Will-pay per $1 for every finish order of the snapshot's pool
+
+    Aligned with finish_orders(field_size, depth); read-only and cached per
+    snapshot.
+    """
+    orders = _order_index(snapshot.field_size, snapshot.depth).orders
+    keep = 1 - snapshot.takeout
+
+    with np.errstate(divide="ignore"):
+        prices = keep / harville_probabilities(snapshot.win_probabilities(), orders)
+        if snapshot.combo_money is not None:
+            money = snapshot.combo_money
+            prices = np.where(money > 0, snapshot.total * keep / np.where(money > 0, money, 1), prices)
+
+    # A lone $1 on an unbacked combination would take the whole net pool
+    if snapshot.total > 0:
+        prices = np.minimum(prices, snapshot.total * keep)
+    if snapshot.breakage:
+        prices = np.floor(prices / snapshot.breakage + 1e-9) * snapshot.breakage
+    prices = np.maximum(prices, snapshot.min_price)
+    prices.setflags(write=False)
+    return prices
+
+
+def will_pay(snapshot, orders):
+    """Will-pay per $1 for the given finish orders (rows of horse numbers)"""
+    rows = _order_index(snapshot.field_size, snapshot.depth).index_of(orders)
+    if (rows < 0).any():
+        raise ValueError(f"Finish orders outside the {snapshot.field_size}-runner field")
+    return order_prices(snapshot)[rows]
+
+
+def cache_info():
+    """Hit/miss counts of the per-snapshot price cache"""
+    return order_prices.cache_info()
@@ -0,0 +1,228 @@
+"""Fractional-Kelly stakes across several races at once.
+
+Each race lists its runners' win probabilities (your estimate) and the odds
+on offer (return per $1, as in the outcome engine). A stake is a fraction
+f of the bankroll, and a race's expected log growth is
+
+    sum_i p_i * log(1 - F + f_i * o_i) + q * log(1 - F)
+
+where F is the race's total stake and q the chance that a runner you did
+not price wins. Concurrent races are treated as independent, so the growth
+of the card is the sum over races. That is exact for one race and the
+usual approximation for several; the fraction and exposure caps keep it
+well away from the region where it matters.
+
+Fractional Kelly stakes `fraction` times the full-Kelly solution, so the
+caps (a share of the bankroll per runner, per race and in total) bound
+the full-Kelly fractions at cap / fraction. The solve is projected gradient
+ascent on padded (races, runners) arrays, each step scaled by the growth's
+curvature in that runner (long shots curve far more sharply than
+favourites) and backtracked until it gains. The projection onto the caps
+is exact: a sort and a cumulative sum per race, and one more across the
+card when the total cap binds. PortfolioSolver keeps the last solution, so
+a re-solve after an odds update starts next to the answer.
+"""
+import numpy as np
+
+from hedging.profiling import profiled
+from hedging.render import format_currency
+
+MAX_ITERATIONS = 200
+TOLERANCE = 1e-7  # Largest change in any bankroll fraction that still counts as moving
+
+
+def _threshold(y, weight, upper, cap):
+    """Per row, the t with sum(clip(y - t * weight, 0, upper)) == cap (-inf if the uppers fit under cap)"""
+    full = upper.sum(axis=1)
+    live = weight * (upper > 0)
+    points = np.concatenate([(y - upper) / weight, y / weight], axis=1)
+    slopes = np.concatenate([-live, live], axis=1)
+    order = np.argsort(points, axis=1, kind="stable")
+    points = np.take_along_axis(points, order, axis=1)
+    slope = np.cumsum(np.take_along_axis(slopes, order, axis=1), axis=1)
+
+    # The sum is piecewise linear in t: `full` left of every breakpoint, then falling by `slope`
+    steps = np.cumsum(slope[:, :-1] * np.diff(points), axis=1)
+    totals = full[:, None] + np.concatenate([np.zeros((len(y), 1)), steps], axis=1)
+    k = np.clip(np.argmax(totals <= cap[:, None] + 1e-15, axis=1), 1, points.shape[1] - 1)
+    rows = np.arange(len(y))
+    t0, t1 = points[rows, k - 1], points[rows, k]
+    v0, v1 = totals[rows, k - 1], totals[rows, k]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(v0 != v1, t0 + (v0 - cap) / (v0 - v1) * (t1 - t0), t1)
+    return np.where(full > cap, t, -np.inf)
+
+
+def project(y, upper, race_cap, total_cap, weight=None):
+    """Nearest fractions to `y` within the runner, race and total caps
+
+    Nearest in the metric sum((x - y)**2 / weight). The solution is
+    clip(y - weight * max(lam, tau_r), 0, upper), where tau_r keeps race r
+    under its cap and lam >= 0 keeps the card under the total.
+    """
+    weight = np.ones_like(y) if weight is None else weight
+    tau = np.maximum(_threshold(y, weight, upper, race_cap), 0)
+    f = np.clip(y - weight * tau[:, None], 0, upper)
+    if f.sum() <= total_cap:
+        return f
+    # With the race thresholds folded into the bounds, the total cap is one more threshold
+    bounded = np.minimum(upper, np.maximum(y - weight * tau[:, None], 0)).ravel()[None]
+    lam = max(_threshold(y.ravel()[None], weight.ravel()[None], bounded, np.array([total_cap]))[0], 0)
+    return np.clip(y - weight * np.maximum(lam, tau)[:, None], 0, upper)
+
+
+def growth(f, p, o, q):
+    """Expected log growth of each race and its gradient with respect to f"""
+    stake = f.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wealth = 1 - stake + f * o
+        rest = 1 - stake[:, 0]
+        value = np.where(p > 0, p * np.log(wealth), 0).sum(axis=1) + np.where(q > 0, q * np.log(rest), 0)
+        share = np.where(p > 0, p / wealth, 0)
+        gradient = share * o - (share.sum(axis=1) + np.where(q > 0, q / rest, 0))[:, None]
+    return value, gradient
+
+
+def curvature(f, p, o, q):
+    """Minus the diagonal of the growth's Hessian, used to scale the gradient steps"""
+    stake = f.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wealth = 1 - stake + f * o
+        rest = 1 - stake
+        shared = np.where(p > 0, p / wealth ** 2, 0).sum(axis=1, keepdims=True)
+        shared += np.where(q > 0, q, 0)[:, None] / rest ** 2
+        own = np.where(p > 0, p * ((o - 1) ** 2 - 1) / wealth ** 2, 0)
+    return np.maximum(shared + own, 1e-9)
+
+
+class Portfolio:
+    """Stakes for every runner on the card"""
+
+    def __init__(self, horses, fractions, bankroll, fraction, p, o, q, iterations):
+        self.horses = horses
+        self.fractions = fractions  # Full-Kelly bankroll fractions, (races, max runners)
+        self.bankroll = bankroll
+        self.fraction = fraction
+        self.iterations = iterations
+        self.stakes = bankroll * fraction * fractions
+        self.growth = growth(fraction * fractions, p, o, q)[0]  # Expected log growth per race at these stakes
+
+    @property
+    def exposure(self):
+        return self.stakes.sum(axis=1)
+
+    @property
+    def total_stake(self):
+        return float(self.stakes.sum())
+
+    def as_dicts(self):
+        """[{horse: stake}] per race, leaving out runners with no stake"""
+        return [{horse: round(float(stake), 2) for horse, stake in zip(race, row) if stake >= 0.005}
+                for race, row in zip(self.horses, self.stakes)]
+
+
+def _arrays(probabilities, odds):
+    """Padded (races, runners) arrays from per-race {horse: value} dicts"""
+    horses = [tuple(race) for race in odds]
+    width = max(len(race) for race in horses)
+    p = np.zeros((len(horses), width))
+    o = np.ones((len(horses), width))
+    for r, race in enumerate(horses):
+        o[r, :len(race)] = [odds[r][horse] for horse in race]
+        p[r, :len(race)] = [probabilities[r].get(horse, 0.0) for horse in race]
+    q = np.clip(1 - p.sum(axis=1), 0, None)
+    if (p.sum(axis=1) > 1 + 1e-9).any():
+        raise ValueError("Win probabilities in a race add up to more than 1")
+    return horses, p, o, q
+
+
+class PortfolioSolver:
+    """Fractional-Kelly solver that warm-starts from its previous answer"""
+
+    def __init__(self, bankroll=1000, fraction=0.5, runner_cap=0.05, race_cap=0.1, total_cap=0.25):
+        if not 0 < fraction <= 1:
+            raise ValueError(f"Kelly fraction must be in (0, 1], got {fraction}")
+        self.bankroll = bankroll
+        self.fraction = fraction
+        self.runner_cap = runner_cap / fraction
+        self.race_cap = race_cap / fraction
+        self.total_cap = total_cap / fraction
+        self._layout = None
+        self._fractions = None
+
+    @profiled("portfolio.solve")
+    def solve(self, probabilities, odds):
+        """Stakes for a card: per-race {horse: probability} and {horse: odds} dicts"""
+        horses, p, o, q = _arrays(probabilities, odds)
+        upper = np.where(p > 0, self.runner_cap, 0.0)
+        race_cap = np.full(len(p), self.race_cap)
+
+        # Warm start: last card's answer, pulled back inside the caps for the new odds
+        if horses == self._layout:
+            f = project(self._fractions, upper, race_cap, self.total_cap)
+        else:
+            f = np.zeros_like(p)
+        value, gradient = growth(f, p, o, q)
+
+        for iteration in range(1, MAX_ITERATIONS + 1):
+            # Newton step on each fraction alone, projected in the matching metric
+            weight = 1 / curvature(f, p, o, q)
+            step, moved = 1.0, None
+            while True:
+                candidate = project(f + step * weight * gradient, upper, race_cap, self.total_cap, weight)
+                if moved is None:
+                    moved = np.abs(candidate - f).max()
+                new_value, new_gradient = growth(candidate, p, o, q)
+                gain = new_value.sum() - value.sum()
+                # Armijo condition; a non-finite growth means a race could go bust
+                if np.isfinite(gain) and gain >= 1e-4 * (gradient * (candidate - f)).sum() or step < 1e-10:
+                    break
+                step /= 2
+            f, value, gradient = candidate, new_value, new_gradient
+            if moved < TOLERANCE:  # A full step barely moves: f is stationary
+                break
+
+        self._layout, self._fractions = horses, f
+        return Portfolio(horses, f, self.bankroll, self.fraction, p, o, q, iteration)
+
+
+def kelly_portfolio(probabilities, odds, bankroll=1000, fraction=0.5, runner_cap=0.05, race_cap=0.1,
+                    total_cap=0.25):
+    """One-off solve; keep a PortfolioSolver to re-solve as odds move"""
+    return PortfolioSolver(bankroll, fraction, runner_cap, race_cap, total_cap).solve(probabilities, odds)
+
+
+def _demo_card():
+    """Three races going off close together, with our probabilities and the board odds"""
+    probabilities = [
+        {1: 0.30, 4: 0.22, 6: 0.15, 8: 0.10},
+        {2: 0.45, 3: 0.20, 7: 0.12},
+        {1: 0.18, 5: 0.16, 9: 0.14, 11: 0.09},
+    ]
+    odds = [
+        {1: 4.0, 4: 4.2, 6: 8.0, 8: 9.0},
+        {2: 2.1, 3: 6.5, 7: 7.0},
+        {1: 7.0, 5: 5.5, 9: 9.5, 11: 10.0},
+    ]
+    return probabilities, odds
+
+
+def main():
+    probabilities, odds = _demo_card()
+    solver = PortfolioSolver(bankroll=1000, fraction=0.5)
+    portfolio = solver.solve(probabilities, odds)
+
+    print("\nHALF-KELLY PORTFOLIO ACROSS CONCURRENT RACES")
+    print("Caps: 5% of the bankroll per runner, 10% per race, 25% in total")
+    for race, (stakes, exposure, gain) in enumerate(zip(portfolio.as_dicts(), portfolio.exposure, portfolio.growth)):
+        bets = ", ".join(f"#{horse} ${stake:.2f}" for horse, stake in stakes.items()) or "no bet"
+        print(f"Race {race + 1}: {bets} (exposure ${exposure:.2f}, growth {gain * 100:.3f}%)")
+    print(f"Total stake {format_currency(portfolio.total_stake)} after {portfolio.iterations} iterations")
+
+    odds[0][4] = 4.6  # The market drifts on one runner; the re-solve starts from the last answer
+    portfolio = solver.solve(probabilities, odds)
+    print(f"After #4 drifts to 4.6 in race 1: {portfolio.as_dicts()[0]} ({portfolio.iterations} iterations)")
+
+
+if __name__ == "__main__":
+    main()
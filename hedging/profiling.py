@@ -0,0 +1,231 @@
+"""Opt-in instrumentation for the hedge calculators and the renderer.
+
+Hot functions are wrapped with @profiled("stage"). While profiling is off,
+the wrapper costs one global read and a branch before calling straight
+through; nothing is timed or allocated. Turn it on with enable() (or the
+profile() context manager, or `python -m hedging --profile ...`) and every
+stage records:
+
+- calls, total and self time (self excludes nested stages), slowest call
+- net allocated blocks still alive at exit (sys.getallocatedblocks)
+- net traced bytes, when enabled with memory=True (tracemalloc, slower)
+
+Stages nest: a demo includes its strategy, which includes enumeration and
+payout maths. ProfileStats.as_dict() and .write() export the numbers.
+
+This module stays numpy-free so the quick CLI paths can import it.
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+_active = None  # The ProfileStats being collected, or None when profiling is off
+_started_tracing = False
+
+STAT_FIELDS = ("calls", "total_ms", "self_ms", "max_ms", "blocks", "bytes")
+
+
+class StageStats:
+    """Running totals for one stage"""
+
+    __slots__ = ("calls", "total_ns", "self_ns", "max_ns", "blocks", "bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.max_ns = 0
+        self.blocks = 0
+        self.bytes = 0
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "self_ms": self.self_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "blocks": self.blocks,
+            "bytes": self.bytes,
+        }
+
+
+class ProfileStats:
+    """Per-stage timings, call counts and allocation counts"""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stages = {}
+        self._stack = []  # [stage, start_ns, child_ns, blocks, bytes] per open stage
+
+    def enter(self, stage):
+        traced = _traced_bytes() if self.memory else 0
+        self._stack.append([stage, time.perf_counter_ns(), 0, sys.getallocatedblocks(), traced])
+
+    def exit(self):
+        end = time.perf_counter_ns()
+        stage, start, child_ns, blocks, traced = self._stack.pop()
+        elapsed = end - start
+
+        record = self.stages.get(stage)
+        if record is None:
+            record = self.stages[stage] = StageStats()
+        record.calls += 1
+        record.total_ns += elapsed
+        record.self_ns += elapsed - child_ns
+        record.max_ns = max(record.max_ns, elapsed)
+        record.blocks += sys.getallocatedblocks() - blocks
+        if self.memory:
+            record.bytes += _traced_bytes() - traced
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def call(self, stage, function, args, kwargs):
+        self.enter(stage)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.exit()
+
+    def iterate(self, stage, items):
+        """Yield from `items`, charging the time spent producing each one to `stage`"""
+        items = iter(items)
+        while True:
+            self.enter(stage)
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                self.exit()
+            yield item
+
+    def as_dict(self):
+        """{stage: {calls, total_ms, self_ms, max_ms, blocks, bytes}}"""
+        return {stage: record.as_dict() for stage, record in self.stages.items()}
+
+    def write(self, path):
+        """Export as JSON, or CSV when the path ends in .csv"""
+        stats = self.as_dict()
+        with open(path, "w", newline="") as output:
+            if path.endswith(".csv"):
+                import csv
+
+                writer = csv.writer(output)
+                writer.writerow(("stage",) + STAT_FIELDS)
+                for stage, values in stats.items():
+                    writer.writerow([stage] + [values[field] for field in STAT_FIELDS])
+            else:
+                json.dump(stats, output, indent=2)
+
+    def report(self, stream=None):
+        """Print stages slowest first"""
+        stream = stream or sys.stderr
+        stream.write(f"{'stage':<28} {'calls':>7} {'total ms':>10} {'self ms':>10} {'max ms':>9} {'blocks':>8}"
+                     + (f" {'bytes':>10}" if self.memory else "") + "\n")
+        for stage, record in sorted(self.stages.items(), key=lambda item: -item[1].total_ns):
+            stream.write(f"{stage:<28} {record.calls:>7} {record.total_ns / 1e6:>10.3f} {record.self_ns / 1e6:>10.3f}"
+                         f" {record.max_ns / 1e6:>9.3f} {record.blocks:>8}"
+                         + (f" {record.bytes:>10}" if self.memory else "") + "\n")
+
+
+def _traced_bytes():
+    import tracemalloc
+
+    return tracemalloc.get_traced_memory()[0]
+
+
+def profiled(stage):
+    """Decorator charging calls of the function to `stage` while profiling is on"""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            stats = _active
+            if stats is None:
+                return function(*args, **kwargs)
+            return stats.call(stage, function, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def iterate(stage, items):
+    """`items` unchanged while profiling is off, otherwise timed per item"""
+    stats = _active
+    if stats is None:
+        return items
+    return stats.iterate(stage, items)
+
+
+class _Stage:
+    __slots__ = ("stats", "name")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.stats.enter(self.name)
+
+    def __exit__(self, *exc):
+        self.stats.exit()
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name):
+    """Context manager timing a block as `name`; a shared no-op while profiling is off"""
+    stats = _active
+    if stats is None:
+        return _NO_STAGE
+    return _Stage(stats, name)
+
+
+def enable(memory=False):
+    """Start collecting into a fresh ProfileStats and return it"""
+    global _active, _started_tracing
+    if memory:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+    _active = ProfileStats(memory)
+    return _active
+
+
+def disable():
+    """Stop collecting; returns the stats that were being collected"""
+    global _active, _started_tracing
+    stats, _active = _active, None
+    if _started_tracing:
+        import tracemalloc
+
+        tracemalloc.stop()
+        _started_tracing = False
+    return stats
+
+
+def active():
+    return _active
+
+
+@contextmanager
+def profile(memory=False):
+    """with profile() as stats: ... collects stats for the block"""
+    stats = enable(memory)
+    try:
+        yield stats
+    finally:
+        disable()
@@ -0,0 +1,128 @@
+"""Compact ticket and scenario records.
+
+Single objects use __slots__ classes; bulk sets use NumPy structured arrays
+(see SCENARIO_DTYPE in hedging.engine and ticket_dtype() below). Scenario
+names are only rendered when something reads them, so a full outcome space
+costs a few bytes per row until it is displayed.
+
+This module stays numpy-free at import time so the quick CLI paths can use
+the classes; the array helpers import numpy when called.
+"""
+
+BET_TYPES = ("win", "place", "exacta", "trifecta", "superfecta", "dutch", "each_way", "lay")
+MAX_POSITIONS = 4
+MAX_HORSE = 31  # Highest horse number a uint32 position bitmask can hold
+
+
+class Ticket:
+    """One bet: type, horses per position, stake per combination and odds"""
+
+    __slots__ = ("bet_type", "positions", "stake", "odds", "race")
+
+    def __init__(self, bet_type, positions, stake, odds, race=0):
+        self.bet_type = bet_type
+        self.positions = tuple(tuple(group) for group in positions)
+        self.stake = stake
+        self.odds = odds
+        self.race = race
+
+    def __repr__(self):
+        horses = "/".join(",".join(str(horse) for horse in group) for group in self.positions)
+        return f"Ticket({self.bet_type} {horses} ${self.stake:.2f} @ {self.odds})"
+
+
+class Scenario:
+    """One outcome row; the name is rendered on first access
+
+    Also answers scenario["name"] and scenario.get("profit", 0) so it can
+    stand in for the scenario dicts the display code has always taken.
+    """
+
+    __slots__ = ("_name", "_label", "_key", "original_bet", "hedge_bet", "profit")
+
+    def __init__(self, name, original_bet, hedge_bet, profit, label=None, key=None):
+        self._name = name
+        self._label = label
+        self._key = key
+        self.original_bet = original_bet
+        self.hedge_bet = hedge_bet
+        self.profit = profit
+
+    @property
+    def name(self):
+        if self._name is None:
+            self._name = self._label(self._key)
+        return self._name
+
+    @property
+    def roi(self):
+        total_investment = self.original_bet + self.hedge_bet
+        return (self.profit / total_investment) * 100 if total_investment > 0 else 0
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self):
+        return f"Scenario({self.name!r}, profit={self.profit:.2f})"
+
+
+class LazyNames:
+    """Read-only sequence of scenario names rendered from outcome keys on demand"""
+
+    __slots__ = ("label", "keys")
+
+    def __init__(self, label, keys):
+        self.label = label
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.label(key) for key in self.keys[index]]
+        return self.label(self.keys[index])
+
+    def __iter__(self):
+        label = self.label
+        for key in self.keys:
+            yield label(key)
+
+
+def ticket_dtype():
+    """Structured dtype for bulk tickets: 34 bytes per ticket
+
+    Each position holds a bitmask of the horses allowed there (bit n set for
+    horse n, so horses up to MAX_HORSE), which is enough to count
+    combinations and settle results.
+    """
+    import numpy as np
+
+    return np.dtype([
+        ("race", np.int32),
+        ("bet_type", np.int8),
+        ("depth", np.int8),
+        ("positions", np.uint32, (MAX_POSITIONS,)),
+        ("stake", np.float32),
+        ("odds", np.float64),
+    ])
+
+
+def ticket_array(tickets):
+    """Pack Ticket objects into one structured array"""
+    import numpy as np
+
+    records = np.zeros(len(tickets), dtype=ticket_dtype())
+    for row, ticket in enumerate(tickets):
+        if any(not 0 <= horse <= MAX_HORSE for group in ticket.positions for horse in group):
+            raise ValueError(f"{ticket!r}: horse numbers must be 0-{MAX_HORSE} to pack into a ticket array")
+        masks = [sum(1 << horse for horse in group) for group in ticket.positions]
+        records[row] = (ticket.race, BET_TYPES.index(ticket.bet_type), len(masks),
+                        masks + [0] * (MAX_POSITIONS - len(masks)), ticket.stake, ticket.odds)
+    return records
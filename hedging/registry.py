@@ -0,0 +1,71 @@
+"""Strategy registry.
+
+Strategies are listed by dotted path and only imported when first used, so
+looking one up (or listing them) costs nothing until it actually runs.
+Each entry names the calculation function, the printed demo and a one-line
+description.
+"""
+from importlib import import_module
+
+STRATEGIES = {
+    "exacta": ("hedging.exotics:exacta_hedge", "hedging.exotics:hedge_exacta",
+               "Straight exacta hedged with an exacta box"),
+    "exacta_pool": ("hedging.exotics:exacta_pool_hedge", "hedging.exotics:hedge_exacta_pool",
+                    "Exacta box hedge priced from the pari-mutuel pool"),
+    "trifecta": ("hedging.exotics:trifecta_hedge", "hedging.exotics:hedge_trifecta",
+                 "Straight trifecta hedged with a part-wheel"),
+    "pick_six": ("hedging.exotics:pick_six_hedge", "hedging.exotics:hedge_pick_six",
+                 "Pick 6 final-leg hedge on the other runners"),
+    "pick_n": ("hedging.exotics:pick_n_hedge", "hedging.exotics:hedge_pick_n",
+               "Pick 3/4/5/6 ticket hedged before every leg"),
+    "superfecta": ("hedging.exotics:superfecta_hedge", "hedging.exotics:hedge_superfecta",
+                   "Straight superfecta hedged with a partial box"),
+    "consolidate": ("hedging.consolidate:consolidate_hedge", "hedging.consolidate:hedge_consolidation",
+                    "Overlapping exotic tickets merged into the cheapest covering set"),
+    "dutch": ("hedging.exotics:dutch", "hedging.exotics:dutch_betting",
+              "Dutch stakes for an equal return on every selection"),
+    "multiple": ("hedging.hedges:multiple_horses", "hedging.hedges:hedge_multiple_horses",
+                 "Win bets on several horses in one race"),
+    "lay": ("hedging.hedges:lay_hedge", "hedging.hedges:hedge_lay_betting",
+            "Back bet hedged with an exchange lay"),
+    "lay_ladder": ("hedging.hedges:lay_ladder_hedge", "hedging.hedges:hedge_lay_ladder",
+                   "Back bet greened up against exchange depth"),
+    "each_way": ("hedging.hedges:each_way", "hedging.hedges:hedge_each_way",
+                 "Each-way win and place bet"),
+    "in_running": ("hedging.hedges:in_running", "hedging.hedges:hedge_in_running",
+                   "Pre-race bet hedged in running"),
+    "parlay": ("hedging.hedges:parlay_hedge", "hedging.hedges:hedge_parlay",
+               "Parlay hedged against its final leg"),
+    "accumulator": ("hedging.hedges:accumulator_hedge", "hedging.hedges:hedge_accumulator",
+                    "N-leg accumulator hedged before every leg"),
+}
+
+
+def _load(path):
+    module, name = path.split(":")
+    return getattr(import_module(module), name)
+
+
+def strategy_names():
+    return list(STRATEGIES)
+
+
+def describe(name):
+    return _entry(name)[2]
+
+
+def get_strategy(name):
+    """The calculation function for a strategy"""
+    return _load(_entry(name)[0])
+
+
+def get_demo(name):
+    """The printed worked example for a strategy"""
+    return _load(_entry(name)[1])
+
+
+def _entry(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r}, expected one of {', '.join(STRATEGIES)}") from None
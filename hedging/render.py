@@ -0,0 +1,190 @@
+"""Streaming renderer for scenario tables.
+
+Rows are formatted and written one at a time, so a full outcome grid with
+thousands of rows never has to be built in memory before anything shows up
+on screen. Column widths are worked out up front: from array extremes for an
+OutcomeTable, from a cheap first pass for other sequences, and from the
+first page for one-shot iterators.
+
+Formats:
+- grid: the boxed table the calculators have always printed
+- fixed: compact fixed-width columns with no borders
+- csv, jsonl: machine-readable rows with raw numbers
+"""
+import csv
+import json
+import sys
+from itertools import chain, islice
+
+from hedging import profiling
+
+HEADERS = ["Scenario", "Original Bet", "Hedge Bet", "Net Profit", "ROI %"]
+FIELDS = ["name", "original_bet", "hedge_bet", "profit", "roi"]
+FORMATS = ("grid", "fixed", "csv", "jsonl")
+
+
+def format_currency(amount):
+    """Format amount as currency with a + sign for positive values"""
+    if amount > 0:
+        return f"+${amount:.2f}"
+    else:
+        return f"${amount:.2f}"
+
+
+def _is_outcome_table(scenarios):
+    # Only look for OutcomeTable once the engine is loaded, so plain scenario
+    # lists render without importing numpy
+    engine = sys.modules.get("hedging.engine")
+    return engine is not None and isinstance(scenarios, engine.OutcomeTable)
+
+
+def scenario_rows(scenarios):
+    """Yield (name, original_bet, hedge_bet, profit, roi) for every scenario"""
+    if _is_outcome_table(scenarios):
+        original_bet, hedge_bet = scenarios.original_bet, scenarios.hedge_bet
+        for name, profit, roi in zip(scenarios.names, scenarios.profit.tolist(), scenarios.roi.tolist()):
+            yield name, original_bet, hedge_bet, profit, roi
+        return
+
+    for scenario in scenarios:
+        original_bet = scenario.get("original_bet", 0)
+        hedge_bet = scenario.get("hedge_bet", 0)
+        profit = scenario.get("profit", 0)
+        total_investment = original_bet + hedge_bet
+        roi = (profit / total_investment) * 100 if total_investment > 0 else 0
+        yield scenario["name"], original_bet, hedge_bet, profit, roi
+
+
+def format_row(row):
+    """Display strings for one scenario row"""
+    name, original_bet, hedge_bet, profit, roi = row
+    return (name, f"${original_bet:.2f}", f"${hedge_bet:.2f}", format_currency(profit), f"{roi:.1f}%")
+
+
+def column_widths(scenarios):
+    """Column widths for a re-iterable scenario set, without keeping rows"""
+    widths = [len(header) + 2 for header in HEADERS]
+
+    if _is_outcome_table(scenarios):
+        # Longest formatted numbers always sit at the extremes
+        if len(scenarios):
+            widths[0] = max(widths[0], max(len(name) for name in scenarios.names))
+            widths[1] = max(widths[1], len(f"${scenarios.original_bet:.2f}"))
+            widths[2] = max(widths[2], len(f"${scenarios.hedge_bet:.2f}"))
+            for column, values, fmt in ((3, scenarios.profit, format_currency), (4, scenarios.roi, "{:.1f}%".format)):
+                widths[column] = max(widths[column], len(fmt(float(values.min()))), len(fmt(float(values.max()))))
+        return widths
+
+    for row in scenario_rows(scenarios):
+        for column, cell in enumerate(format_row(row)):
+            if len(cell) > widths[column]:
+                widths[column] = len(cell)
+    return widths
+
+
+def _fit(cell, width):
+    if len(cell) <= width:
+        return cell.ljust(width)
+    return cell[:width - 3] + "..."
+
+
+def grid_lines(rows, widths):
+    """Yield the lines of a grid table, one row at a time"""
+    rule = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    template = "| " + " | ".join(f"{{:<{width}}}" for width in widths) + " |\n" + rule
+    yield rule
+    yield template.format(*HEADERS)[:-len(rule) - 1]
+    yield rule.replace("-", "=")
+    for row in rows:
+        cells = format_row(row)
+        if len(cells[0]) > widths[0]:
+            cells = (_fit(cells[0], widths[0]),) + cells[1:]
+        yield template.format(*cells)
+
+
+def fixed_lines(rows, widths):
+    """Yield compact fixed-width lines: header, then one line per row"""
+    widths = [widths[0]] + [width - 2 for width in widths[1:]]
+    template = f"{{:<{widths[0]}}} " + " ".join(f"{{:>{width}}}" for width in widths[1:])
+    yield template.format(*HEADERS)
+    for row in rows:
+        cells = format_row(row)
+        if len(cells[0]) > widths[0]:
+            cells = (_fit(cells[0], widths[0]),) + cells[1:]
+        yield template.format(*cells)
+
+
+@profiling.profiled("render")
+def render(scenarios, fmt="grid", stream=None, page_size=500, widths=None):
+    """Write a scenario table to `stream`, flushing after every page
+
+    Memory use does not depend on the number of rows.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+    stream = stream or sys.stdout
+
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(FIELDS)
+        for page in _pages(profiling.iterate("render.format", scenario_rows(scenarios)), page_size):
+            with profiling.stage("render.write"):
+                writer.writerows((name, original, hedge, round(profit, 2), round(roi, 1))
+                                 for name, original, hedge, profit, roi in page)
+                stream.flush()
+        return
+
+    if fmt == "jsonl":
+        for page in _pages(profiling.iterate("render.format", scenario_rows(scenarios)), page_size):
+            with profiling.stage("render.write"):
+                stream.write("".join(
+                    json.dumps(dict(zip(FIELDS, (name, original, hedge, round(profit, 2), round(roi, 1))))) + "\n"
+                    for name, original, hedge, profit, roi in page
+                ))
+                stream.flush()
+        return
+
+    rows = scenario_rows(scenarios)
+    if widths is None:
+        if hasattr(scenarios, "__len__"):
+            with profiling.stage("render.widths"):
+                widths = column_widths(scenarios)
+        else:
+            # One-shot iterator: size the columns from the first page only
+            first = list(islice(rows, page_size))
+            widths = column_widths([dict(zip(FIELDS, row)) for row in first])
+            rows = chain(first, rows)
+
+    lines = grid_lines(rows, widths) if fmt == "grid" else fixed_lines(rows, widths)
+    for page in _pages(profiling.iterate("render.format", lines), page_size):
+        with profiling.stage("render.write"):
+            stream.write("\n".join(page) + "\n")
+            stream.flush()
+
+
+def _pages(items, size):
+    items = iter(items)
+    while page := list(islice(items, size)):
+        yield page
+
+
+def display_results(title, scenarios, rule_width=80, fmt="grid", stream=None):
+    """Display the results in a nicely formatted table"""
+    stream = stream or sys.stdout
+    # The result cache is only loaded once enabled, and then serves repeat tables as text
+    cache = sys.modules.get("hedging.cache")
+    if cache is not None and cache.active() is not None:
+        text = cache.rendered(title, scenarios, rule_width, fmt,
+                              lambda buffer: _display(title, scenarios, rule_width, fmt, buffer))
+        if text is not None:
+            stream.write(text)
+            return
+    _display(title, scenarios, rule_width, fmt, stream)
+
+
+def _display(title, scenarios, rule_width, fmt, stream):
+    if fmt in ("grid", "fixed"):
+        stream.write(f"\n{title}\n" + "=" * rule_width + "\n")
+    render(scenarios, fmt, stream)
+    if fmt in ("grid", "fixed"):
+        stream.write("\n\n")
@@ -0,0 +1,290 @@
+"""Local hedge-calculation service: JSON lines over a loopback socket.
+
+Each request is one JSON object per line, and each reply carries the
+request's "id":
+
+    {"id": 1, "strategy": "lay", "params": {"lay_odds": 2.5}}
+    {"id": 1, "result": {"outcomes": 2, "original_bet": 100.0, ...}}
+    {"id": 2, "op": "list"}      # registered strategies
+    {"id": 3, "op": "stats"}     # request counts, batch sizes, latency
+
+Results use the race-card summary format (see card.summarize). A client may
+pipeline many requests on one connection; replies come back as they are
+ready, so match them up by id.
+
+Requests from every client go through one queue. The batcher takes
+whatever arrives within BATCH_WINDOW of the first request (up to
+MAX_BATCH) and evaluates it as one unit on a worker thread, so the event
+loop keeps accepting while a batch runs. In a batch, identical requests are
+computed once. Requests for strategies with a closed-form sweep surface
+(each_way, lay, in_running, parlay) are evaluated together, with one
+broadcast call over all their inputs. Once MAX_PENDING requests are waiting,
+new ones get a "busy" reply straight away, which keeps the latency of the
+accepted ones bounded.
+
+The process stays warm: numpy and every strategy module are imported, and
+each strategy has run once, before the socket opens.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from inspect import signature
+
+import numpy as np
+
+from hedging import registry
+from hedging.cache import Uncacheable, content_key
+from hedging.card import _params, summarize
+from hedging.sweep import BETS, SURFACES
+
+DEFAULT_PORT = 8765
+BATCH_WINDOW = 0.002  # Seconds to wait for more requests after the first of a batch
+MAX_BATCH = 512
+MAX_PENDING = 4096
+LATENCY_SAMPLES = 2000
+
+
+@lru_cache(maxsize=None)
+def _names(strategy):
+    """Outcome names of a strategy whose names do not depend on its inputs"""
+    return tuple(registry.get_strategy(strategy)().names)
+
+
+def _vectorized(strategy, requests):
+    """Summaries for many requests of one closed-form strategy from a single broadcast call
+
+    Rows that come out non-finite (a zero price, say) are None: those
+    requests go through _single, so they get the same error reply as they
+    would on their own.
+    """
+    defaults = {name: parameter.default for name, parameter in signature(SURFACES[strategy]).parameters.items()}
+    columns = {name: np.array([params.get(name, default) for params in requests], dtype=float)
+               for name, default in defaults.items()}
+    n = len(requests)
+    with np.errstate(all="ignore"):
+        profit = np.stack([np.broadcast_to(outcome, (n,)) for outcome in SURFACES[strategy](**columns)], axis=1)
+        original, hedge = (np.broadcast_to(value, (n,)) for value in BETS[strategy](**columns))
+    finite = np.isfinite(profit).all(axis=1) & np.isfinite(original) & np.isfinite(hedge)
+    names = _names(strategy)
+
+    return [None if not finite[i] else {
+        "outcomes": len(names),
+        "original_bet": float(original[i]),
+        "hedge_bet": float(hedge[i]),
+        "best_profit": float(profit[i].max()),
+        "worst_profit": float(profit[i].min()),
+        "scenarios": [{"name": name, "profit": round(value, 2)} for name, value in zip(names, profit[i].tolist())],
+    } for i in range(n)]
+
+
+def _single(strategy, params):
+    try:
+        return {"result": summarize(registry.get_strategy(strategy)(**_params(params)))}
+    except (TypeError, ValueError) as error:
+        return {"error": str(error)}
+    except Exception as error:  # A bad request fails alone, not the batch it came in with
+        return {"error": f"{type(error).__name__}: {error}"}
+
+
+def evaluate_requests(requests):
+    """One reply body per (strategy, params) request, in order"""
+    unique, slots, seen = [], [], {}
+    for strategy, params in requests:
+        try:
+            key = content_key(strategy, params)
+        except Uncacheable:
+            key = None
+        if key is not None and key in seen:
+            slots.append(seen[key])
+            continue
+        if key is not None:
+            seen[key] = len(unique)
+        slots.append(len(unique))
+        unique.append((strategy, params))
+
+    replies = [None] * len(unique)
+    by_strategy = {}
+    for slot, (strategy, params) in enumerate(unique):
+        if strategy in BETS and set(params) <= set(signature(SURFACES[strategy]).parameters) \
+                and all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                        for value in params.values()):
+            by_strategy.setdefault(strategy, []).append(slot)
+        else:
+            replies[slot] = _single(strategy, params)
+    for strategy, group in by_strategy.items():
+        try:
+            summaries = _vectorized(strategy, [unique[slot][1] for slot in group])
+        except Exception:  # One odd request must not fail its whole group
+            summaries = [None] * len(group)
+        for slot, summary in zip(group, summaries):
+            replies[slot] = _single(*unique[slot]) if summary is None else {"result": summary}
+    return [replies[slot] for slot in slots]
+
+
+class HedgeService:
+    """Batches requests from every connection onto one worker thread"""
+
+    def __init__(self, window=BATCH_WINDOW, max_batch=MAX_BATCH, max_pending=MAX_PENDING):
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue(max_pending)
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hedge-batch")
+        self.requests = self.batches = self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    async def batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            self.batches += 1
+            try:
+                replies = await loop.run_in_executor(self.worker, evaluate_requests,
+                                                     [(strategy, params) for strategy, params, _, _ in batch])
+            except Exception as error:  # Keep serving; every request in the batch gets the error
+                replies = [{"error": f"{type(error).__name__}: {error}"}] * len(batch)
+            now = time.perf_counter()
+            for (_, _, future, started), reply in zip(batch, replies):
+                self.latencies.append(now - started)
+                if not future.done():
+                    future.set_result(reply)
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1000
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "rejected": self.rejected,
+            "pending": self.queue.qsize(),
+            "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+        }
+
+    async def handle(self, message):
+        """Reply body for one decoded request"""
+        op = message.get("op", "evaluate")
+        if op == "list":
+            return {"result": {name: registry.describe(name) for name in registry.strategy_names()}}
+        if op == "stats":
+            return {"result": self.stats()}
+        if op != "evaluate":
+            return {"error": f"Unknown op {op!r}, expected one of evaluate, list, stats"}
+
+        strategy = message.get("strategy")
+        if strategy not in registry.STRATEGIES:
+            return {"error": f"Unknown strategy {strategy!r}, expected one of {', '.join(registry.STRATEGIES)}"}
+        params = message.get("params") or {}
+        if not isinstance(params, dict):
+            return {"error": "params must be a JSON object"}
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((strategy, params, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return {"error": "busy"}
+        self.requests += 1
+        return await future
+
+    async def connection(self, reader, writer):
+        lock = asyncio.Lock()
+        pending = set()
+
+        async def reply(line):
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError("expected a JSON object")
+            except ValueError as error:
+                body, request_id = {"error": f"Bad request: {error}"}, None
+            else:
+                request_id = message.get("id")
+                body = await self.handle(message)
+            try:
+                line = json.dumps({"id": request_id, **body}, allow_nan=False)
+            except ValueError:  # Never send Infinity or NaN, which are not JSON
+                line = json.dumps({"id": request_id, "error": "Result is not a finite number"})
+            async with lock:
+                writer.write((line + "\n").encode())
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.ensure_future(reply(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def warm_up():
+    """Import and run every strategy once so the first requests are fast"""
+    for name in registry.strategy_names():
+        registry.get_strategy(name)()
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, window=BATCH_WINDOW, ready=None):
+    """Run the service until cancelled"""
+    warm_up()
+    service = HedgeService(window)
+    batcher = asyncio.ensure_future(service.batcher())
+    server = await asyncio.start_server(service.connection, host, port, limit=1 << 20)
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher.cancel()
+        service.worker.shutdown(wait=False)
+
+
+def call(strategy, params=None, host="127.0.0.1", port=DEFAULT_PORT, timeout=5.0):
+    """Blocking one-shot client: the reply for one request"""
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.sendall((json.dumps({"id": 1, "strategy": strategy, "params": params or {}}) + "\n").encode())
+        return json.loads(connection.makefile().readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the hedge strategies as JSON lines on a local port")
+    parser.add_argument("--host", default="127.0.0.1", help="keep the default to stay on loopback")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW * 1000,
+                        help="how long a batch waits for more requests")
+    args = parser.parse_args(argv)
+
+    def ready(server):
+        print(f"Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.window_ms / 1000, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
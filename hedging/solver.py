@@ -0,0 +1,133 @@
+"""Hedge-stake solver for the final leg of a Pick 6 (or any single-horse position).
+
+You are alive with one horse that pays `payout` if it wins, having already
+spent `cost`. Win bets on the other runners at their live odds (a winning
+stake returns stake * odds) can lock in profit. Stakes that return the same
+amount R whichever other runner wins cost R * h, where h = sum(1 / odds), so
+every objective reduces to choosing R; that is closed-form and runs on whole
+batches of situations at once.
+
+Objectives:
+- "maximin": maximize the guaranteed minimum profit. Any uncovered runner
+  would leave the floor at -(cost + hedge), so every runner is covered and
+  R = min(payout, bankroll / h).
+- "breakeven": the smallest hedge that gets the whole outlay back whichever
+  other runner wins, keeping as much of the payout as possible:
+  R = cost / (1 - h). Past the payout that would lose more when the live
+  horse wins than it saves elsewhere, so R is capped there; a capped hedge
+  means no breakeven exists, and it is the maximin hedge with a negative
+  guaranteed profit.
+"""
+import numpy as np
+
+from hedging.profiling import profiled
+
+OBJECTIVES = ("maximin", "breakeven")
+
+
+class HedgeSolution:
+    """Stakes and resulting profits for a batch of final-leg hedges"""
+
+    def __init__(self, stakes, odds, payout, cost):
+        runner = np.isfinite(odds) & (odds > 0)
+        self.stakes = stakes
+        self.total_stake = stakes.sum(axis=-1)
+        self.alive_profit = payout - cost - self.total_stake
+        self.runner_profit = np.where(
+            runner,
+            np.where(runner, stakes * odds, 0) - (cost + self.total_stake)[..., None],
+            np.nan
+        )
+        self.guaranteed = np.minimum(self.alive_profit, np.nanmin(self.runner_profit, axis=-1, initial=np.inf))
+
+
+@profiled("solver")
+def solve_final_leg(payout, cost, odds, bankroll=np.inf, objective="maximin"):
+    """Hedge stakes on every other runner of the final leg
+
+    `odds` is (..., runners) and may be padded with NaN for missing runners;
+    `payout`, `cost` and `bankroll` broadcast against its leading axes, so
+    thousands of alive tickets solve in one call.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}, expected one of {OBJECTIVES}")
+
+    odds = np.asarray(odds, dtype=float)
+    runner = np.isfinite(odds) & (odds > 0)
+    inverse = np.divide(1, odds, out=np.zeros_like(odds), where=runner)
+    book = inverse.sum(axis=-1)
+    payout, cost, bankroll = (np.asarray(value, dtype=float) for value in (payout, cost, bankroll))
+
+    # Amount every covered runner returns; hedging is pointless once h >= 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if objective == "maximin":
+            target = np.minimum(payout, bankroll / book)
+        else:
+            target = np.minimum(cost / (1 - book), payout)
+            target = np.minimum(target, bankroll / book)
+        target = np.where((book > 0) & (book < 1), target, 0)
+
+    return HedgeSolution(target[..., None] * inverse, odds, payout, cost)
+
+
+class AliveHedge:
+    """Stakes and per-runner profits when several runners carry a payout"""
+
+    def __init__(self, stakes, odds, payouts, cost):
+        runner = np.isfinite(odds) & (odds > 0)
+        self.stakes = stakes
+        self.total_stake = stakes.sum(axis=-1)
+        self.runner_profit = np.where(
+            runner,
+            payouts + np.where(runner, stakes * odds, 0) - (cost + self.total_stake)[..., None],
+            np.nan
+        )
+        self.guaranteed = np.nanmin(self.runner_profit, axis=-1, initial=np.inf)
+
+
+@profiled("solver")
+def solve_alive_hedge(payouts, odds, cost=0, bankroll=np.inf):
+    """Maximin win-bet hedge when each runner already returns `payouts`
+
+    The multi-horse form of solve_final_leg: `payouts` and `odds` are
+    (..., runners), one entry per runner in the leg (0 where the ticket is
+    dead), NaN-padded where a runner is missing. Raising every runner's
+    gross return to a common level T costs sum((T - P) / odds) over the
+    runners below T, so the floor T - spend is piecewise linear in T and the
+    best T sits on a payout breakpoint, where the bankroll runs out, or at the
+    largest payout.
+    """
+    odds = np.asarray(odds, dtype=float)
+    runner = np.isfinite(odds) & (odds > 0)
+    payouts = np.where(runner, np.broadcast_to(np.asarray(payouts, dtype=float), odds.shape), np.inf)
+    inverse = np.divide(1, odds, out=np.zeros_like(odds), where=runner)
+    cost, bankroll = (np.asarray(value, dtype=float) for value in (cost, bankroll))
+
+    order = np.argsort(payouts, axis=-1)
+    level = np.take_along_axis(payouts, order, axis=-1)
+    weight = np.take_along_axis(inverse, order, axis=-1)
+    book = np.cumsum(weight, axis=-1)
+    owed = np.cumsum(np.where(weight > 0, level, 0) * weight, axis=-1)
+
+    # Spend needed to lift every cheaper runner up to each breakpoint
+    with np.errstate(invalid="ignore"):
+        spend = level * (book - weight) - (owed - level * weight)
+    spend = np.where(np.isfinite(level), spend, np.inf)
+
+    # The floor stops rising once the covered book reaches 1
+    full = book >= 1
+    best = np.where(full.any(axis=-1), np.take_along_axis(level, full.argmax(axis=-1)[..., None], -1)[..., 0],
+                    np.inf)
+
+    # Where the bankroll runs out: last breakpoint it can still reach
+    last = np.maximum((spend <= bankroll[..., None]).sum(axis=-1) - 1, 0)[..., None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        limit = (bankroll + np.take_along_axis(owed, last, -1)[..., 0]) / np.take_along_axis(book, last, -1)[..., 0]
+    target = np.minimum(best, np.where(np.isnan(limit), np.inf, limit))
+
+    # Past the biggest payout it is a fresh bet, not a hedge
+    top = np.max(np.where(runner, payouts, -np.inf), axis=-1, initial=0)
+    target = np.minimum(target, top)
+
+    stakes = np.maximum(target[..., None] - payouts, 0) * inverse
+    return AliveHedge(stakes, odds, np.where(runner, payouts, 0), cost)
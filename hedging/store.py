@@ -0,0 +1,309 @@
+"""Memory-mapped columnar store for historical races.
+
+A store is a directory of flat binary columns plus a small meta.json:
+
+- one row per race: track (code into meta["tracks"]), date (days since
+  1970-01-01), race number, field size, offset of its first runner and the
+  exacta/trifecta/superfecta will-pays per $1 (NaN where there was no pool)
+- one row per runner, grouped by race: horse number, finishing position
+  (0 if unplaced or not recorded) and final odds (return per $1)
+- indexes: races sorted by track, by date and by field size, each with the
+  offsets (or sorted keys) needed to find a range by binary search
+
+That is 24 bytes per race (40 with its index entries) and 6 per runner, so
+ten years of a busy circuit (about a million races) fit in under 100 MB.
+Columns are opened with np.memmap, so reads are zero-copy views and only the pages actually touched
+are loaded. Appending writes the new rows to the end of each column and
+rebuilds the indexes; races keep their row numbers, which is what lets the
+backtester resume from where it stopped.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import date as Date
+
+import numpy as np
+
+STORE_VERSION = 1
+RACE_COLUMNS = {
+    "track": np.uint16,
+    "date": np.int32,
+    "race": np.uint8,
+    "field_size": np.uint8,
+    "first_runner": np.uint32,
+    "exacta": np.float32,
+    "trifecta": np.float32,
+    "superfecta": np.float32,
+}
+RUNNER_COLUMNS = {
+    "horse": np.uint8,
+    "finish": np.uint8,
+    "odds": np.float32,
+}
+EXOTICS = ("exacta", "trifecta", "superfecta")
+
+
+def day_number(value):
+    """Days since 1970-01-01 for a date, 'YYYY-MM-DD' string or day number"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+
+def day_date(number):
+    return Date.fromordinal(Date(1970, 1, 1).toordinal() + int(number))
+
+
+def _read_column(path, dtype, count):
+    if count == 0 or not os.path.exists(path):
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class RaceStore:
+    """Read-only view of a store directory"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as source:
+            self.meta = json.load(source)
+        if self.meta["version"] != STORE_VERSION:
+            raise ValueError(f"Store version {self.meta['version']} is not supported (expected {STORE_VERSION})")
+        self.tracks = self.meta["tracks"]
+
+        n_races, n_runners = self.meta["races"], self.meta["runners"]
+        self.races = {name: _read_column(self._file(name), dtype, n_races) for name, dtype in RACE_COLUMNS.items()}
+        self.runners = {name: _read_column(self._file(name), dtype, n_runners)
+                        for name, dtype in RUNNER_COLUMNS.items()}
+
+        n_tracks, n_fields = len(self.tracks), 256
+        self._by_track = _read_column(self._file("index_track"), np.uint32, n_races)
+        self._track_offsets = _read_column(self._file("index_track_offsets"), np.uint32, n_tracks + 1)
+        self._by_date = _read_column(self._file("index_date"), np.uint32, n_races)
+        self._date_keys = _read_column(self._file("index_date_keys"), RACE_COLUMNS["date"], n_races)
+        self._by_field = _read_column(self._file("index_field"), np.uint32, n_races)
+        self._field_offsets = _read_column(self._file("index_field_offsets"), np.uint32, n_fields + 1)
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def __len__(self):
+        return self.meta["races"]
+
+    @property
+    def n_runners(self):
+        return self.meta["runners"]
+
+    def track_code(self, track):
+        try:
+            return self.tracks.index(track)
+        except ValueError:
+            return None
+
+    def select(self, track=None, start=None, end=None, field_size=None):
+        """Sorted row numbers of races matching every given filter
+
+        `start` and `end` are inclusive dates; `field_size` is one size or a
+        (low, high) inclusive range.
+        """
+        selected = None
+
+        if track is not None:
+            code = self.track_code(track)
+            if code is None:
+                return np.empty(0, dtype=np.uint32)
+            selected = self._by_track[self._track_offsets[code]:self._track_offsets[code + 1]]
+
+        if start is not None or end is not None:
+            dates = self._date_keys
+            low = 0 if start is None else np.searchsorted(dates, day_number(start), "left")
+            high = len(dates) if end is None else np.searchsorted(dates, day_number(end), "right")
+            selected = _intersect(selected, self._by_date[low:high])
+
+        if field_size is not None:
+            low, high = field_size if isinstance(field_size, tuple) else (field_size, field_size)
+            rows = self._by_field[self._field_offsets[low]:self._field_offsets[high + 1]]
+            selected = _intersect(selected, rows)
+
+        if selected is None:
+            return np.arange(len(self), dtype=np.uint32)
+        return np.sort(selected)
+
+    def runner_slice(self, race):
+        first = int(self.races["first_runner"][race])
+        return slice(first, first + int(self.races["field_size"][race]))
+
+    def field_matrix(self, races, column, fill=0):
+        """(races, max field) runner values padded with `fill`, one row per race"""
+        races = np.asarray(races, dtype=np.intp)
+        sizes = self.races["field_size"][races].astype(np.intp)
+        width = int(sizes.max()) if len(races) else 0
+        slots = np.arange(width)
+        valid = slots < sizes[:, None]
+        positions = self.races["first_runner"][races].astype(np.intp)[:, None] + slots
+        values = self.runners[column][np.where(valid, positions, 0)]
+        return np.where(valid, values, fill)
+
+    def finish_orders(self, races, depth):
+        """(races, depth) horse numbers finishing 1st..depth-th (0 where unknown)"""
+        horses = self.field_matrix(races, "horse")
+        finish = self.field_matrix(races, "finish")
+        orders = np.zeros((len(horses), depth), dtype=np.int16)
+        for place in range(1, depth + 1):
+            hit = finish == place
+            orders[:, place - 1] = np.where(hit.any(axis=1), horses[np.arange(len(horses)), hit.argmax(axis=1)], 0)
+        return orders
+
+    def nbytes(self):
+        """On-disk size of the columns and indexes"""
+        return sum(os.path.getsize(os.path.join(self.path, name)) for name in os.listdir(self.path))
+
+
+def _intersect(selected, rows):
+    return rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+
+
+class StoreWriter:
+    """Buffers races and appends them to a store directory on flush()
+
+    Creates the store if it does not exist yet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as source:
+                self.meta = json.load(source)
+        else:
+            self.meta = {"version": STORE_VERSION, "races": 0, "runners": 0, "tracks": []}
+
+        # Drop anything written past the last recorded flush (an interrupted append)
+        for columns, count in ((RACE_COLUMNS, self.meta["races"]), (RUNNER_COLUMNS, self.meta["runners"])):
+            for name, dtype in columns.items():
+                column = os.path.join(path, f"{name}.bin")
+                if os.path.exists(column):
+                    os.truncate(column, count * np.dtype(dtype).itemsize)
+        self._races = {name: [] for name in RACE_COLUMNS}
+        self._runners = {name: [] for name in RUNNER_COLUMNS}
+
+    def add(self, track, date, race, horses, finish, odds, payouts=None):
+        """Buffer one race; `finish` holds each horse's position (0 if unplaced)"""
+        if len(horses) != len(finish) or len(horses) != len(odds):
+            raise ValueError("horses, finish and odds need one entry per runner")
+        tracks = self.meta["tracks"]
+        if track not in tracks:
+            tracks.append(track)
+        payouts = payouts or {}
+
+        row = {"track": tracks.index(track), "date": day_number(date), "race": race, "field_size": len(horses),
+               "first_runner": self.meta["runners"] + len(self._runners["horse"])}
+        row.update({name: payouts.get(name, np.nan) for name in EXOTICS})
+        for name, value in row.items():
+            self._races[name].append(value)
+        self._runners["horse"].extend(horses)
+        self._runners["finish"].extend(finish)
+        self._runners["odds"].extend(odds)
+
+    def flush(self):
+        """Append buffered races to the columns and rebuild the indexes"""
+        added = len(self._races["track"])
+        if not added:
+            return 0
+        runners = len(self._runners["horse"])
+        for columns, buffers in ((RACE_COLUMNS, self._races), (RUNNER_COLUMNS, self._runners)):
+            for name, dtype in columns.items():
+                with open(os.path.join(self.path, f"{name}.bin"), "ab") as output:
+                    output.write(np.asarray(buffers[name], dtype=dtype).tobytes())
+                buffers[name].clear()
+
+        self.meta["races"] += added
+        self.meta["runners"] += runners
+        self._write_indexes()
+        with open(os.path.join(self.path, "meta.json"), "w") as output:
+            json.dump(self.meta, output)
+        return added
+
+    def _write_indexes(self):
+        n = self.meta["races"]
+        track = np.fromfile(os.path.join(self.path, "track.bin"), dtype=RACE_COLUMNS["track"], count=n)
+        dates = np.fromfile(os.path.join(self.path, "date.bin"), dtype=RACE_COLUMNS["date"], count=n)
+        field = np.fromfile(os.path.join(self.path, "field_size.bin"), dtype=RACE_COLUMNS["field_size"], count=n)
+
+        by_track = np.lexsort((dates, track)).astype(np.uint32)
+        track_offsets = np.searchsorted(track[by_track], np.arange(len(self.meta["tracks"]) + 1)).astype(np.uint32)
+        by_date = np.argsort(dates, kind="stable").astype(np.uint32)
+        by_field = np.argsort(field, kind="stable").astype(np.uint32)
+        field_offsets = np.searchsorted(field[by_field], np.arange(257)).astype(np.uint32)
+
+        for name, values in (("index_track", by_track), ("index_track_offsets", track_offsets),
+                             ("index_date", by_date), ("index_date_keys", dates[by_date]), ("index_field", by_field),
+                             ("index_field_offsets", field_offsets)):
+            values.tofile(os.path.join(self.path, f"{name}.bin"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def import_csv(source, path, flush_every=10_000):
+    """Append races from a runner-per-row CSV to a store; returns races added
+
+    Columns: track, date, race, horse, finish, odds, and optionally exacta,
+    trifecta and superfecta (the race's will-pays, repeated on each row).
+    Rows of one race must be consecutive.
+    """
+    added = 0
+    with StoreWriter(path) as writer, open(source, newline="") as lines:
+        current, runners = None, []
+        for row in csv.DictReader(lines):
+            key = (row["track"], row["date"], int(row["race"]))
+            if key != current and runners:
+                added += _add_rows(writer, current, runners)
+                if added % flush_every == 0:
+                    writer.flush()
+                runners = []
+            current = key
+            runners.append(row)
+        if runners:
+            added += _add_rows(writer, current, runners)
+    return added
+
+
+def _add_rows(writer, key, rows):
+    track, date, race = key
+    payouts = {name: float(rows[0][name]) for name in EXOTICS if rows[0].get(name)}
+    writer.add(track, date, race, [int(row["horse"]) for row in rows],
+               [int(row["finish"] or 0) for row in rows], [float(row["odds"]) for row in rows], payouts)
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Historical race store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="append races from a runner-per-row CSV")
+    load.add_argument("source")
+    load.add_argument("store")
+    info = commands.add_parser("info", help="summarize a store")
+    info.add_argument("store")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        print(f"Imported {import_csv(args.source, args.store)} races", file=sys.stderr)
+        return
+
+    store = RaceStore(args.store)
+    dates = store.races["date"]
+    print(f"{len(store)} races, {store.n_runners} runners, {len(store.tracks)} tracks, "
+          f"{store.nbytes() / 1024:.0f} KiB on disk")
+    if len(store):
+        print(f"Dates {day_date(dates.min())} to {day_date(dates.max())}")
+
+
+if __name__ == "__main__":
+    main()
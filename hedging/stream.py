@@ -0,0 +1,187 @@
+"""Streaming odds-feed mode for dutch and lay hedges.
+
+Messages are JSON objects, one per line, read from a replay file or a local
+socket standing in for a tote/exchange feed:
+
+    {"type": "dutch", "race": "R1", "horses": [1, 4, 6], "target_profit": 100}
+    {"type": "lay", "race": "R1", "horse": 3, "back_stake": 100, "back_odds": 5}
+    {"type": "odds", "race": "R1", "horse": 4, "odds": 5.5}
+    {"type": "ladder", "race": "R1", "horse": 3, "side": "lay", "price": 3.05, "volume": 250}
+
+Each race keeps its own state and an odds tick only touches the rows for
+that horse: a dutch stake is re-priced and the total re-summed over its
+handful of selections, and a lay position re-solves only its own green-up.
+Updates are small plain-Python work, which keeps publish latency well under
+a millisecond. Ladder messages
+update one price level of a runner's exchange Ladder and re-solve any lay
+position on that horse against the real depth.
+"""
+import json
+import time
+from collections import deque
+
+from hedging.ladder import Ladder
+
+
+class DutchPosition:
+    """Dutch stakes that return `target_profit` whichever selection wins
+
+    Until every selection has odds, profit_if_covered is None: the unpriced
+    selections have no stake yet, so no covered profit is guaranteed.
+    """
+
+    def __init__(self, horses, target_profit):
+        self.target_profit = target_profit
+        self.stakes = dict.fromkeys(horses)  # None until the horse is priced
+        self.total_stake = 0.0
+
+    def update(self, horse, odds):
+        stake = self.target_profit / odds
+        self.stakes[horse] = stake
+        # Summed afresh on every tick: a running total would drift over a long feed
+        self.total_stake = sum(stake for stake in self.stakes.values() if stake is not None)
+        complete = None not in self.stakes.values()
+        return {
+            "stake": stake,
+            "total_stake": self.total_stake,
+            "profit_if_covered": self.target_profit - self.total_stake if complete else None,
+            "profit_if_uncovered": -self.total_stake
+        }
+
+
+class LayPosition:
+    """A back bet greened up with a lay at the current odds
+
+    A lay stake L at odds X costs L * X if the horse wins and collects L if
+    it loses; L = back_stake * back_odds / (1 + X) makes both outcomes pay
+    the same.
+    """
+
+    def __init__(self, back_stake, back_odds):
+        self.back_stake = back_stake
+        self.back_odds = back_odds
+
+    def update(self, odds):
+        lay_stake = self.back_stake * self.back_odds / (1 + odds)
+        return {
+            "lay_stake": lay_stake,
+            "liability": lay_stake * odds,
+            "profit_if_wins": self.back_stake * self.back_odds - self.back_stake - lay_stake * odds,
+            "profit_if_loses": lay_stake - self.back_stake
+        }
+
+
+class RaceState:
+    """Latest odds and open positions for one race"""
+
+    def __init__(self):
+        self.odds = {}
+        self.dutch = None
+        self.lays = {}
+        self.ladders = {}
+
+
+class OddsStream:
+    """Applies feed messages to per-race state and publishes what changed"""
+
+    def __init__(self, publish=print, history=10_000):
+        self.publish = publish
+        self.races = {}
+        self.latencies_ns = deque(maxlen=history)
+
+    def race(self, race):
+        state = self.races.get(race)
+        if state is None:
+            state = self.races[race] = RaceState()
+        return state
+
+    def apply(self, message):
+        """Apply one message; returns the update event or None"""
+        kind = message.get("type", "odds")
+        state = self.race(message["race"])
+
+        if kind == "dutch":
+            state.dutch = DutchPosition(message["horses"], message["target_profit"])
+            for horse in message["horses"]:
+                if horse in state.odds:
+                    state.dutch.update(horse, state.odds[horse])
+            return None
+
+        if kind == "lay":
+            state.lays[message["horse"]] = LayPosition(message["back_stake"], message["back_odds"])
+            return None
+
+        if kind == "ladder":
+            horse = message["horse"]
+            ladder = state.ladders.get(horse)
+            if ladder is None:
+                ladder = state.ladders[horse] = Ladder()
+            ladder.update(message["side"], message["price"], message["volume"])
+            position = state.lays.get(horse)
+            if position is None or message["side"] != "lay":
+                return None
+            return {"race": message["race"], "horse": horse,
+                    "green_up": ladder.green_up(position.back_stake, position.back_odds)}
+
+        if kind != "odds":
+            raise ValueError(f"Unknown message type {kind!r}")
+
+        horse = message["horse"]
+        odds = message["odds"]
+        if state.odds.get(horse) == odds:
+            return None
+        state.odds[horse] = odds
+
+        event = {"race": message["race"], "horse": horse, "odds": odds}
+        if state.dutch is not None and horse in state.dutch.stakes:
+            event["dutch"] = state.dutch.update(horse, odds)
+        if horse in state.lays:
+            event["lay"] = state.lays[horse].update(odds)
+        return event if "dutch" in event or "lay" in event else None
+
+    def run(self, messages):
+        """Consume a message iterable, publishing every change as it happens"""
+        for message in messages:
+            received = time.perf_counter_ns()
+            event = self.apply(message)
+            if event is None:
+                continue
+            self.publish(event)
+            self.latencies_ns.append(time.perf_counter_ns() - received)
+
+    def latency_summary(self):
+        """Median, 99th percentile and max publish latency in microseconds"""
+        if not self.latencies_ns:
+            return {}
+        ordered = sorted(self.latencies_ns)
+        return {
+            "events": len(ordered),
+            "p50_us": ordered[len(ordered) // 2] / 1000,
+            "p99_us": ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)] / 1000,
+            "max_us": ordered[-1] / 1000
+        }
+
+
+def replay_messages(path):
+    """Yield feed messages from a JSON-lines replay file"""
+    with open(path) as replay:
+        for line in replay:
+            if line.strip():
+                yield json.loads(line)
+
+
+def socket_messages(address):
+    """Yield feed messages from a local socket
+
+    `address` is a filesystem path for a Unix socket or a (host, port) pair
+    for a loopback TCP connection.
+    """
+    import socket
+
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        connection.connect(address)
+        with connection.makefile("r") as feed:
+            for line in feed:
+                if line.strip():
+                    yield json.loads(line)
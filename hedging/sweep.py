@@ -0,0 +1,311 @@
+"""Parameter sweeps: a strategy's profit over a grid of its inputs.
+
+Each sweepable strategy has a closed-form surface: given its inputs as
+arrays that broadcast against each other, it returns the profit in every
+outcome (the same outcomes, in the same order, as its OutcomeTable). A grid
+gives each swept input its own axis (every other input stays at the worked
+example's value), so a whole Cartesian grid is a few array operations with
+no Python loop over points.
+
+    result = sweep("each_way", odds=np.linspace(2, 30, 200), place_fraction=[0.2, 0.25],
+                   stake=np.linspace(5, 50, 100))
+    result.best()               # grid point with the best guaranteed profit
+    result.break_even("odds")   # odds where that profit crosses zero, per other point
+
+The objective is the worst outcome (the profit the hedge locks in) unless
+outcome probabilities are given, in which case it is the expected profit.
+
+The exotics (exacta, trifecta, superfecta) sweep their stakes and flat
+prices over the worked example's tickets: which tickets cash on which
+finish is fixed by the horses, so the profit is linear in the rest. Horses
+and field sizes are not numeric axes and stay as in the example. The
+Pick 6, Pick N and accumulator hedges are not sweepable: their hedge
+stakes come out of a solver run for each input, so there is no closed
+form to broadcast, and Pick N reports legs rather than outcomes.
+"""
+import argparse
+import json
+import sys
+import time
+from functools import lru_cache
+from inspect import signature
+
+import numpy as np
+
+from hedging.hedges import GBP_TO_USD
+from hedging.orders import CoverageIndex, box, part_wheel, straight
+from hedging.profiling import profiled
+
+
+def each_way_surface(odds=10.0, stake=10.0, place_fraction=0.25, currency_rate=GBP_TO_USD):
+    stake = stake * currency_rate
+    place = stake * (odds * place_fraction + 1)
+    win = stake * (odds + 1)
+    return [win + place - 2 * stake, place - 2 * stake, -2 * stake]
+
+
+def lay_surface(original_bet=100.0, original_odds=5.0, lay_liability=200.0, lay_odds=2.0):
+    # The lay stake cancels out: it comes back either way, less the liability if the horse wins
+    return [original_bet * original_odds - original_bet - lay_liability, lay_liability - original_bet]
+
+
+def in_running_surface(original_bet=100.0, original_odds=1.0, hedge_bet=30.0, new_leader_odds=1.0):
+    total = original_bet + hedge_bet
+    return [original_bet * original_odds - total, hedge_bet * new_leader_odds - total]
+
+
+def parlay_surface(parlay_bet=10.0, parlay_payout=1000.0, hedge_amount=200.0, hedge_return=300.0):
+    total = parlay_bet + hedge_amount
+    return [parlay_payout - total, hedge_return - total]
+
+
+def dutch_surface(target_profit=100.0, **odds):
+    """Selections are given as odds_<horse>=odds, e.g. odds_4=5
+
+    Any odds_ input replaces the worked example's whole selection.
+    """
+    if not odds:
+        odds = {"odds_1": 3.0, "odds_4": 5.0, "odds_6": 9.0}
+    total = sum(target_profit / price for price in odds.values())
+    return [target_profit - total] * len(odds) + [-total]
+
+
+def multiple_surface(**bets):
+    """Win bets given as stake_<horse>=stake and odds_<horse>=odds, e.g. stake_3=100, odds_3=4
+
+    Any stake_ or odds_ input replaces the worked example's whole selection.
+    """
+    if not bets:
+        bets = {"stake_3": 100.0, "odds_3": 4.0, "stake_7": 50.0, "odds_7": 8.0}
+    horses = [name[6:] for name in bets if name.startswith("stake_")]
+    try:
+        total = sum(bets[f"stake_{horse}"] for horse in horses)
+        return [bets[f"stake_{horse}"] * bets[f"odds_{horse}"] - total for horse in horses] + [-total]
+    except KeyError as error:
+        raise TypeError(f"missing input {error.args[0]}") from None
+
+
+@lru_cache(maxsize=None)
+def _exotic_hits(strategy):
+    """(outcomes, tickets) combinations cashed and each ticket's combinations, for the worked example"""
+    from hedging import exotics
+
+    defaults = {name: parameter.default
+                for name, parameter in signature(getattr(exotics, f"{strategy}_hedge")).parameters.items()}
+    original = straight(defaults["straight_horses"])
+    if strategy == "exacta":
+        hedge = box(defaults["box_horses"], 2)
+    else:
+        hedge = part_wheel(*defaults["wheel_positions" if strategy == "trifecta" else "box_positions"])
+    index = CoverageIndex(defaults["field_size"], original.shape[1], [original, hedge])
+
+    # Same rows as the strategy's table: every covered order, then the rest
+    hits = np.zeros((len(index), 2))
+    np.add.at(hits, (index.entry_order, index.ticket_ids), 1)
+    rows = index.covered()
+    hits = hits[rows]
+    if len(rows) < len(index):
+        hits = np.vstack([hits, np.zeros(2)])
+    return hits, index.combos
+
+
+def _exotic_profit(strategy, stakes, prices):
+    hits, combos = _exotic_hits(strategy)
+    cost = sum(stake * count for stake, count in zip(stakes, combos))
+    return [sum(row[t] * stakes[t] * prices[t] for t in range(len(stakes)) if row[t]) - cost for row in hits]
+
+
+def exacta_surface(straight_bet=20.0, straight_odds=25.0, box_bet=5.0, box_odds=18.0):
+    return _exotic_profit("exacta", (straight_bet, box_bet), (straight_odds, box_odds))
+
+
+def trifecta_surface(straight_bet=10.0, straight_odds=180.0, wheel_bet=1.0, wheel_odds=60.0):
+    return _exotic_profit("trifecta", (straight_bet, wheel_bet), (straight_odds, wheel_odds))
+
+
+def superfecta_surface(straight_bet=5.0, straight_odds=1200.0, box_bet=2.0, box_odds=600.0):
+    return _exotic_profit("superfecta", (straight_bet, box_bet), (straight_odds, box_odds))
+
+
+# (original bet, hedge bet) as the strategy's OutcomeTable reports them, where
+# its outcome names do not depend on the inputs
+def each_way_bets(odds=10.0, stake=10.0, place_fraction=0.25, currency_rate=GBP_TO_USD):
+    return 2 * stake * currency_rate, 0.0
+
+
+def lay_bets(original_bet=100.0, original_odds=5.0, lay_liability=200.0, lay_odds=2.0):
+    return original_bet, lay_liability / lay_odds
+
+
+def in_running_bets(original_bet=100.0, original_odds=1.0, hedge_bet=30.0, new_leader_odds=1.0):
+    return original_bet, hedge_bet
+
+
+def parlay_bets(parlay_bet=10.0, parlay_payout=1000.0, hedge_amount=200.0, hedge_return=300.0):
+    return parlay_bet, hedge_amount
+
+
+BETS = {
+    "each_way": each_way_bets,
+    "lay": lay_bets,
+    "in_running": in_running_bets,
+    "parlay": parlay_bets,
+}
+
+SURFACES = {
+    "each_way": each_way_surface,
+    "lay": lay_surface,
+    "in_running": in_running_surface,
+    "parlay": parlay_surface,
+    "dutch": dutch_surface,
+    "multiple": multiple_surface,
+    "exacta": exacta_surface,
+    "trifecta": trifecta_surface,
+    "superfecta": superfecta_surface,
+}
+
+
+class SweepResult:
+    """Profit over a grid: `profit` is (outcomes, *axis lengths)"""
+
+    def __init__(self, strategy, axes, profit, probabilities=None):
+        self.strategy = strategy
+        self.axes = axes  # {name: 1-D values}, in grid axis order
+        self.profit = profit
+        if probabilities is None:
+            self.objective = profit.min(axis=0)
+        else:
+            self.objective = np.tensordot(np.asarray(probabilities, dtype=float), profit, axes=1)
+
+    @property
+    def shape(self):
+        return self.objective.shape
+
+    @property
+    def size(self):
+        return self.objective.size
+
+    def point(self, index):
+        return {name: float(values[i]) for (name, values), i in zip(self.axes.items(), index)}
+
+    def best(self):
+        """Inputs and objective at the best grid point"""
+        index = np.unravel_index(np.argmax(self.objective), self.shape)
+        return {"params": self.point(index), "objective": float(self.objective[index]),
+                "profit": self.profit[(slice(None),) + index].tolist()}
+
+    def best_region(self, tolerance=0.05):
+        """Bounding range of each input over points within `tolerance` of the best
+
+        The tolerance is a fraction of the objective's range across the grid.
+        """
+        top, bottom = self.objective.max(), self.objective.min()
+        region = self.objective >= top - tolerance * (top - bottom)
+        bounds = {}
+        for axis, (name, values) in enumerate(self.axes.items()):
+            hit = region.any(axis=tuple(i for i in range(region.ndim) if i != axis))
+            bounds[name] = (float(values[hit].min()), float(values[hit].max()))
+        return {"points": int(region.sum()), "fraction": float(region.mean()), "bounds": bounds}
+
+    def break_even(self, name, level=0.0):
+        """Value of input `name` where the objective first crosses `level`
+
+        One value per point of the other axes (NaN where it never crosses),
+        found by linear interpolation between neighbouring grid values. For a
+        two-input grid this is the break-even contour.
+        """
+        axis = list(self.axes).index(name)
+        values = self.axes[name]
+        surface = np.moveaxis(self.objective, axis, -1) - level
+        above = surface >= 0
+        crossing = above[..., 1:] != above[..., :-1]
+        first = np.argmax(crossing, axis=-1)
+        found = crossing.any(axis=-1)
+
+        low = np.take_along_axis(surface, first[..., None], axis=-1)[..., 0]
+        high = np.take_along_axis(surface, first[..., None] + 1, axis=-1)[..., 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(high != low, low / (low - high), 0.0)
+        x = values[first] + share * (values[np.minimum(first + 1, len(values) - 1)] - values[first])
+        return np.where(found, x, np.nan)
+
+    def summary(self, tolerance=0.05):
+        summary = {"strategy": self.strategy, "points": self.size, "axes": {name: [float(values[0]),
+                   float(values[-1]), len(values)] for name, values in self.axes.items()},
+                   "best": self.best(), "best_region": self.best_region(tolerance),
+                   "profitable_fraction": float((self.objective > 0).mean())}
+        contours = {}
+        for name in self.axes:
+            line = self.break_even(name)
+            if np.isfinite(line).any():
+                contours[name] = [float(np.nanmin(line)), float(np.nanmax(line))]
+        summary["break_even"] = contours  # Range of break-even values along each input
+        return summary
+
+
+def grid_axis(text):
+    """"2:30:200" -> 200 values from 2 to 30; "0.2,0.25" -> those values"""
+    if ":" in text:
+        start, stop, count = text.split(":")
+        return np.linspace(float(start), float(stop), int(count))
+    return np.array([float(value) for value in text.split(",")])
+
+
+@profiled("sweep")
+def sweep(strategy, probabilities=None, **grid):
+    """Evaluate a strategy over the Cartesian grid of the given inputs
+
+    Keyword values with more than one element become grid axes; scalars fix
+    an input. Strings are parsed by grid_axis.
+    """
+    try:
+        surface = SURFACES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown sweep strategy {strategy!r}, expected one of {', '.join(SURFACES)}") from None
+
+    params, axes = {}, {}
+    for name, values in grid.items():
+        values = np.atleast_1d(grid_axis(values) if isinstance(values, str) else np.asarray(values, dtype=float))
+        if len(values) == 1:
+            params[name] = float(values[0])
+        else:
+            axes[name] = values
+    for axis, (name, values) in enumerate(axes.items()):
+        shape = [1] * len(axes)
+        shape[axis] = len(values)
+        params[name] = values.reshape(shape)
+
+    try:
+        outcomes = surface(**params)
+    except TypeError as error:
+        raise ValueError(f"Bad sweep inputs for {strategy}: {error}") from None
+    shape = tuple(len(values) for values in axes.values())
+    profit = np.stack([np.broadcast_to(outcome, shape) for outcome in outcomes])
+    if probabilities is not None and len(probabilities) != len(profit):
+        raise ValueError(f"{strategy} has {len(profit)} outcomes, got {len(probabilities)} probabilities")
+    return SweepResult(strategy, axes, profit, probabilities)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep a strategy over a grid of its inputs")
+    parser.add_argument("strategy", choices=list(SURFACES))
+    parser.add_argument("grid", nargs="+", metavar="NAME=START:STOP:COUNT|V1,V2,...")
+    parser.add_argument("--probabilities", help="comma-separated outcome probabilities; optimize expected profit")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="best region: fraction of the objective range")
+    parser.add_argument("--output", help="save the axes and profit surface to an .npz file")
+    args = parser.parse_args(argv)
+
+    grid = dict(item.split("=", 1) for item in args.grid)
+    probabilities = args.probabilities and [float(value) for value in args.probabilities.split(",")]
+    start = time.perf_counter()
+    result = sweep(args.strategy, probabilities, **grid)
+    summary = result.summary(args.tolerance)
+    summary["seconds"] = round(time.perf_counter() - start, 4)
+    if args.output:
+        np.savez_compressed(args.output, profit=result.profit, objective=result.objective, **result.axes)
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from hedging.backtest import RaceBatch, backtest, each_way
+from hedging.store import RaceStore, StoreWriter
+
+
+def _race(writer, race, size, winner=1):
+    horses = list(range(1, size + 1))
+    finish = [(horse - winner) % size + 1 for horse in horses]
+    writer.add("AQU", f"2024-01-{race:02d}", race, horses, finish, [2.0 + horse for horse in horses],
+               {"exacta": 12.0})
+
+
+def test_each_way_skips_fields_smaller_than_rank(tmp_path):
+    with StoreWriter(str(tmp_path)) as writer:
+        _race(writer, 1, 3, winner=3)
+    store = RaceStore(str(tmp_path))
+    batch = RaceBatch(store, np.arange(len(store)))
+    staked, returned = each_way(batch, rank=4, places=2)
+    assert staked.tolist() == [0.0] and returned.tolist() == [0.0]
+
+    staked, returned = each_way(batch, rank=3, places=2)
+    assert staked.tolist() == [2.0] and returned.tolist() == [7.0]
+
+
+RULES = ["favourite", "dutch:size=2", "each_way:rank=2", "exacta_box:size=3"]
+
+
+def _fill(path, races, start=1):
+    with StoreWriter(path) as writer:
+        for race in range(start, start + races):
+            _race(writer, race, 4 + race % 3, winner=race % 4 + 1)
+
+
+def test_resumed_backtest_matches_a_full_run(tmp_path):
+    full, grown = str(tmp_path / "full"), str(tmp_path / "grown")
+    state = str(tmp_path / "state.json")
+    _fill(full, 9)
+    expected = backtest(full, RULES, block_size=2)
+
+    _fill(grown, 5)
+    backtest(grown, RULES, state, block_size=2)
+    _fill(grown, 4, start=6)
+    resumed = backtest(grown, RULES, state, block_size=2)
+    assert {rule: pytest.approx(report) for rule, report in resumed.items()} == expected
+
+
+def test_state_from_another_store_is_dropped(tmp_path):
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    state = str(tmp_path / "state.json")
+    _fill(first, 6)
+    _fill(second, 6, start=10)
+    backtest(first, RULES, state)
+    resumed = backtest(second, RULES, state)
+    assert {rule: pytest.approx(report) for rule, report in resumed.items()} == backtest(second, RULES)
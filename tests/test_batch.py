@@ -0,0 +1,80 @@
+import csv
+import json
+
+import pytest
+
+from hedging.batch import evaluate_tickets, parse_horses, read_tickets, run_batch
+
+# (CSV horses, JSON horses) for the same ticket
+TICKETS = [
+    {"id": "win", "bet_type": "win", "horses": ("3,5,7", [3, 5, 7]), "stake": 10, "odds": 4, "result": "5-3-7"},
+    {"id": "dutch", "bet_type": "dutch", "horses": ("1,4,6", [1, 4, 6]), "stake": 100, "odds": "3,5,9",
+     "result": "4-1-6"},
+    {"id": "each_way", "bet_type": "each_way", "horses": ("4", [4]), "stake": 10, "odds": 8, "result": "2-4-1"},
+    {"id": "lay", "bet_type": "lay", "horses": ("2", [2]), "stake": 100, "odds": 5, "lay_odds": 2.5,
+     "result": "2-1-3"},
+    {"id": "box", "bet_type": "exacta", "horses": ("3,5", [3, 5]), "stake": 5, "odds": 18, "result": "5-3"},
+    {"id": "straight", "bet_type": "exacta", "horses": ("3/5", [[3], [5]]), "stake": 20, "odds": 25,
+     "result": "3-5"},
+    {"id": "wheel", "bet_type": "trifecta", "horses": ("2/5,8,9/5,8,9,10", [2, [5, 8, 9], [5, 8, 9, 10]]),
+     "stake": 1, "odds": 60, "result": "2-9-10"},
+]
+
+
+def _files(tmp_path):
+    csv_path, json_path = tmp_path / "tickets.csv", tmp_path / "tickets.jsonl"
+    fields = ["id", "bet_type", "horses", "stake", "odds", "lay_odds", "result"]
+    with open(csv_path, "w", newline="") as target:
+        writer = csv.DictWriter(target, fieldnames=fields)
+        writer.writeheader()
+        for ticket in TICKETS:
+            writer.writerow({**ticket, "horses": ticket["horses"][0]})
+    with open(json_path, "w") as target:
+        for ticket in TICKETS:
+            target.write(json.dumps({**ticket, "horses": ticket["horses"][1]}) + "\n")
+    return str(csv_path), str(json_path)
+
+
+def test_json_lists_parse_like_strings():
+    assert parse_horses([3, 5, 7]) == parse_horses("3,5,7") == [[3, 5, 7]]
+    assert parse_horses([[2], [5, 8]]) == parse_horses("2/5,8") == [[2], [5, 8]]
+
+
+def test_csv_and_jsonl_tickets_agree(tmp_path):
+    csv_path, json_path = _files(tmp_path)
+    from_csv = list(evaluate_tickets(read_tickets(csv_path)))
+    from_json = list(evaluate_tickets(read_tickets(json_path)))
+    assert from_csv == from_json
+
+    results = {result["id"]: result for result in from_json}
+    assert results["win"]["cost"] == 30
+    assert results["dutch"]["profit"] == pytest.approx(35.56)
+    assert results["box"]["combos"] == 2
+    assert results["straight"]["combos"] == 1
+    assert results["wheel"]["returns"] == 60
+
+
+def test_short_result_leaves_exotic_unsettled():
+    tickets = [{"id": 1, "bet_type": "exacta", "horses": "5,7", "stake": 2, "odds": 10, "result": "5"},
+               {"id": 2, "bet_type": "trifecta", "horses": "5/5,7,8/5,7,8", "stake": 1, "odds": 50, "result": "5-7"}]
+    for result in evaluate_tickets(tickets):
+        assert result["returns"] is None and result["profit"] is None
+
+
+def test_bad_tickets_get_error_rows(tmp_path):
+    tickets = [{"id": 1, "bet_type": "exacta", "horses": "3/5/7", "stake": 1, "odds": 10},
+               {"id": 2, "bet_type": "exacta", "horses": "3/5", "stake": 1, "odds": 10, "result": "3-5"},
+               {"id": 3, "bet_type": "place", "horses": "4", "stake": 5, "odds": 3},
+               {"id": 4, "bet_type": "win", "horses": "4", "stake": "ten", "odds": 3},
+               {"id": 5, "bet_type": "win", "horses": "4", "stake": 10, "odds": 3, "result": "4-1"}]
+    source, destination = tmp_path / "tickets.jsonl", tmp_path / "results.csv"
+    source.write_text("".join(json.dumps(ticket) + "\n" for ticket in tickets))
+    assert run_batch(str(source), str(destination)) == 5
+
+    with open(destination, newline="") as results:
+        rows = {int(row["id"]): row for row in csv.DictReader(results)}
+    assert rows[1]["error"] == "Ticket 1: exacta needs 2 positions" and rows[1]["cost"] == ""
+    assert "unknown bet type 'place'" in rows[3]["error"]
+    assert rows[4]["error"]
+    assert rows[2]["profit"] == "9.0" and rows[5]["profit"] == "20.0"
+    assert rows[2]["error"] == rows[5]["error"] == ""
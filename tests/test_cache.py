@@ -0,0 +1,41 @@
+import multiprocessing
+
+import pytest
+
+from hedging.cache import ResultCache
+
+
+def _child_put(cache, queue):
+    queue.put((cache.get("parent"), len(cache._inherited)))
+    cache.put("child", 2)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_worker_opens_its_own_connection(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("parent", 1)
+    cache.memory.clear()  # Make the child read from disk
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    worker = context.Process(target=_child_put, args=(cache, queue))
+    worker.start()
+    seen, inherited = queue.get(timeout=10)
+    worker.join(10)
+    assert worker.exitcode == 0 and seen == 1 and inherited == 1
+    assert cache.get("child") == 2 and not cache._inherited
+    cache.close()
+
+
+def test_bool_and_number_arguments_do_not_share_an_entry(tmp_path):
+    from hedging import cache as module
+
+    @module.cached("echo")
+    def echo(value):
+        return repr(value)
+
+    module.enable(str(tmp_path))
+    try:
+        assert [echo(True), echo(1), echo(1.0), echo(True)] == ["True", "1", "1", "True"]
+    finally:
+        module.disable()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from hedging.consolidate import _count, _count_bytes, _pack, consolidate, coverage_from_tickets
+from hedging.orders import part_wheel
+
+
+def test_byte_table_popcount_matches():
+    mask = np.random.default_rng(0).random((3, 5, 700)) < 0.3
+    bits = _pack(mask)
+    assert (_count_bytes(bits) == mask.sum(axis=-1)).all()
+    assert (_count(bits) == _count_bytes(bits)).all()
+
+
+def test_consolidated_coverage_is_exact():
+    tickets = [(((1, 2, 3, 4, 5, 6),) * 4, 1), (((1,), (2, 3, 4, 5, 6, 7, 8), (2, 3, 4, 5, 6, 7, 8),
+                                                 (2, 3, 4, 5, 6, 7, 8)), 2), (((9, 10, 11, 12),) * 4, 1)]
+    wanted = coverage_from_tickets(tickets, 14)
+    plan = consolidate(wanted, 14)
+    got = plan.coverage()
+    assert got.keys() == wanted.keys()
+    assert all(abs(got[order] - stake) < 1e-9 for order, stake in wanted.items())
+
+
+def test_demo_hedges_get_cheaper():
+    trifecta = [(((2,), (5,), (8,)), 10), (((2,), (5, 8, 9), (5, 8, 9, 10)), 1)]
+    before = sum(stake * len(part_wheel(*positions)) for positions, stake in trifecta)
+    assert (before, consolidate(coverage_from_tickets(trifecta, 10), 10).cost) == (19, 18)
@@ -0,0 +1,35 @@
+"""Golden values: the worked examples the original scripts have always printed"""
+import pytest
+
+from hedging import registry
+from hedging.exotics import dutch, exacta_hedge, superfecta_hedge, trifecta_hedge
+from hedging.hedges import each_way, in_running, lay_hedge, multiple_horses, parlay_hedge
+
+
+@pytest.mark.parametrize("strategy, profits", [
+    (exacta_hedge, [540, 40, 40, 40, 40, 40, -50]),
+    (lay_hedge, [200, 100]),
+    (each_way, [156.25, 18.75, -25]),
+    (parlay_hedge, [790, 90]),
+    (in_running, [-30, -100]),
+    (multiple_horses, [250, 250, -150]),
+])
+def test_worked_example_profits(strategy, profits):
+    assert strategy().profit.tolist() == pytest.approx(profits)
+
+
+def test_exotic_extremes():
+    trifecta, superfecta = trifecta_hedge(), superfecta_hedge()
+    assert (trifecta.profit.max(), trifecta.profit.min()) == pytest.approx((1841, -19))
+    assert (superfecta.profit.max(), superfecta.profit.min()) == pytest.approx((7191, -9))
+
+
+def test_dutch_returns_the_target():
+    table, stakes = dutch()
+    assert table.profit.tolist() == pytest.approx([35.56, 35.56, 35.56, -64.44], abs=0.005)
+    assert stakes.sum() == pytest.approx(64.44, abs=0.005)
+
+
+@pytest.mark.parametrize("name", registry.strategy_names())
+def test_every_registered_strategy_runs(name):
+    assert registry.get_strategy(name)() is not None
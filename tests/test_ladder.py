@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from hedging.ladder import TICKS, Ladder
+
+
+def _scan(volume, side):
+    """Populated prices best first, by a full scan"""
+    prices = [TICKS[i] for i, v in enumerate(volume) if v > 0]
+    return prices[::-1] if side == "back" else prices
+
+
+def test_levels_match_a_full_scan():
+    rng = random.Random(3)
+    ladder = Ladder()
+    for _ in range(3000):
+        side = rng.choice(("back", "lay"))
+        ladder.update(side, TICKS[rng.randrange(60)], rng.choice((0, 0, 5.0, 20.0)))
+        for check in ("back", "lay"):
+            expected = _scan(ladder.volume[check], check)
+            assert ladder.best_price(check) == (expected[0] if expected else None)
+            assert [price for price, _ in ladder.depth(check, 4)] == expected[:4]
+
+
+def test_fill_lay_walks_from_best():
+    ladder = Ladder()
+    ladder.update("lay", 3.0, 10)
+    ladder.update("lay", 2.5, 10)
+    ladder.update("lay", 4.0, 100)
+    fill = ladder.fill_lay(25)
+    assert fill.levels == [(2.5, 10), (3.0, 10), (4.0, 5)]
+    assert fill.cost == pytest.approx(10 * 1.5 + 10 * 2 + 5 * 3)
@@ -0,0 +1,44 @@
+from itertools import permutations, product
+
+import numpy as np
+import pytest
+
+from hedging.orders import CoverageIndex, box, finish_orders, part_wheel, straight, wheel
+
+
+@pytest.mark.parametrize("field_size, depth", [(4, 1), (6, 2), (7, 3), (6, 4)])
+def test_finish_orders_are_every_permutation(field_size, depth):
+    naive = list(permutations(range(1, field_size + 1), depth))
+    assert [tuple(order) for order in finish_orders(field_size, depth).tolist()] == naive
+
+
+def test_part_wheel_drops_repeated_horses():
+    positions = [[2], [5, 8, 9], [5, 8, 9, 10]]
+    naive = [order for order in product(*positions) if len(set(order)) == len(order)]
+    assert [tuple(order) for order in part_wheel(*positions).tolist()] == naive
+    assert len(box([1, 2, 3, 4], 3)) == 24
+    assert len(wheel(1, [2, 3, 4], 3)) == 6
+
+
+def test_coverage_matches_naive_enumeration():
+    tickets = [straight([3, 5, 1]), box([1, 3, 5, 7], 3), wheel(2, [1, 3, 5], 3),
+               part_wheel([1, 2], [3, 4, 5], [6, 7, 8])]
+    index = CoverageIndex(8, 3, tickets)
+    stakes, prices = np.array([5.0, 1.0, 2.0, 0.5]), np.array([300.0, 40.0, 90.0, 150.0])
+
+    sets = [{tuple(order) for order in ticket.tolist()} for ticket in tickets]
+    cost = float((stakes * [len(ticket) for ticket in tickets]).sum())
+    profits = index.profits(stakes, prices)
+    counts = np.diff(index.indptr)
+    for row, order in enumerate(permutations(range(1, 9), 3)):
+        owners = [ticket for ticket, combos in enumerate(sets) if order in combos]
+        assert sorted(index.tickets_for(order).tolist()) == owners
+        assert counts[row] == len(owners)
+        assert profits[row] == pytest.approx(sum(stakes[owners] * prices[owners]) - cost)
+    assert len(index.covered()) == len(set().union(*sets))
+
+
+def test_orders_outside_the_field_are_not_indexed():
+    index = CoverageIndex(5, 2, [box([1, 2], 2)])
+    assert index.index_of([[1, 6], [0, 2], [2, 1]]).tolist() == [-1, -1, 4]
+    assert len(index.tickets_for([6, 1])) == 0
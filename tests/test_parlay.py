@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from hedging.parlay import solve_schedule
+
+
+def _log_growth(bankroll, claim, stakes, probabilities, against):
+    """Expected log wealth ratio of a hedge schedule, by walking the legs"""
+    growth, cash, alive = 0.0, bankroll, 1.0
+    for stake, p, price in zip(stakes, probabilities, against):
+        cash = cash - stake
+        growth = growth + alive * (1 - p) * np.log((cash + stake * price) / bankroll)
+        alive = alive * p
+    return growth + alive * np.log((cash + claim) / bankroll)
+
+
+def test_fair_single_leg_hedges_to_equal_wealth():
+    schedule = solve_schedule(500, [[3.0]], bankroll=1000)
+    # Fair against odds of 1.5: a Kelly bettor evens out both outcomes
+    assert schedule.hedge_now[0] == pytest.approx(500 / 1.5, rel=0.03)
+    assert schedule.certainty_equivalent[0] == pytest.approx(500 - 500 / 1.5, rel=0.03)
+    assert schedule.actions.tolist() == ["hedge now"]
+
+
+def test_a_value_leg_is_left_to_ride():
+    schedule = solve_schedule(500, [[3.0]], probabilities=[[0.9]], bankroll=1000)
+    assert schedule.actions.tolist() == ["ride"] and schedule.total_stake[0] == 0
+
+
+def test_two_leg_schedule_matches_a_grid_search():
+    claim, bankroll, odds = 800.0, 1000.0, np.array([2.5, 4.0])
+    probabilities, against = np.array([0.45, 0.3]), np.array([1.6, 1.25])
+    schedule = solve_schedule(claim, [odds], [against], [probabilities], bankroll)
+
+    steps = np.linspace(0, 0.95 * bankroll, 400)
+    first, second = np.meshgrid(steps, steps, indexing="ij")
+    feasible = first + second <= 0.95 * bankroll
+    best = _log_growth(bankroll, claim, [first[feasible], second[feasible]], probabilities, against).max()
+
+    achieved = _log_growth(bankroll, claim, schedule.stakes[0], probabilities, against)
+    assert schedule.growth[0] == pytest.approx(achieved, abs=2e-3)
+    assert achieved == pytest.approx(best, abs=2e-3)
+
+
+def test_padded_accumulators_solve_like_short_ones():
+    odds = np.array([[2.0, 3.0, 1.8], [2.5, 4.0, np.nan]])
+    together = solve_schedule([900, 600], odds, bankroll=1000, cost=[20, 10])
+    for row in range(2):
+        legs = np.isfinite(odds[row])
+        alone = solve_schedule(together.claim[row], odds[row, legs][None], bankroll=1000, cost=together.cost[row])
+        assert together.stakes[row, legs] == pytest.approx(alone.stakes[0])
+        assert together.guaranteed[row] == pytest.approx(alone.guaranteed[0])
+    assert together.stakes[1, 2] == 0
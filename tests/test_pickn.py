@@ -0,0 +1,71 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from hedging.pickn import PickCard
+
+TICKETS = [[[1, 2], [3], [1, 4, 5], [2, 6]],
+           [[2], [3, 7], [4], [1, 2, 6]],
+           [[1, 2, 3], [7], [4, 5], [6]]]
+BASE = [2.0, 1.0, 0.5]
+
+
+def _live(ticket, winners):
+    """Naive: every combination of the ticket agreeing with the winners so far"""
+    return [combo for combo in product(*ticket) if list(combo[:len(winners)]) == winners]
+
+
+def test_card_tracks_live_combinations_leg_by_leg():
+    card = PickCard(TICKETS, BASE)
+    assert card.combinations.tolist() == [len(list(product(*ticket))) for ticket in TICKETS]
+    assert card.cost.tolist() == pytest.approx([12 * 2.0, 6 * 1.0, 6 * 0.5])
+
+    for winner in (2, 3, 4):
+        card.record(winner)
+        winners = card.winners
+        assert card.alive_combinations().tolist() == [len(_live(ticket, winners)) for ticket in TICKETS]
+        coverage = card.coverage(8)
+        for horse in range(8):
+            naive = sum(base * sum(combo[len(winners)] == horse for combo in _live(ticket, winners))
+                        for ticket, base in zip(TICKETS, BASE))
+            assert coverage[horse] == pytest.approx(naive)
+
+    card.record(6)
+    assert card.alive.tolist() == [True, True, False]
+    with pytest.raises(ValueError):
+        card.record(1)
+
+
+def test_expected_payouts_match_naive_enumeration():
+    card = PickCard(TICKETS, BASE)
+    card.record(2)
+    probabilities = np.random.default_rng(7).dirichlet(np.ones(8), size=4)
+    expected = card.expected_payouts(100.0, probabilities)
+    for horse in range(8):
+        naive = sum(base * np.prod([probabilities[leg][combo[leg]] for leg in range(2, 4)])
+                    for ticket, base in zip(TICKETS, BASE)
+                    for combo in _live(ticket, [2]) if combo[1] == horse)
+        assert expected[horse] == pytest.approx(100.0 * naive)
+
+
+def test_final_leg_hedge_covers_the_payouts():
+    card = PickCard(TICKETS, BASE)
+    for winner in (2, 3, 4):
+        card.record(winner)
+    odds = np.array([np.nan, 3.0, 4.0, np.nan, np.nan, np.nan, 2.5, np.nan])
+    hedge = card.hedge(50.0, odds)
+    payouts = 50.0 * card.coverage(8)
+    runners = ~np.isnan(odds)
+    floor = (payouts + hedge.stakes * np.nan_to_num(odds))[runners].min() - card.cost.sum() - hedge.total_stake
+    assert hedge.guaranteed == pytest.approx(floor)
+
+
+def test_tickets_need_the_same_legs():
+    with pytest.raises(ValueError):
+        PickCard([[[1], [2]], [[1]]])
+
+
+def test_hedging_early_needs_probabilities():
+    with pytest.raises(ValueError):
+        PickCard(TICKETS).hedge(50.0, np.full(8, 4.0))
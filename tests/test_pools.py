@@ -0,0 +1,14 @@
+import pytest
+
+from hedging.pools import PoolSnapshot
+
+
+@pytest.mark.parametrize("order", ["3-9", "3-3", "0-2", "3-5-7", (2, 11)])
+def test_unknown_order_is_rejected(order):
+    with pytest.raises(ValueError, match="is not in a 8-runner 2-place pool"):
+        PoolSnapshot(8, "exacta", 50000, combo_money={"3-5": 1500, order: 900})
+
+
+def test_money_lands_on_its_order():
+    pool = PoolSnapshot(8, "exacta", 50000, combo_money={"3-5": 1500, (5, 3): 2200})
+    assert pool.combo_money.sum() == 3700 and pool.combo_money.max() == 2200
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from hedging.portfolio import PortfolioSolver, _demo_card, kelly_portfolio, project
+
+NO_CAPS = {"fraction": 1.0, "runner_cap": 1.0, "race_cap": 0.99, "total_cap": 10.0}
+
+
+def test_projection_is_feasible_and_nearest():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        y = rng.normal(0.05, 0.1, (4, 5))
+        weight = rng.uniform(0.5, 2.0, (4, 5))
+        upper = np.where(rng.random((4, 5)) < 0.8, 0.08, 0.0)
+        race_cap, total_cap = np.full(4, 0.15), 0.3
+        x = project(y, upper, race_cap, total_cap, weight)
+
+        assert (x >= 0).all() and (x <= upper + 1e-12).all()
+        assert (x.sum(axis=1) <= race_cap + 1e-9).all() and x.sum() <= total_cap + 1e-9
+        # Nearest point of a convex set: no feasible z lies at an acute angle to y - x
+        for _ in range(50):
+            z = project(rng.normal(0.05, 0.1, (4, 5)), upper, race_cap, total_cap)
+            assert ((y - x) * (z - x) / weight).sum() <= 1e-9
+
+
+def test_single_runner_matches_the_kelly_formula():
+    portfolio = kelly_portfolio([{1: 0.4}], [{1: 3.5}], bankroll=1000, **NO_CAPS)
+    assert portfolio.stakes[0, 0] == pytest.approx(1000 * (0.4 * 3.5 - 1) / (3.5 - 1), rel=1e-4)
+
+    half = kelly_portfolio([{1: 0.4}], [{1: 3.5}], bankroll=1000, **{**NO_CAPS, "fraction": 0.5})
+    assert half.stakes[0, 0] == pytest.approx(portfolio.stakes[0, 0] / 2, rel=1e-4)
+
+
+def test_two_runners_match_a_grid_search():
+    p, o = {1: 0.35, 2: 0.3}, {1: 3.6, 2: 4.0}
+    portfolio = kelly_portfolio([p], [o], bankroll=1, **NO_CAPS)
+    grid = np.linspace(0, 0.45, 451)
+    f1, f2 = np.meshgrid(grid, grid, indexing="ij")
+    rest = 1 - f1 - f2
+    values = 0.35 * np.log(rest + 3.6 * f1) + 0.3 * np.log(rest + 4.0 * f2) + 0.35 * np.log(rest)
+    best = np.unravel_index(values.argmax(), values.shape)
+    assert portfolio.stakes[0] == pytest.approx([grid[best[0]], grid[best[1]]], abs=2e-3)
+    assert portfolio.growth[0] >= values.max() - 1e-9
+
+
+def test_caps_bind_and_warm_start_reaches_the_same_answer():
+    probabilities, odds = _demo_card()
+    solver = PortfolioSolver(bankroll=1000, fraction=0.5)
+    portfolio = solver.solve(probabilities, odds)
+    assert (portfolio.stakes <= 50 + 1e-6).all()
+    assert (portfolio.exposure <= 100 + 1e-6).all() and portfolio.total_stake <= 250 + 1e-6
+
+    odds[0][4] = 4.6
+    warm = solver.solve(probabilities, odds)
+    cold = kelly_portfolio(probabilities, odds, bankroll=1000, fraction=0.5)
+    assert warm.stakes == pytest.approx(cold.stakes, abs=1e-3)
+    assert warm.iterations <= cold.iterations
+
+
+def test_probabilities_over_one_are_rejected():
+    with pytest.raises(ValueError):
+        kelly_portfolio([{1: 0.7, 2: 0.5}], [{1: 2.0, 2: 3.0}])
@@ -0,0 +1,13 @@
+import pytest
+
+from hedging.records import MAX_HORSE, Ticket, ticket_array
+
+
+def test_high_horse_numbers_are_rejected():
+    with pytest.raises(ValueError, match="horse numbers must be 0-31"):
+        ticket_array([Ticket("exacta", ((3,), (32,)), 1, 10)])
+
+
+def test_highest_horse_packs():
+    records = ticket_array([Ticket("exacta", ((1,), (MAX_HORSE,)), 1, 10)])
+    assert int(records["positions"][0, 1]) == 1 << MAX_HORSE
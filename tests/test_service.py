@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from hedging import registry, service
+from hedging.service import HedgeService, _single, evaluate_requests
+from hedging.sweep import BETS
+
+
+def test_bad_request_fails_alone():
+    replies = evaluate_requests([("lay", {"lay_odds": 2.5}), ("lay_ladder", {"ladder": {"x": 1}}),
+                                 ("exacta", {})])
+    assert "result" in replies[0] and "result" in replies[2]
+    assert replies[1]["error"].startswith("AttributeError")
+
+
+def test_mixed_batch_through_the_batcher():
+    async def run():
+        service = HedgeService(window=0.01)
+        batcher = asyncio.ensure_future(service.batcher())
+        try:
+            return await asyncio.gather(
+                service.handle({"strategy": "lay", "params": {"lay_odds": 2.5}}),
+                service.handle({"strategy": "lay_ladder", "params": {"ladder": {"x": 1}}}),
+                service.handle({"strategy": "parlay", "params": {}}))
+        finally:
+            batcher.cancel()
+            service.worker.shutdown(wait=False)
+
+    good, bad, other = asyncio.run(run())
+    assert good["result"]["worst_profit"] == 100 and other["result"]["best_profit"] == 790
+    assert "error" in bad
+
+
+def test_degenerate_inputs_reply_the_same_on_either_path():
+    batched = evaluate_requests([("lay", {"lay_odds": 0}), ("lay", {"lay_odds": 2.5})])
+    alone = evaluate_requests([("lay", {"lay_odds": 0, "lay_liability": 200})])
+    assert batched[0] == alone[0] and "error" in batched[0]
+    assert "result" in batched[1]
+
+
+def test_bools_take_the_single_path():
+    assert evaluate_requests([("lay", {"lay_odds": True})]) == [_single("lay", {"lay_odds": True})]
+
+
+def test_vectorized_failure_falls_back_per_request(monkeypatch):
+    def broken(strategy, requests):
+        raise RuntimeError("broadcast failed")
+    monkeypatch.setattr(service, "_vectorized", broken)
+    replies = evaluate_requests([("lay", {"lay_odds": 2.5}), ("lay", {"lay_odds": 0})])
+    assert replies[0]["result"]["worst_profit"] == 100
+    assert replies[1]["error"].startswith("ZeroDivisionError")
+
+
+VECTORIZED_POINTS = [
+    ("each_way", {}), ("each_way", {"odds": 4.5, "stake": 25, "place_fraction": 0.2}),
+    ("lay", {}), ("lay", {"original_bet": 50, "original_odds": 8, "lay_liability": 120, "lay_odds": 3.5}),
+    ("in_running", {}), ("in_running", {"original_odds": 2.5, "hedge_bet": 60, "new_leader_odds": 3}),
+    ("parlay", {}), ("parlay", {"parlay_bet": 25, "parlay_payout": 4000, "hedge_amount": 500, "hedge_return": 900}),
+]
+
+
+def test_every_bets_entry_has_points():
+    assert {strategy for strategy, _ in VECTORIZED_POINTS} == set(BETS)
+
+
+@pytest.mark.parametrize("strategy, params", VECTORIZED_POINTS)
+def test_vectorized_reply_matches_registered_strategy(strategy, params):
+    table = registry.get_strategy(strategy)(**params)
+    assert BETS[strategy](**params) == pytest.approx((table.original_bet, table.hedge_bet))
+
+    # Batched with every other point so the broadcast path is taken
+    replies = evaluate_requests(VECTORIZED_POINTS)
+    batched = replies[VECTORIZED_POINTS.index((strategy, params))]["result"]
+    alone = _single(strategy, params)["result"]
+    for field in ("outcomes", "original_bet", "hedge_bet", "best_profit", "worst_profit"):
+        assert batched[field] == pytest.approx(alone[field])
+    assert batched["scenarios"] == alone["scenarios"]
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from hedging.orders import CoverageIndex, straight
+from hedging.simulate import field_probabilities, harville_orders, simulate, simulate_orders
+
+
+def test_seed_gives_the_same_counts_with_any_worker_count():
+    probs = field_probabilities({1: 0.25, 4: 0.15, 6: 0.10}, 10)
+    one = simulate_orders(probs, 1, n_races=200_000, batch_size=50_000, workers=1, seed=1)
+    four = simulate_orders(probs, 1, n_races=200_000, batch_size=50_000, workers=4, seed=1)
+    assert (one == four).all() and one.sum() == 200_000
+
+
+def test_uneven_last_chunk():
+    counts = simulate_orders(np.full(6, 1 / 6), 2, n_races=12_345, batch_size=5_000, workers=1, seed=3)
+    assert counts.sum() == 12_345
+
+
+def test_harville_orders_are_distinct_and_follow_win_probabilities():
+    probs = np.array([0.5, 0.3, 0.1, 0.1])
+    orders = harville_orders(probs, 3, 100_000, np.random.default_rng(0))
+    assert all(len(set(row)) == 3 for row in orders[:1000].tolist())
+    winners = np.bincount(orders[:, 0], minlength=5)[1:] / len(orders)
+    assert winners == pytest.approx(probs, abs=0.01)
+    # Harville: P(1 then 2) = p1 * p2 / (1 - p1)
+    first_two = np.mean((orders[:, 0] == 1) & (orders[:, 1] == 2))
+    assert first_two == pytest.approx(0.5 * 0.3 / 0.5, abs=0.01)
+
+
+def test_simulated_win_bet_matches_its_expectation():
+    probs = field_probabilities({1: 0.25}, 8)
+    index = CoverageIndex(8, 1, [straight((1,))])
+    summary = simulate(index, probs, [10], [5], n_races=200_000, workers=1, seed=2).summary()
+    assert summary["expected_profit"] == pytest.approx(0.25 * 50 - 10, abs=0.5)
+    assert summary["loss_probability"] == pytest.approx(0.75, abs=0.01)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from hedging.solver import solve_alive_hedge, solve_final_leg
+
+
+def test_breakeven_gets_the_outlay_back():
+    solution = solve_final_leg(1000, 50, [4, 4], objective="breakeven")
+    assert solution.total_stake == pytest.approx(50)
+    assert np.nanmin(solution.runner_profit) == pytest.approx(0)
+    assert solution.alive_profit == pytest.approx(900)
+
+
+def test_breakeven_past_the_payout_is_capped():
+    # cost / (1 - h) = 200 would pay more than the ticket's 100
+    breakeven = solve_final_leg(100, 50, [2, 4], objective="breakeven")
+    maximin = solve_final_leg(100, 50, [2, 4])
+    assert breakeven.stakes == pytest.approx(maximin.stakes)
+    assert breakeven.guaranteed == pytest.approx(-25)
+
+
+def _grid(step, top, runners):
+    axes = np.meshgrid(*[np.arange(0, top + step, step, dtype=float)] * runners, indexing="ij")
+    return np.stack([axis.ravel() for axis in axes], axis=1)
+
+
+@pytest.mark.parametrize("bankroll", [np.inf, 90.0])
+def test_final_leg_floor_beats_a_grid_search(bankroll):
+    payout, cost, odds = 400.0, 60.0, np.array([3.3, 5.7])
+    stakes = _grid(1.0, 200, 2)
+    stakes = stakes[stakes.sum(axis=1) <= bankroll]
+    spent = cost + stakes.sum(axis=1)
+    floors = np.minimum(payout - spent, (stakes * odds - spent[:, None]).min(axis=1))
+
+    solution = solve_final_leg(payout, cost, odds, bankroll)
+    assert solution.total_stake <= bankroll + 1e-9
+    assert solution.guaranteed >= floors.max() - 1e-9
+    assert solution.guaranteed <= floors.max() + 10
+
+
+def test_alive_hedge_floor_beats_a_grid_search():
+    payouts, odds, cost, bankroll = np.array([300.0, 0.0, 80.0]), np.array([6.0, 2.5, 4.0]), 40.0, 150.0
+    stakes = _grid(2.0, 150, 3)
+    stakes = stakes[stakes.sum(axis=1) <= bankroll]
+    floors = (payouts + stakes * odds - (cost + stakes.sum(axis=1))[:, None]).min(axis=1)
+
+    hedge = solve_alive_hedge(payouts, odds, cost, bankroll)
+    assert hedge.total_stake <= bankroll + 1e-9
+    assert hedge.guaranteed == pytest.approx((payouts + hedge.stakes * odds).min() - cost - hedge.total_stake)
+    assert hedge.guaranteed >= floors.max() - 1e-9
+
+
+def test_batched_solves_match_one_at_a_time():
+    odds = np.array([[3.0, 5.0, np.nan], [2.0, 4.0, 8.0], [1.5, 1.5, np.nan]])
+    payout, cost = np.array([500.0, 200.0, 90.0]), np.array([40.0, 20.0, 10.0])
+    batched = solve_final_leg(payout, cost, odds, bankroll=150)
+    for row in range(len(odds)):
+        alone = solve_final_leg(payout[row], cost[row], odds[row], bankroll=150)
+        assert batched.stakes[row] == pytest.approx(alone.stakes)
+    assert batched.total_stake[2] == 0  # The book is over 1: hedging cannot help
@@ -0,0 +1,90 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from hedging.store import RACE_COLUMNS, RaceStore, StoreWriter, day_date, import_csv
+
+# (track, date, race, [(horse, finish, odds)], exacta will-pay or None)
+RACES = [
+    ("AQU", "2024-01-03", 1, [(1, 2, 3.5), (2, 1, 2.2), (3, 0, 9.0)], 14.5),
+    ("BEL", "2024-01-02", 1, [(4, 1, 5.0), (5, 3, 4.0), (6, 2, 2.5), (7, 0, 30.0)], None),
+    ("AQU", "2024-01-02", 2, [(1, 1, 1.8), (2, 2, 6.0)], 9.25),
+    ("SAR", "2024-01-05", 3, [(3, 3, 7.0), (8, 1, 3.0), (9, 2, 4.5), (2, 0, 12.0), (5, 0, 20.0)], 21.0),
+]
+
+
+def _write_csv(path, races):
+    with open(path, "w", newline="") as target:
+        writer = csv.writer(target)
+        writer.writerow(["track", "date", "race", "horse", "finish", "odds", "exacta"])
+        for track, date, race, runners, exacta in races:
+            for horse, finish, odds in runners:
+                writer.writerow([track, date, race, horse, finish or "", odds, "" if exacta is None else exacta])
+
+
+def test_import_round_trip(tmp_path):
+    source, path = str(tmp_path / "races.csv"), str(tmp_path / "store")
+    _write_csv(source, RACES)
+    assert import_csv(source, path) == len(RACES)
+
+    store = RaceStore(path)
+    assert len(store) == 4 and store.n_runners == 14
+    for row, (track, date, race, runners, exacta) in enumerate(RACES):
+        assert store.tracks[store.races["track"][row]] == track
+        assert str(day_date(store.races["date"][row])) == date
+        assert store.races["race"][row] == race
+        horses = store.runners["horse"][store.runner_slice(row)].tolist()
+        assert horses == [horse for horse, _, _ in runners]
+        assert store.runners["odds"][store.runner_slice(row)].tolist() == pytest.approx([odds for *_, odds in runners])
+        if exacta is None:
+            assert np.isnan(store.races["exacta"][row])
+        else:
+            assert store.races["exacta"][row] == pytest.approx(exacta)
+        assert np.isnan(store.races["trifecta"][row])
+
+    odds = store.field_matrix([1, 2], "odds", fill=np.nan)
+    assert odds.shape == (2, 4) and np.isnan(odds[1, 2:]).all()
+    assert store.finish_orders([0, 1, 3], 3).tolist() == [[2, 1, 0], [4, 6, 5], [8, 9, 3]]
+
+
+@pytest.mark.parametrize("filters, rows", [
+    ({}, [0, 1, 2, 3]),
+    ({"track": "AQU"}, [0, 2]),
+    ({"start": "2024-01-03"}, [0, 3]),
+    ({"end": "2024-01-02"}, [1, 2]),
+    ({"field_size": 4}, [1]),
+    ({"field_size": (3, 4)}, [0, 1]),
+    ({"track": "AQU", "end": "2024-01-02"}, [2]),
+    ({"track": "XYZ"}, []),
+])
+def test_select_filters(tmp_path, filters, rows):
+    path = str(tmp_path / "store")
+    with StoreWriter(path) as writer:
+        for track, date, race, runners, exacta in RACES:
+            writer.add(track, date, race, *zip(*runners), {"exacta": exacta} if exacta else None)
+    assert RaceStore(path).select(**filters).tolist() == rows
+
+
+def test_append_keeps_rows_and_drops_an_interrupted_write(tmp_path):
+    path = str(tmp_path / "store")
+    with StoreWriter(path) as writer:
+        for track, date, race, runners, _ in RACES[:2]:
+            writer.add(track, date, race, *zip(*runners))
+    before = RaceStore(path)
+    first = {name: np.array(column) for name, column in before.races.items()}
+
+    # Bytes written past the last flush, as if an append died before meta.json
+    with open(os.path.join(path, "track.bin"), "ab") as column:
+        column.write(b"\xff" * 6)
+
+    with StoreWriter(path) as writer:
+        for track, date, race, runners, _ in RACES[2:]:
+            writer.add(track, date, race, *zip(*runners))
+    after = RaceStore(path)
+    assert len(after) == 4
+    assert os.path.getsize(os.path.join(path, "track.bin")) == 4 * np.dtype(RACE_COLUMNS["track"]).itemsize
+    for name, column in first.items():
+        np.testing.assert_array_equal(after.races[name][:2], column)
+    assert after.select(track="AQU").tolist() == [0, 2]
@@ -0,0 +1,22 @@
+import random
+
+import pytest
+
+from hedging.stream import DutchPosition
+
+
+def test_covered_profit_waits_for_every_price():
+    position = DutchPosition([1, 4, 6], 100)
+    assert position.update(1, 3)["profit_if_covered"] is None
+    assert position.update(4, 5)["profit_if_covered"] is None
+    update = position.update(6, 9)
+    assert update["profit_if_covered"] == pytest.approx(100 - (100 / 3 + 100 / 5 + 100 / 9))
+    assert update["profit_if_uncovered"] == -update["total_stake"]
+
+
+def test_total_does_not_drift_over_a_long_feed():
+    rng = random.Random(7)
+    position = DutchPosition(list(range(1, 9)), 100)
+    for _ in range(100_000):
+        position.update(rng.randint(1, 8), rng.uniform(1.5, 50))
+    assert position.total_stake == sum(position.stakes.values())
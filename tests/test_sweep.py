@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from hedging import registry
+from hedging.exotics import exacta_hedge, superfecta_hedge, trifecta_hedge
+from hedging.hedges import each_way, lay_hedge, multiple_horses
+from hedging.sweep import SURFACES, sweep
+
+
+@pytest.mark.parametrize("strategy, table, params", [
+    ("exacta", exacta_hedge, {"straight_bet": 12, "straight_odds": 30, "box_bet": 3, "box_odds": 15}),
+    ("trifecta", trifecta_hedge, {"straight_bet": 7, "straight_odds": 150, "wheel_bet": 2, "wheel_odds": 40}),
+    ("superfecta", superfecta_hedge, {"straight_bet": 4, "straight_odds": 900, "box_bet": 1, "box_odds": 500}),
+    ("lay", lay_hedge, {"lay_odds": 2.5}),
+    ("each_way", each_way, {}),
+])
+def test_surface_matches_strategy_table(strategy, table, params):
+    assert np.allclose(sweep(strategy, **params).profit.ravel(), table(**params).profit)
+
+
+def test_multiple_surface():
+    assert np.allclose(sweep("multiple").profit.ravel(), multiple_horses().profit)
+    grid = sweep("multiple", stake_3=60, odds_3=4, stake_7=40, odds_7=6)
+    assert np.allclose(grid.profit.ravel(), multiple_horses([(3, 60, 4), (7, 40, 6)]).profit)
+
+
+def test_exotic_grid():
+    result = sweep("exacta", box_bet="1:10:10", box_odds="5:30:20")
+    assert result.shape == (10, 20) and "exacta" in SURFACES
+
+
+# Surface inputs at a few points per strategy, including the worked example
+POINTS = {
+    "each_way": [{}, {"odds": 4.5, "stake": 25, "place_fraction": 0.2}, {"odds": 30, "currency_rate": 1.0}],
+    "lay": [{}, {"original_bet": 50, "original_odds": 8, "lay_liability": 120, "lay_odds": 3.5}, {"lay_odds": 1.2}],
+    "in_running": [{}, {"original_odds": 2.5, "hedge_bet": 60, "new_leader_odds": 3}, {"original_bet": 10}],
+    "parlay": [{}, {"parlay_bet": 25, "parlay_payout": 4000, "hedge_amount": 500, "hedge_return": 900},
+               {"hedge_return": 150}],
+    "dutch": [{}, {"target_profit": 40, "odds_2": 2.5, "odds_5": 7}, {"odds_1": 1.8, "odds_3": 4, "odds_9": 12}],
+    "multiple": [{}, {"stake_2": 30, "odds_2": 3.5}, {"stake_1": 10, "odds_1": 9, "stake_4": 70, "odds_4": 2.2}],
+    "exacta": [{}, {"straight_bet": 8, "box_odds": 11}, {"straight_odds": 60, "box_bet": 1}],
+    "trifecta": [{}, {"straight_bet": 3, "wheel_odds": 25}, {"straight_odds": 400, "wheel_bet": 0.5}],
+    "superfecta": [{}, {"straight_bet": 2, "box_odds": 300}, {"straight_odds": 3000, "box_bet": 0.2}],
+}
+
+
+def _strategy_params(strategy, params):
+    """The registered strategy's inputs for a surface's inputs"""
+    if strategy == "dutch":
+        odds = {int(name[5:]): price for name, price in params.items() if name.startswith("odds_")}
+        return {"odds": odds or None, "target_profit": params.get("target_profit", 100)}
+    if strategy == "multiple":
+        horses = [name[6:] for name in params if name.startswith("stake_")]
+        return {"bets": [(int(horse), params[f"stake_{horse}"], params[f"odds_{horse}"]) for horse in horses] or None}
+    return params
+
+
+def test_every_surface_has_points():
+    assert set(POINTS) == set(SURFACES)
+
+
+@pytest.mark.parametrize("strategy, params", [(strategy, params) for strategy, points in POINTS.items()
+                                              for params in points])
+def test_surface_matches_registered_strategy(strategy, params):
+    result = registry.get_strategy(strategy)(**_strategy_params(strategy, params))
+    table = result[0] if isinstance(result, tuple) else result
+    assert np.allclose(SURFACES[strategy](**params), table.profit)